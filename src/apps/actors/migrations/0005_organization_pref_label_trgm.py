@@ -0,0 +1,23 @@
+# Generated by Django 6.0.4 on 2026-10-16 12:12
+
+import apps.common.functions
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('actors', '0004_quote_org_url'),
+        ('common', '0002_trigram_text_functions'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='organization',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(apps.common.functions.LowerValues('pref_label'), name='gin_trgm_ops'), name='actors_org_pref_label_trgm'),
+        ),
+    ]
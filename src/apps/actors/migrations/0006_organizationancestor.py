@@ -0,0 +1,95 @@
+# Generated by Django 6.0.4 on 2026-10-16 12:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Walks the organization hierarchy up from the organizations in "organizations(id)"
+# and returns a row for each organization and each of its ancestors
+ANCESTORS_CTE = """
+    ancestors(ancestor_id, descendant_id, parent_id, depth) AS (
+        SELECT o.id, o.id, o.parent_id, 0
+        FROM actors_organization o JOIN organizations ON o.id = organizations.id
+        UNION
+        SELECT o.id, a.descendant_id, o.parent_id, a.depth + 1
+        FROM ancestors a JOIN actors_organization o ON o.id = a.parent_id
+        WHERE a.depth < 100
+    )
+"""
+
+CREATE_TRIGGER = f"""
+CREATE OR REPLACE FUNCTION actors_organization_subtree(root uuid) RETURNS SETOF uuid AS $$
+    WITH RECURSIVE subtree(id, depth) AS (
+        SELECT root, 0
+        UNION
+        SELECT o.id, s.depth + 1
+        FROM actors_organization o JOIN subtree s ON o.parent_id = s.id
+        WHERE s.depth < 100
+    )
+    SELECT DISTINCT id FROM subtree;
+$$ LANGUAGE SQL STABLE;
+
+CREATE OR REPLACE FUNCTION actors_organization_update_ancestors() RETURNS trigger AS $$
+BEGIN
+    -- Rebuild ancestor rows of the organization and all of its descendants.
+    -- The hierarchy is read from the organization table, so the result does not
+    -- depend on the order in which organizations are inserted in bulk.
+    DELETE FROM actors_organizationancestor
+    WHERE descendant_id IN (SELECT actors_organization_subtree(NEW.id));
+
+    WITH RECURSIVE organizations(id) AS (SELECT actors_organization_subtree(NEW.id)),
+    {ANCESTORS_CTE}
+    INSERT INTO actors_organizationancestor (ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, descendant_id, min(depth) FROM ancestors
+    GROUP BY ancestor_id, descendant_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER actors_organization_ancestors_insert
+AFTER INSERT ON actors_organization
+FOR EACH ROW EXECUTE FUNCTION actors_organization_update_ancestors();
+
+CREATE TRIGGER actors_organization_ancestors_update
+AFTER UPDATE OF parent_id ON actors_organization
+FOR EACH ROW WHEN (OLD.parent_id IS DISTINCT FROM NEW.parent_id)
+EXECUTE FUNCTION actors_organization_update_ancestors();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER IF EXISTS actors_organization_ancestors_insert ON actors_organization;
+DROP TRIGGER IF EXISTS actors_organization_ancestors_update ON actors_organization;
+DROP FUNCTION IF EXISTS actors_organization_update_ancestors();
+DROP FUNCTION IF EXISTS actors_organization_subtree(uuid);
+"""
+
+POPULATE = f"""
+WITH RECURSIVE organizations(id) AS (SELECT id FROM actors_organization),
+{ANCESTORS_CTE}
+INSERT INTO actors_organizationancestor (ancestor_id, descendant_id, depth)
+SELECT ancestor_id, descendant_id, min(depth) FROM ancestors
+GROUP BY ancestor_id, descendant_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actors', '0005_organization_pref_label_trgm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationAncestor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField(help_text='Number of levels from descendant.')),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='actors.organization')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='actors.organization')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='actors_organizationancestor_unique_ancestor_descendant')],
+            },
+        ),
+        migrations.RunSQL(sql=CREATE_TRIGGER, reverse_sql=DROP_TRIGGER),
+        migrations.RunSQL(sql=POPULATE, reverse_sql=migrations.RunSQL.noop),
+    ]
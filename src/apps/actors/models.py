@@ -3,12 +3,14 @@ import uuid
 from typing import Dict
 
 from django.contrib.postgres.fields import HStoreField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
 from django.db.models import Model
 from django.utils.translation import gettext as _
 from simple_history.models import HistoricalRecords
 
 from apps.common.copier import ModelCopier
+from apps.common.functions import LowerValues
 from apps.common.helpers import omit_empty
 from apps.common.models import AbstractBaseModel
 
@@ -103,6 +105,10 @@ class Organization(AbstractBaseModel):
         indexes = [
             models.Index(fields=["is_reference_data"]),
             models.Index(fields=["url"]),
+            GinIndex(
+                OpClass(LowerValues("pref_label"), name="gin_trgm_ops"),
+                name="actors_org_pref_label_trgm",
+            ),
         ]
         get_latest_by = "modified"
         ordering = ["created"]
@@ -161,6 +167,37 @@ class Organization(AbstractBaseModel):
         return f"{self.id}: {self.get_label()}"
 
 
+class OrganizationAncestor(models.Model):
+    """Closure table of the organization hierarchy.
+
+    Contains a row for each organization and each of its ancestors, including
+    the organization itself with depth 0. This allows finding all descendants
+    or ancestors of an organization with a single indexed join.
+
+    The rows are maintained by a database trigger when organizations are
+    inserted or their parent changes, see actors migration 0006.
+    """
+
+    ancestor = models.ForeignKey(
+        Organization, related_name="descendant_links", on_delete=models.CASCADE
+    )
+    descendant = models.ForeignKey(
+        Organization, related_name="ancestor_links", on_delete=models.CASCADE
+    )
+    depth = models.PositiveIntegerField(help_text=_("Number of levels from descendant."))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["ancestor", "descendant"],
+                name="%(app_label)s_%(class)s_unique_ancestor_descendant",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+
 class Person(AbstractBaseModel):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     copier = ModelCopier(copied_relations=["homepage"], parent_relations=["part_of_actors"])
@@ -0,0 +1,82 @@
+"""Binary encoding of serializer cache values.
+
+Values are pickled and optionally compressed. The first byte of the encoded
+value tells how the rest of the value has been encoded. Zstandard is used
+when available (Python 3.14+), otherwise zlib with a fast compression level.
+"""
+
+import pickle
+import zlib
+from typing import List, Optional, Tuple
+
+try:
+    from compression import zstd
+except ImportError:  # Python < 3.14
+    zstd = None
+
+PICKLE = b"p"  # Uncompressed pickle
+ZLIB = b"z"  # Zlib compressed pickle
+ZSTD = b"Z"  # Zstandard compressed pickle
+
+ZLIB_LEVEL = 1
+ZSTD_LEVEL = 3
+
+
+class DecodeError(ValueError):
+    """Encoded value is invalid or uses an unsupported codec."""
+
+
+def compress(data: bytes) -> bytes:
+    """Compress pickled data, return encoded value."""
+    if zstd is not None:
+        return ZSTD + zstd.compress(data, level=ZSTD_LEVEL)
+    return ZLIB + zlib.compress(data, level=ZLIB_LEVEL)
+
+
+def encode(value, compress_min_size: Optional[int] = None) -> Tuple[bytes, int]:
+    """Encode value as bytes.
+
+    Values with a pickled size of at least compress_min_size are compressed,
+    if compression does not make them larger. Returns tuple of
+    (encoded value, pickled size).
+    """
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return encode_pickled(data, compress_min_size), len(data)
+
+
+def encode_pickled(data: bytes, compress_min_size: Optional[int] = None) -> bytes:
+    """Encode already pickled value."""
+    if compress_min_size is not None and len(data) >= compress_min_size:
+        compressed = compress(data)
+        if len(compressed) < len(data):
+            return compressed
+    return PICKLE + data
+
+
+def decode_pickled(encoded: bytes) -> bytes:
+    """Return pickled data of encoded value."""
+    codec, data = encoded[:1], encoded[1:]
+    try:
+        if codec == PICKLE:
+            return data
+        if codec == ZLIB:
+            return zlib.decompress(data)
+        if codec == ZSTD and zstd is not None:
+            return zstd.decompress(data)
+    except Exception as error:
+        raise DecodeError(f"Decompression failed: {error}") from error
+    raise DecodeError(f"Unsupported codec {codec!r}")
+
+
+def decode(encoded: bytes) -> Tuple[object, int]:
+    """Decode value, return tuple of (value, pickled size)."""
+    data = decode_pickled(encoded)
+    try:
+        return pickle.loads(data), len(data)
+    except Exception as error:
+        raise DecodeError(f"Unpickling failed: {error}") from error
+
+
+def split(data: bytes, max_size: int) -> List[bytes]:
+    """Split data into chunks of at most max_size bytes."""
+    return [data[i : i + max_size] for i in range(0, len(data), max_size)]
@@ -1,10 +1,106 @@
-from typing import List, Optional
+import logging
+import pickle
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 
 from django.core.cache import BaseCache, caches
 from django.db import models
 from rest_framework import serializers
 
-from apps.common.helpers import pickle_deepcopy
+from apps.cache import encoding
+from apps.common.serializers.compiled import (
+    compiled_to_representation,
+    is_compiled_representation_enabled,
+)
+
+logger = logging.getLogger(__name__)
+
+SHARDED = b"s"  # Source cache value is a manifest of shard keys
+
+
+@dataclass
+class CacheTierStats:
+    """Hit and miss counts of a single cache tier."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def __str__(self):
+        return f"{self.hits} hits, {self.misses} misses"
+
+
+@dataclass
+class CacheWriteStats:
+    """Size statistics of values written to the source cache."""
+
+    entries: int = 0
+    sharded: int = 0  # Entries split into multiple source cache values
+    pickled_bytes: int = 0  # Size before compression
+    stored_bytes: int = 0  # Size after compression
+
+    @property
+    def compression_ratio(self) -> float:
+        if not self.stored_bytes:
+            return 1.0
+        return self.pickled_bytes / self.stored_bytes
+
+
+class LocalLRUCache:
+    """Bounded in-process LRU cache for serialized values.
+
+    Entries are evicted in least recently used order when either
+    max_entries or max_bytes would be exceeded. The size of an entry
+    is the length of its pickled representation. Values are shared
+    between requests of the same worker so they must not be modified.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[object, Tuple[dict, int]] = OrderedDict()
+        self.size = 0
+        self.stats = CacheTierStats()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_many(self, keys: Iterable) -> dict:
+        values = {}
+        with self.lock:
+            for key in keys:
+                if entry := self.entries.get(key):
+                    self.entries.move_to_end(key)
+                    values[key] = entry[0]
+        return values
+
+    def set(self, key, value: dict, size: int):
+        with self.lock:
+            self._delete(key)
+            if size > self.max_bytes:
+                return  # Value would not fit in the cache even when empty
+            self.entries[key] = (value, size)
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def delete(self, key):
+        with self.lock:
+            self._delete(key)
+
+    def _delete(self, key):
+        if entry := self.entries.pop(key, None):
+            self.size -= entry[1]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
 
 
 class SerializerCacheBase:
@@ -23,6 +119,11 @@ class SerializerCacheBase:
 
     # Internal fields
     changed: set  # Changed values not yet in source_cache
+    pickled: Dict[object, bytes]  # Pickled changed values
+    stats: Dict[str, CacheTierStats]  # Hits and misses of this instance per tier
+    write_stats: CacheWriteStats  # Sizes of values committed to source cache
+
+    _local_caches: Dict[tuple, LocalLRUCache] = {}  # Per-process local caches
 
     def __init__(self, initial_instances: List[models.Model] = [], autocommit=True):
         self.get_source_cache()
@@ -34,7 +135,10 @@ class SerializerCacheBase:
         # When autocommit is enabled (default), changes are committed to source_cache immediately
         self.autocommit = autocommit
         self.changed = set()
+        self.pickled = {}
         self.values = {}
+        self.stats = {"local": CacheTierStats(), "source": CacheTierStats()}
+        self.write_stats = CacheWriteStats()
         self.fetch_from_source(initial_instances)
 
     @classmethod
@@ -42,24 +146,181 @@ class SerializerCacheBase:
         """Source cache is determined dynamically so it can be changed in tests."""
         return caches[cls.cache_name]
 
+    @classmethod
+    def get_local_cache_limits(cls) -> Tuple[int, int]:
+        """Return (max_entries, max_bytes) of the local cache tier.
+
+        The local tier is disabled by default. Override in subclasses to enable it.
+        """
+        return 0, 0
+
+    @classmethod
+    def get_local_cache(cls) -> Optional[LocalLRUCache]:
+        """Return the in-process cache tier used in front of the source cache, if enabled."""
+        max_entries, max_bytes = cls.get_local_cache_limits()
+        if max_entries <= 0 or max_bytes <= 0:
+            return None
+        key = (cls.cache_name, max_entries, max_bytes)
+        local_cache = cls._local_caches.get(key)
+        if local_cache is None:
+            local_cache = cls._local_caches.setdefault(key, LocalLRUCache(max_entries, max_bytes))
+        return local_cache
+
+    @classmethod
+    def get_compress_min_size(cls) -> Optional[int]:
+        """Return minimum pickled size of values to compress, None disables compression."""
+        return None
+
+    @classmethod
+    def get_max_item_size(cls) -> Optional[int]:
+        """Return maximum size of a single source cache value, None disables sharding."""
+        return None
+
+    @classmethod
+    def encode_source_entries(cls, entries: dict, stats: Optional[CacheWriteStats] = None) -> dict:
+        """Encode entries into source cache values.
+
+        Values larger than max item size are split into shards stored in
+        separate keys. The value of the original key then contains
+        the modification timestamp and the shard keys.
+        """
+        pickled_entries = {
+            key: (pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL), entry["_modified"])
+            for key, entry in entries.items()
+        }
+        return cls.encode_pickled_source_entries(pickled_entries, stats=stats)
+
+    @classmethod
+    def encode_pickled_source_entries(
+        cls, pickled_entries: Dict[object, Tuple[bytes, object]], stats=None
+    ) -> dict:
+        """Encode already pickled entries, given as key: (pickled entry, modified)."""
+        compress_min_size = cls.get_compress_min_size()
+        max_item_size = cls.get_max_item_size()
+        values = {}
+        for key, (pickled_entry, modified) in pickled_entries.items():
+            data = encoding.encode_pickled(pickled_entry, compress_min_size=compress_min_size)
+            if stats is not None:
+                stats.entries += 1
+                stats.pickled_bytes += len(pickled_entry)
+                stats.stored_bytes += len(data)
+            if max_item_size and len(data) > max_item_size:
+                token = uuid.uuid4().hex[:8]  # Avoid mixing shards from different writes
+                shards = encoding.split(data, max_item_size)
+                shard_keys = [f"{key}:{token}:{i}" for i in range(len(shards))]
+                values.update(zip(shard_keys, shards))
+                manifest = {"_modified": modified, "shards": shard_keys}
+                values[key] = SHARDED + pickle.dumps(manifest, protocol=pickle.HIGHEST_PROTOCOL)
+                if stats is not None:
+                    stats.sharded += 1
+            else:
+                values[key] = data
+        return values
+
+    @classmethod
+    def get_source_entries(
+        cls, keys: Iterable, is_valid: Optional[Callable[[object, object], bool]] = None
+    ) -> Dict[object, Tuple[dict, int]]:
+        """Get decoded entries from source cache.
+
+        If is_valid(key, modified) is provided, entries for which it returns
+        False are omitted. Returns dict of key: (entry, pickled size).
+        """
+        source_cache = cls.get_source_cache()
+        values = source_cache.get_many(list(keys))
+        manifests = {}
+        entries = {}
+        for key, value in values.items():
+            try:
+                if isinstance(value, dict):
+                    # Value from before cache entries were encoded
+                    entries[key] = (value, 0)
+                elif value[:1] == SHARDED:
+                    manifests[key] = pickle.loads(value[1:])
+                else:
+                    entries[key] = encoding.decode(value)
+            except Exception as error:
+                logger.warning(f"Invalid {cls.cache_name} cache value for {key}: {error}")
+
+        if is_valid:
+            entries = {k: v for k, v in entries.items() if is_valid(k, v[0]["_modified"])}
+            manifests = {k: v for k, v in manifests.items() if is_valid(k, v["_modified"])}
+
+        if manifests:
+            # Fetch shards of valid entries and reassemble them
+            shard_keys = [shard_key for m in manifests.values() for shard_key in m["shards"]]
+            shards = source_cache.get_many(shard_keys)
+            for key, manifest in manifests.items():
+                try:
+                    data = b"".join(shards[shard_key] for shard_key in manifest["shards"])
+                    entries[key] = encoding.decode(data)
+                except KeyError:
+                    pass  # Some shards have been evicted
+                except encoding.DecodeError as error:
+                    logger.warning(f"Invalid {cls.cache_name} cache value for {key}: {error}")
+        return entries
+
+    @classmethod
+    def set_source_entries(cls, entries: dict, stats: Optional[CacheWriteStats] = None):
+        """Encode entries and write them to source cache."""
+        cls.get_source_cache().set_many(cls.encode_source_entries(entries, stats=stats))
+
+    def _is_valid(self, cached_modified, instance: models.Model, include_newer=False) -> bool:
+        modified = getattr(instance, self.modified_attr)
+        if cached_modified == modified:
+            return True
+        # Optionally include cache entries that are newer than instance
+        return include_newer and cached_modified > modified
+
     def fetch_from_source(self, instances: List[models.Model], include_newer=False):
         """Fetch cached data from source cache.
 
         Fetch cached values that match modification timestamp of corresponding instance.
+        When the local cache tier is enabled, it is checked before the source cache
+        and valid values from the source cache are added to it.
         """
-        cached_values = self.get_source_cache().get_many([instance.id for instance in instances])
-        for instance in instances:
-            if cached := cached_values.get(instance.id):
-                modified = getattr(instance, self.modified_attr)
-                if cached["_modified"] == modified:
-                    self.values[instance.id] = cached
-                if include_newer and cached["_modified"] > modified:
-                    # Include cache entries that are newer than instance
+        local_cache = self.get_local_cache()
+        remaining = instances
+        if local_cache is not None:
+            local_values = local_cache.get_many([instance.id for instance in instances])
+            remaining = []
+            for instance in instances:
+                cached = local_values.get(instance.id)
+                if cached and self._is_valid(cached["_modified"], instance, include_newer):
                     self.values[instance.id] = cached
+                    self.stats["local"].hits += 1
+                    local_cache.stats.hits += 1
+                else:
+                    remaining.append(instance)
+                    self.stats["local"].misses += 1
+                    local_cache.stats.misses += 1
+            if not remaining:
+                return
+
+        instances_by_id = {instance.id: instance for instance in remaining}
+        cached_values = self.get_source_entries(
+            instances_by_id.keys(),
+            is_valid=lambda key, modified: self._is_valid(
+                modified, instances_by_id[key], include_newer
+            ),
+        )
+        for instance in remaining:
+            if cached := cached_values.get(instance.id):
+                value, size = cached
+                self.values[instance.id] = value
+                self.stats["source"].hits += 1
+                if local_cache is not None:
+                    if not size:
+                        size = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+                    local_cache.set(instance.id, value, size)
+            else:
+                self.stats["source"].misses += 1
 
     def commit_changed_to_source(self):
-        changed = {key: self.values[key] for key in self.changed}
-        self.get_source_cache().set_many(changed)
+        """Write changed values to source cache, reusing the data pickled in set_value."""
+        changed = {key: (self.pickled[key], self.values[key]["_modified"]) for key in self.changed}
+        values = self.encode_pickled_source_entries(changed, stats=self.write_stats)
+        self.get_source_cache().set_many(values)
         self.clear_changed()
 
     def clear(self):
@@ -68,15 +329,21 @@ class SerializerCacheBase:
 
     def clear_changed(self):
         self.changed.clear()
+        self.pickled.clear()
 
     def get_changed(self):
         return {k: v for k, v in self.values.items() if k in self.changed}
 
-    def get_value(self, instance: models.Model) -> Optional[dict]:
+    def get_value(self, instance: models.Model) -> Optional[Mapping]:
+        """Return read-only view of cached value.
+
+        The view also contains internal keys (e.g. "_modified") that
+        are not in cached_fields.
+        """
         value = self.values.get(instance.id)
         if value is None:
             return None
-        return {k: v for k, v in value.items() if k in self.cached_fields}
+        return MappingProxyType(value)
 
     def get_value_context(self, instance: models.Model):
         value = self.values.get(instance.id)
@@ -93,8 +360,11 @@ class SerializerCacheBase:
     ):
         """Set per-instance value to cache.
 
-        The in-memory value is not copied so care needs to be taken
-        to avoid modifying it after using set_value.
+        The value is pickled once and the pickled data is used when committing
+        to the source cache. The in-memory value is not copied, so values are
+        treated as immutable: neither the cached value nor its nested values
+        may be modified after set_value. Cached values may also be shared with
+        other requests through the local cache tier.
         """
         modified = getattr(instance, self.modified_attr)
 
@@ -105,11 +375,15 @@ class SerializerCacheBase:
                     return  # Instance is same or older than existing cached entry
 
         self.changed.add(instance.id)
-        self.values[instance.id] = {k: v for k, v in value.items() if k in self.cached_fields}
-        self.values[instance.id]["_modified"] = modified
+        entry = {k: v for k, v in value.items() if k in self.cached_fields}
+        entry["_modified"] = modified
         if value_context:
-            self.values[instance.id]["_context"] = value_context
-        self.values[instance.id] = pickle_deepcopy(self.values[instance.id])
+            entry["_context"] = value_context
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        self.values[instance.id] = entry
+        self.pickled[instance.id] = data
+        if (local_cache := self.get_local_cache()) is not None:
+            local_cache.set(instance.id, entry, len(data))
         if self.autocommit:
             self.commit_changed_to_source()
 
@@ -162,6 +436,9 @@ class SerializerCacheSerializer(serializers.Serializer):
 
     def to_representation(self, instance) -> dict:
         """Serialization modified to support cached values."""
+        if is_compiled_representation_enabled(self):
+            return compiled_to_representation(self, instance)
+
         ret = {}
         fields = self._readable_fields
 
@@ -0,0 +1,54 @@
+import logging
+import time
+from typing import Callable, Optional, TypeVar
+
+from django.core.cache import BaseCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# How long the lock of a computation is held at most, in seconds
+LOCK_TIMEOUT = 60
+# How long other callers wait for the computation before computing the value themselves
+WAIT_TIMEOUT = 30
+POLL_INTERVAL = 0.05
+
+
+def get_or_compute(
+    cache: BaseCache,
+    key: str,
+    compute: Callable[[], T],
+    timeout: Optional[float] = None,
+    wait_timeout: float = WAIT_TIMEOUT,
+) -> T:
+    """Return value from cache or compute and cache it.
+
+    Concurrent callers with the same key are collapsed into a single
+    computation (single-flight): the first caller takes a lock in the cache
+    using cache.add and computes the value, while the others poll the cache
+    until the value appears. If the value does not appear within wait_timeout
+    seconds, e.g. because the computing process died, the value is computed
+    without waiting further.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f"{key}:lock"
+    deadline = time.monotonic() + wait_timeout
+    while not cache.add(lock_key, True, timeout=LOCK_TIMEOUT):
+        time.sleep(POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if time.monotonic() > deadline:
+            logger.warning(f"Timed out waiting for concurrent computation of {key}")
+            return compute()
+
+    try:
+        value = compute()
+        cache.set(key, value, timeout=timeout)
+    finally:
+        cache.delete(lock_key)
+    return value
@@ -0,0 +1,71 @@
+from typing import Iterable, List, Sequence, TypeVar
+
+from django.db import connections, models, transaction
+
+ModelType = TypeVar("ModelType", bound=models.Model)
+
+
+def copy_upsert(
+    objs: List[ModelType],
+    update_fields: Iterable[str],
+    unique_fields: Sequence[str] = ("id",),
+    using: str = "default",
+) -> List[ModelType]:
+    """Insert or update model instances using COPY into a temporary staging table.
+
+    Works like `bulk_create(objs, update_conflicts=True, ...)` for models with
+    primary keys assigned in Python (e.g. UUIDs): values are prepared with the same
+    pre_save calls, so e.g. auto timestamps get the same values. Rows are streamed
+    with COPY FROM STDIN instead of building a multi-row INSERT, and merged into the
+    model table with a single INSERT ... ON CONFLICT statement that returns nothing.
+
+    Like bulk_create, save() is not called and no signals are sent.
+    """
+    if not objs:
+        return objs
+    model = type(objs[0])
+    opts = model._meta
+    connection = connections[using]
+    quote = connection.ops.quote_name
+
+    fields = [field for field in opts.concrete_fields if not field.generated]
+    columns = ", ".join(quote(field.column) for field in fields)
+    conflict_columns = ", ".join(quote(opts.get_field(name).column) for name in unique_fields)
+    updates = ", ".join(
+        f"{quote(column)} = EXCLUDED.{quote(column)}"
+        for column in (opts.get_field(name).column for name in update_fields)
+    )
+    conflict_action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+    table = quote(opts.db_table)
+    staging_table = quote(f"{opts.db_table}_copy")
+
+    for obj in objs:
+        if obj.pk is None:
+            raise ValueError(f"{model.__name__} needs a primary key for copy_upsert.")
+        obj._prepare_related_fields_for_save(operation_name="copy_upsert")
+
+    with transaction.atomic(using=using, savepoint=False):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {staging_table} ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {table} WITH NO DATA"
+            )
+            with cursor.copy(f"COPY {staging_table} ({columns}) FROM STDIN") as copy:
+                for obj in objs:
+                    copy.write_row(
+                        [
+                            field.get_db_prep_save(field.pre_save(obj, add=True), connection)
+                            for field in fields
+                        ]
+                    )
+            cursor.execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging_table} "
+                f"ON CONFLICT ({conflict_columns}) {conflict_action}"
+            )
+            # Dropped explicitly in case of another call in the same transaction
+            cursor.execute(f"DROP TABLE {staging_table}")
+
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = using
+    return objs
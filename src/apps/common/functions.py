@@ -0,0 +1,25 @@
+from django.db.models import Func, TextField
+
+
+class LowerValues(Func):
+    """Lowercased values of a hstore field as text, one value per line.
+
+    Uses the IMMUTABLE SQL function created in common migration 0002, so
+    the expression can be used in trigram indexes.
+    """
+
+    function = "common_hstore_lower_values"
+    arity = 1
+    output_field = TextField()
+
+
+class LowerArrayText(Func):
+    """Lowercased items of an array field as text, one item per line.
+
+    Uses the IMMUTABLE SQL function created in common migration 0002, so
+    the expression can be used in trigram indexes.
+    """
+
+    function = "common_array_lower_text"
+    arity = 1
+    output_field = TextField()
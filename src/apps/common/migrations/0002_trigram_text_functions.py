@@ -0,0 +1,31 @@
+# Generated by Django 6.0.4 on 2026-10-16 12:10
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # Casting hstore values or arrays to text is not IMMUTABLE in PostgreSQL
+        # so it cannot be indexed directly, these functions are used instead
+        migrations.RunSQL(
+            sql="""
+            CREATE OR REPLACE FUNCTION common_hstore_lower_values(hstore) RETURNS text
+            AS $$ SELECT lower(array_to_string(avals($1), E'\\n')) $$
+            LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
+
+            CREATE OR REPLACE FUNCTION common_array_lower_text(anyarray) RETURNS text
+            AS $$ SELECT lower(array_to_string($1, E'\\n')) $$
+            LANGUAGE SQL IMMUTABLE PARALLEL SAFE;
+            """,
+            reverse_sql="""
+            DROP FUNCTION IF EXISTS common_hstore_lower_values(hstore);
+            DROP FUNCTION IF EXISTS common_array_lower_text(anyarray);
+            """,
+        ),
+    ]
@@ -16,13 +16,20 @@ def parse_search_string(string: str) -> List[str]:
     return [re_space.sub("<->", part) for part in parts if part]
 
 
+def escape_search_query(text: str) -> str:
+    """Escapes the given text to become a valid ts_query.
+
+    All words are prefix matched and doubly quoted parts are matched as phrases.
+    """
+    return " & ".join(
+        "$${0}$$:*".format(word)
+        for word in parse_search_string(escape_query(text, RE_POSTGRES_ESCAPE_CHARS))
+    )
+
+
 class CommonSearchBackend(PostgresSearchBackend):
 
     def escape_postgres_query(self, text):
         """Escapes the given text to become a valid ts_query."""
         # Modified to allow searching for exact phrases using double quotation marks
-        q = " & ".join(
-            "$${0}$$:*".format(word)
-            for word in parse_search_string(escape_query(text, RE_POSTGRES_ESCAPE_CHARS))
-        )
-        return q
+        return escape_search_query(text)
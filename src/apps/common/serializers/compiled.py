@@ -0,0 +1,121 @@
+"""Compiled read-only representation for serializers.
+
+DRF Serializer.to_representation resolves the value of each field through
+Field.get_attribute, which handles dotted sources, mappings, callables,
+missing relations and defaults separately for every field and instance.
+
+The functions here determine once per serializer which fields have a plain
+attribute as source and the default get_attribute, and read those attributes
+directly. Field.get_attribute
+is still used for other fields, and whenever the fast path would not produce
+the same value (e.g. missing attribute or callable value), so the output is
+identical to the output of Serializer.to_representation.
+"""
+
+import functools
+import types
+from collections.abc import Mapping
+from typing import Callable, List, NamedTuple, Optional
+
+from rest_framework import serializers
+
+# Values of these types are called by Field.get_attribute
+_simple_callable_types = (types.FunctionType, types.MethodType, functools.partial)
+
+
+class FieldAccessor(NamedTuple):
+    field_name: str
+    attr: Optional[str]  # Attribute name for fast path, None if field needs get_attribute
+    field: serializers.Field
+    to_representation: Callable
+
+
+def compile_fields(fields) -> List[FieldAccessor]:
+    """Determine how values of readable fields are retrieved."""
+    accessors = []
+    for field in fields:
+        attr = None
+        # Source "*" has no source_attrs. Fields that override get_attribute,
+        # e.g. related fields, always use get_attribute.
+        if (
+            len(field.source_attrs) == 1
+            and type(field).get_attribute is serializers.Field.get_attribute
+        ):
+            attr = field.source_attrs[0]
+        accessors.append(
+            FieldAccessor(
+                field_name=field.field_name,
+                attr=attr,
+                field=field,
+                to_representation=field.to_representation,
+            )
+        )
+    return accessors
+
+
+def get_compiled_fields(serializer: serializers.Serializer) -> List[FieldAccessor]:
+    """Return field accessors of serializer, compiled on first use."""
+    accessors = getattr(serializer, "_compiled_fields", None)
+    if accessors is None:
+        accessors = compile_fields(serializer._readable_fields)
+        serializer._compiled_fields = accessors
+    return accessors
+
+
+def is_compiled_representation_enabled(serializer: serializers.Serializer) -> bool:
+    return bool(serializer.context.get("compiled_representation"))
+
+
+_missing = object()
+
+
+def represent_field(accessor: FieldAccessor, instance, use_attr: bool = True):
+    """Return representation of field or _missing if field should be skipped."""
+    field = accessor.field
+    attribute = _missing
+    if use_attr and accessor.attr is not None:
+        try:
+            attribute = getattr(instance, accessor.attr)
+        except Exception:
+            pass  # Let get_attribute handle errors
+        else:
+            if isinstance(attribute, _simple_callable_types):
+                attribute = _missing
+
+    if attribute is _missing:
+        try:
+            attribute = field.get_attribute(instance)
+        except serializers.SkipField:
+            return _missing
+
+    check_for_none = attribute.pk if isinstance(attribute, serializers.PKOnlyObject) else attribute
+    if check_for_none is None:
+        return None
+    return accessor.to_representation(attribute)
+
+
+def compiled_to_representation(serializer: serializers.Serializer, instance) -> dict:
+    """Produce the same result as Serializer.to_representation using compiled fields.
+
+    For serializers with a serializer cache (see SerializerCacheSerializer),
+    values of cached fields are taken from the cache when available.
+    """
+    cached_values = None
+    cached_fields = None
+    if cache := getattr(serializer, "cache", None):
+        cached_values = cache.get_value(instance)
+        cached_fields = cache.cached_fields
+
+    ret = {}
+    use_attr = not isinstance(instance, Mapping)  # Mapping values need get_attribute
+    for accessor in get_compiled_fields(serializer):
+        field_name = accessor.field_name
+        if cached_values is not None and field_name in cached_fields:
+            if field_name in cached_values:
+                ret[field_name] = cached_values[field_name]
+            continue
+
+        value = represent_field(accessor, instance, use_attr)
+        if value is not _missing:
+            ret[field_name] = value
+    return ret
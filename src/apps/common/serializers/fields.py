@@ -374,34 +374,42 @@ class PrivateUsernameValue(PrivateValue):
 
 
 def handle_private_emails(value: dict, show_emails, ignore_fields=set()):
-    """Convert PrivateEmailValues into strings or hide them recursively."""
-    omit = object()
+    """Convert PrivateEmailValues into strings or hide them recursively.
+
+    Top-level values of the dict are replaced in place. Nested dicts and
+    lists containing emails are copied instead of modified so shared
+    (e.g. cached) nested values are left untouched.
+    """
+    unchanged = object()
 
     def recurse(value):
         if isinstance(value, dict):
-            for k in list(value.keys()):
-                ret = recurse(value[k])
-                if ret is not None:
-                    if ret is omit:
-                        value[k] = "<hidden>"
-                    else:
-                        value[k] = ret
-            return None
+            copied = None
+            for k, v in value.items():
+                ret = recurse(v)
+                if ret is not unchanged:
+                    if copied is None:
+                        copied = dict(value)
+                    copied[k] = ret
+            return unchanged if copied is None else copied
         if isinstance(value, list):
-            for v in value:
-                recurse(v)
-            return None
+            copied = None
+            for i, v in enumerate(value):
+                ret = recurse(v)
+                if ret is not unchanged:
+                    if copied is None:
+                        copied = list(value)
+                    copied[i] = ret
+            return unchanged if copied is None else copied
         if isinstance(value, PrivateEmailValue):
-            return value.value if show_emails else omit
+            return value.value if show_emails else "<hidden>"
+        return unchanged
 
     for k in list(value.keys()):
         if k not in ignore_fields:
             ret = recurse(value[k])
-            if ret is not None:
-                if ret is omit:
-                    value[k] = "<hidden>"
-                else:
-                    value[k] = ret
+            if ret is not unchanged:
+                value[k] = ret
 
 
 class PrivateEmailField(serializers.EmailField):
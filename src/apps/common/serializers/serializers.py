@@ -7,7 +7,7 @@
 import copy
 import logging
 from contextlib import contextmanager
-from typing import Dict, Iterable, Mapping, Type
+from typing import Dict, Iterable, Mapping, Optional, Type
 from uuid import UUID
 
 from django.core.exceptions import FieldDoesNotExist
@@ -20,6 +20,10 @@ from rest_framework.serializers import ValidationError
 from rest_framework.settings import api_settings
 from rest_framework.utils import html, model_meta
 
+from apps.common.serializers.compiled import (
+    compiled_to_representation,
+    is_compiled_representation_enabled,
+)
 from apps.common.serializers.fields import (
     MultiLanguageField,
     NullableCharField,
@@ -236,6 +240,63 @@ class UpdatingListSerializer(CommonListSerializer):
         return updated_instances
 
 
+class RepresentationMemoMixin:
+    """Serializer mixin that serializes each model instance only once per response.
+
+    Enabled when the serializer context contains a "representation_memo" dict.
+    Representations are keyed by serializer class, model, primary key and
+    modification timestamp, so e.g. reference data or organizations used in
+    multiple datasets of a list response are serialized only once.
+    The memoized representations are shared and must not be modified.
+
+    Context values in memo_context_keys affect the representation and are
+    included in the key. Context flags in memo_context_flags that are set during
+    serialization are stored with the representation and set again on reuse.
+    """
+
+    memo_context_keys = ("include_nulls", "show_emails")
+    memo_context_flags = ("has_emails",)
+
+    def get_memo_key(self, instance) -> Optional[tuple]:
+        if not isinstance(instance, models.Model) or instance.pk is None:
+            return None
+        return (
+            type(self),
+            instance._meta.label,
+            instance.pk,
+            getattr(instance, "modified", None),
+            *(self.context.get(key) for key in self.memo_context_keys),
+        )
+
+    def to_representation(self, instance):
+        memo = self.context.get("representation_memo")
+        key = self.get_memo_key(instance) if memo is not None else None
+        if key is None:
+            return super().to_representation(instance)
+
+        if cached := memo.get(key):
+            rep, flags = cached
+            for flag in flags:
+                self.context[flag] = True
+            return rep
+
+        # Determine which flags are set by this representation
+        context = self.context
+        previous_flags = {flag: context.get(flag) for flag in self.memo_context_flags}
+        for flag in self.memo_context_flags:
+            context[flag] = False
+        rep = super().to_representation(instance)
+        flags = tuple(flag for flag in self.memo_context_flags if context.get(flag))
+        for flag, value in previous_flags.items():
+            if value is not None or flag in flags:
+                context[flag] = value or flag in flags
+            else:
+                context.pop(flag, None)
+
+        memo[key] = (rep, flags)
+        return rep
+
+
 class StrictSerializer(serializers.Serializer):
     """Serializer that throws an error for unknown fields."""
 
@@ -806,7 +867,10 @@ class CommonModelSerializer(StrictSerializer, PatchModelSerializer, LazyableMode
         return instance
 
     def to_representation(self, instance):
-        rep = super().to_representation(instance)
+        if is_compiled_representation_enabled(self):
+            rep = compiled_to_representation(self, instance)
+        else:
+            rep = super().to_representation(instance)
         if not self.context.get("include_nulls"):
             rep = {k: v for k, v in rep.items() if v is not None}
         return rep
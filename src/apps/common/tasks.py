@@ -1,10 +1,14 @@
 import logging
+from typing import Callable, Optional, Type, TypeVar
 
 from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
 from django_q.tasks import async_task
 
 logger = logging.getLogger()
 
+CallbackType = TypeVar("CallbackType", bound=Callable[[], None])
+
 
 def run_task(fn, *args, **kwargs):
     """Run function as a background task.
@@ -20,3 +24,29 @@ def run_task(fn, *args, **kwargs):
     else:
         # Background tasks disabled, run immediately
         fn(*args, **kwargs)
+
+
+def on_commit_coalesced(
+    callback_cls: Type[CallbackType],
+    update_fn: Callable[[CallbackType], None],
+    using: Optional[str] = None,
+):
+    """Update on-commit callback of callback_cls for the current transaction.
+
+    If the current transaction already has a callback_cls callback, update_fn is
+    called with the existing callback. Otherwise, a new callback_cls() instance is
+    updated and registered with transaction.on_commit. This allows combining
+    multiple changes in the same transaction into a single callback.
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    if connection.in_atomic_block:
+        # The run_on_commit list is cleared on rollback
+        # so a callback from a failed transaction is never reused.
+        for _sids, callback, *_ in connection.run_on_commit:
+            if isinstance(callback, callback_cls):
+                update_fn(callback)
+                return
+
+    callback = callback_cls()
+    update_fn(callback)
+    transaction.on_commit(callback, using=using)
@@ -1,11 +1,14 @@
+import hashlib
+import json
 from functools import cached_property
 from typing import ContextManager, List, Optional
 
 from cachalot.api import cachalot_disabled
 from django.conf import settings
+from django.utils.http import parse_etags, quote_etag
 from django.utils.translation import gettext_lazy as _
 from rest_access_policy import AccessViewSetMixin
-from rest_framework import exceptions, serializers, viewsets
+from rest_framework import exceptions, serializers, status, viewsets
 from rest_framework.exceptions import NotAuthenticated
 from rest_framework.generics import get_object_or_404
 from rest_framework.pagination import PageNumberPagination
@@ -201,6 +204,48 @@ class NonFilteringGetObjectMixin:
         return obj
 
 
+class ETagMixin:
+    """ViewSet mixin for conditional GET requests using strong ETags.
+
+    Views compute the ETag from cheap values (e.g. modification timestamps)
+    before serialization, and return 304 Not Modified without serializing
+    the response when the ETag matches the If-None-Match header.
+    """
+
+    def get_etag(self, *parts) -> str:
+        """Return ETag for the response described by parts.
+
+        The request URL, user and accepted media type are included in
+        the ETag because they also affect the response content.
+        """
+        request = self.request
+        user = request.user
+        etag_data = [
+            request.build_absolute_uri(request.path),
+            sorted((key, sorted(values)) for key, values in request.GET.lists()),
+            str(user.pk) if user.is_authenticated else None,
+            getattr(request, "accepted_media_type", None),
+            [str(part) for part in parts],
+        ]
+        digest = hashlib.sha256(json.dumps(etag_data).encode()).hexdigest()
+        return quote_etag(digest[:32])
+
+    def etag_matches(self, etag: str) -> bool:
+        """Return True if the If-None-Match header of the request matches etag."""
+        if_none_match = self.request.META.get("HTTP_IF_NONE_MATCH")
+        if not if_none_match:
+            return False
+        etags = parse_etags(if_none_match)
+        # If-None-Match uses weak comparison
+        return "*" in etags or any(value.removeprefix("W/") == etag for value in etags)
+
+    def get_not_modified_response(self, etag: str) -> Optional[Response]:
+        """Return 304 response if the request ETag matches, otherwise None."""
+        if self.etag_matches(etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return None
+
+
 class LogQueriesQueryParamsSerializer(serializers.Serializer):
     log_queries = serializers.BooleanField(required=False)
     slow_query_limit = serializers.FloatField(required=False)
@@ -1,6 +1,25 @@
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.db.models import Max, Value, prefetch_related_objects
 from django.db.models.base import Model as Model
+from django.http import QueryDict
+
+from apps.cache import single_flight
+from apps.cache.serializer_cache import CacheWriteStats, SerializerCacheBase
+from apps.common.tasks import on_commit_coalesced, run_task
 
-from apps.cache.serializer_cache import SerializerCacheBase
+logger = logging.getLogger(__name__)
 
 
 class DatasetSerializerCache(SerializerCacheBase):
@@ -26,3 +45,268 @@ class DatasetSerializerCache(SerializerCacheBase):
         "theme",
         "title",
     }
+
+    @classmethod
+    def get_local_cache_limits(cls) -> Tuple[int, int]:
+        return settings.DATASET_CACHE_LOCAL_MAX_ENTRIES, settings.DATASET_CACHE_LOCAL_MAX_BYTES
+
+    @classmethod
+    def get_compress_min_size(cls) -> Optional[int]:
+        return settings.DATASET_CACHE_COMPRESS_MIN_SIZE
+
+    @classmethod
+    def get_max_item_size(cls) -> Optional[int]:
+        return settings.DATASET_CACHE_MAX_ITEM_SIZE
+
+
+def is_dataset_cache_enabled() -> bool:
+    return not isinstance(DatasetSerializerCache.get_source_cache(), DummyCache)
+
+
+def get_cache_serializer_context() -> dict:
+    """Return serializer context for serializing cached fields outside of a request."""
+
+    class View:
+        query_params = {}
+
+    dummy_view = View()
+
+    class DummyRequest:
+        view = dummy_view
+        user = AnonymousUser()
+
+    return {
+        "request": DummyRequest,
+        "view": dummy_view,
+    }
+
+
+def prefetch_cached_fields(datasets: list, serializer):
+    """Prefetch only relations needed by the cached fields of serializer."""
+    from apps.core.models import Dataset
+
+    cached_fields = set(serializer.get_cached_field_sources())
+    cached_prefetch_fields = []
+    for prefetch in Dataset.common_prefetch_fields:
+        if type(prefetch) is str:
+            prefix = prefetch.split("__", 1)[0]
+            if prefix not in cached_fields:
+                continue
+        cached_prefetch_fields.append(prefetch)
+    prefetch_related_objects(datasets, *cached_prefetch_fields)
+
+
+@dataclass
+class DatasetCacheUpdateResult:
+    datasets: int = 0  # Number of datasets found
+    serialized: int = 0  # Number of datasets serialized to cache
+    write_stats: CacheWriteStats = field(default_factory=CacheWriteStats)
+
+
+def update_dataset_cache(
+    dataset_ids: List[UUID], include_cached=False, manager="available_objects"
+) -> DatasetCacheUpdateResult:
+    """Serialize cached fields of datasets that don't have an up-to-date cache entry.
+
+    When include_cached is enabled, datasets are serialized even if they are already cached.
+    """
+    from apps.core.models import Dataset
+    from apps.core.serializers.dataset_serializer import CachedFieldsOnlyDatasetSerializer
+
+    # Mark datasets as prefetched to avoid Dataset.ensure_prefetch
+    # from triggering unneeded prefetches
+    datasets = list(
+        getattr(Dataset, manager).filter(id__in=dataset_ids).annotate(is_prefetched=Value(True))
+    )
+    result = DatasetCacheUpdateResult(datasets=len(datasets))
+    cache = DatasetSerializerCache([] if include_cached else datasets, autocommit=False)
+    datasets = [dataset for dataset in datasets if dataset.id not in cache.values]
+    if not datasets:
+        return result
+
+    serializer = CachedFieldsOnlyDatasetSerializer(
+        cache=cache, context=get_cache_serializer_context()
+    )
+    prefetch_cached_fields(datasets, serializer)
+    for dataset in datasets:
+        serializer.to_representation(dataset)
+    cache.commit_changed_to_source()
+    result.serialized = len(datasets)
+    result.write_stats = cache.write_stats
+    return result
+
+
+class DatasetCacheUpdate:
+    """On-commit callback that updates dataset cache for all datasets changed in a transaction."""
+
+    def __init__(self):
+        self.dataset_ids = set()
+
+    def __call__(self):
+        run_task(update_dataset_cache, dataset_ids=list(self.dataset_ids))
+
+
+def schedule_dataset_cache_update(dataset_id: UUID):
+    """Update serialized dataset in cache after the current transaction is committed.
+
+    Multiple updates of the same dataset (and of any datasets) in the
+    same transaction are combined into a single task.
+    """
+    if not (settings.ENABLE_DATASET_CACHE_EAGER_UPDATE and is_dataset_cache_enabled()):
+        return
+
+    on_commit_coalesced(DatasetCacheUpdate, lambda callback: callback.dataset_ids.add(dataset_id))
+
+
+DATASET_LIST_GENERATION_KEY = "dataset-list-generation"
+
+
+def get_dataset_list_response_cache():
+    return caches["default"]
+
+
+def _initial_dataset_list_generation() -> int:
+    # Start from current time so generations don't repeat if the key is evicted
+    return int(time.time() * 1000)
+
+
+def invalidate_dataset_list_responses():
+    """Invalidate all cached dataset list responses and list ETags.
+
+    Called after commit for created and updated datasets, and for changes
+    that don't update the record_modified of any dataset, e.g. deleting
+    datasets or modifying data catalogs.
+    """
+    cache = get_dataset_list_response_cache()
+    try:
+        cache.incr(DATASET_LIST_GENERATION_KEY)
+    except ValueError:
+        cache.set(DATASET_LIST_GENERATION_KEY, _initial_dataset_list_generation(), timeout=None)
+
+
+def get_dataset_list_generation() -> Optional[int]:
+    """Return counter incremented by invalidate_dataset_list_responses.
+
+    Returns None if the cache does not store values.
+    """
+    cache = get_dataset_list_response_cache()
+    generation = cache.get(DATASET_LIST_GENERATION_KEY)
+    if generation is None:
+        cache.add(DATASET_LIST_GENERATION_KEY, _initial_dataset_list_generation(), timeout=None)
+        generation = cache.get(DATASET_LIST_GENERATION_KEY)
+    return generation
+
+
+def get_dataset_list_watermark() -> Tuple[Optional[datetime], Optional[int]]:
+    """Return latest dataset modification timestamp and dataset list generation.
+
+    The watermark changes whenever a dataset list response may have changed.
+    """
+    from apps.core.models import Dataset
+
+    latest_modified = Dataset.all_objects.aggregate(latest=Max("record_modified"))["latest"]
+    return latest_modified, get_dataset_list_generation()
+
+
+def get_dataset_list_response_cache_key(
+    request, watermark: Tuple[Optional[datetime], Optional[int]]
+) -> str:
+    """Return cache key for a dataset list response.
+
+    The key contains the normalized query parameters and the watermark from
+    get_dataset_list_watermark, so cached responses don't need to be
+    invalidated separately when datasets change.
+    """
+    latest_modified, generation = watermark
+    params = sorted((key, sorted(values)) for key, values in request.GET.lists())
+    key_data = [
+        request.build_absolute_uri(request.path),
+        params,
+        latest_modified.isoformat() if latest_modified else None,
+        generation,
+    ]
+    digest = hashlib.sha256(json.dumps(key_data).encode()).hexdigest()
+    return f"dataset-list:{digest}"
+
+
+# Aggregates of these variants of GET /v3/datasets/aggregates?filter_language=<language>
+# &publishing_channels=<channel> for anonymous users are computed in the background
+DEFAULT_AGGREGATES_LANGUAGES = ["en", "fi"]
+DEFAULT_AGGREGATES_PUBLISHING_CHANNELS = ["default", "etsin", "ttv"]
+PRECOMPUTED_AGGREGATES_TIMEOUT = 24 * 60 * 60
+
+
+def get_dataset_aggregates_cache_key(
+    query_params: QueryDict, watermark: Tuple[Optional[datetime], Optional[int]]
+) -> str:
+    """Return cache key for aggregates of published datasets for anonymous users.
+
+    Like get_dataset_list_response_cache_key, the key contains the watermark
+    so changes to datasets make earlier values unreachable.
+    """
+    latest_modified, generation = watermark
+    params = {key: sorted(values) for key, values in query_params.lists()}
+    if not any(params.get("publishing_channels", [])):
+        params["publishing_channels"] = ["default"]  # Default of DatasetFilter
+    key_data = [
+        sorted(params.items()),
+        latest_modified.isoformat() if latest_modified else None,
+        generation,
+    ]
+    digest = hashlib.sha256(json.dumps(key_data).encode()).hexdigest()
+    return f"dataset-aggregates:{digest}"
+
+
+def compute_anonymous_dataset_aggregates(query_params: QueryDict) -> dict:
+    """Compute dataset aggregates visible to anonymous users."""
+    from apps.core.models import Dataset
+    from apps.core.views.dataset_aggregation import aggregate_queryset
+    from apps.core.views.dataset_filters import DatasetFilter
+
+    queryset = Dataset.available_objects.filter(state=Dataset.StateChoices.PUBLISHED)
+    queryset = DatasetFilter(data=query_params, queryset=queryset).qs
+    return aggregate_queryset(queryset, query_params)
+
+
+def refresh_default_aggregates():
+    """Compute default dataset aggregates that are not up to date in the cache."""
+    cache = get_dataset_list_response_cache()
+    watermark = get_dataset_list_watermark()
+    for language in DEFAULT_AGGREGATES_LANGUAGES:
+        for channel in DEFAULT_AGGREGATES_PUBLISHING_CHANNELS:
+            query_params = QueryDict(mutable=True)
+            query_params.update({"filter_language": language, "publishing_channels": channel})
+            single_flight.get_or_compute(
+                cache,
+                get_dataset_aggregates_cache_key(query_params, watermark),
+                lambda: compute_anonymous_dataset_aggregates(query_params),
+                timeout=PRECOMPUTED_AGGREGATES_TIMEOUT,
+            )
+
+
+class DatasetAggregatesRefresh:
+    """On-commit callback that refreshes default dataset aggregates."""
+
+    def __init__(self):
+        self.invalidate = False
+
+    def __call__(self):
+        if self.invalidate:
+            invalidate_dataset_list_responses()
+        if settings.ENABLE_DATASET_AGGREGATES_CACHE:
+            run_task(refresh_default_aggregates)
+
+
+def schedule_dataset_aggregates_refresh(invalidate=False):
+    """Refresh default dataset aggregates after the current transaction is committed.
+
+    Use invalidate=True to also invalidate dataset list responses and list ETags,
+    e.g. for created and updated datasets or background updates of the dataset index.
+    """
+    if not (invalidate or settings.ENABLE_DATASET_AGGREGATES_CACHE):
+        return
+
+    def update(callback: DatasetAggregatesRefresh):
+        callback.invalidate = callback.invalidate or invalidate
+
+    on_commit_coalesced(DatasetAggregatesRefresh, update)
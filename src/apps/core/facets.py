@@ -0,0 +1,304 @@
+"""In-memory facet counting for dataset aggregates.
+
+The facet engine keeps the dataset-entry links of DatasetIndexEntry in
+numpy arrays, separately for each language. Dataset ids are mapped to
+dense integer positions, so a filtered result set becomes a boolean
+mask over positions and facet counts are computed for all entries at
+once with a single np.bincount over the links of the masked datasets.
+
+Each process has its own engine snapshot. Changes to the index are
+published through the default cache as a version counter and a list of
+changed datasets for each version. Links of changed datasets are
+reloaded into a small override table that is counted separately until
+there are too many changes, after which the snapshot is rebuilt.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from django.core.cache import caches
+
+from apps.common.tasks import on_commit_coalesced
+from apps.core.models import DatasetIndexEntry
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "facet-engine-version"
+CHANGES_KEY = "facet-engine-changes"
+CHANGES_TIMEOUT = 3600
+
+# Rebuild snapshot when this many datasets have changed since the last build
+MAX_OVERRIDES = 10000
+
+EntryInfo = Tuple[str, str, str]  # (language, key, value)
+
+
+def get_facet_cache():
+    return caches["default"]
+
+
+def _initial_version() -> int:
+    # Start from current time so versions don't repeat if the key is evicted
+    return int(time.time() * 1000)
+
+
+def get_facet_version() -> Optional[int]:
+    """Return current index version, None if the cache does not store values."""
+    cache = get_facet_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, _initial_version(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def record_facet_changes(dataset_ids: Iterable[UUID]):
+    """Publish datasets with changed index entries to facet engines of all processes."""
+    cache = get_facet_cache()
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        version = _initial_version()
+        cache.set(VERSION_KEY, version, timeout=None)
+    cache.set(f"{CHANGES_KEY}:{version}", list(dataset_ids), timeout=CHANGES_TIMEOUT)
+
+
+class FacetChanges:
+    """On-commit callback that publishes datasets with changed index entries."""
+
+    def __init__(self):
+        self.dataset_ids = set()
+
+    def __call__(self):
+        record_facet_changes(self.dataset_ids)
+
+
+def schedule_facet_changes(dataset_ids: Iterable[UUID]):
+    """Publish datasets with changed index entries after the current transaction is committed.
+
+    Multiple calls in the same transaction are combined.
+    """
+    on_commit_coalesced(FacetChanges, lambda callback: callback.dataset_ids.update(dataset_ids))
+
+
+@dataclass
+class LanguageLinks:
+    """Dataset-entry links of entries in one language."""
+
+    entry_ids: List[int]  # Entry id of each entry index
+    entry_index: Dict[int, int]  # Entry id -> entry index
+    entries_by_key: Dict[str, np.ndarray]  # Key -> entry indices
+    link_positions: np.ndarray  # Dataset position of each link
+    link_entries: np.ndarray  # Entry index of each link
+
+
+@dataclass
+class FacetSnapshot:
+    version: Optional[int]
+    positions: Dict[UUID, int]  # Dataset id -> position
+    entries: Dict[int, EntryInfo]  # Entry id -> (language, key, value)
+    languages: Dict[str, LanguageLinks]
+    # Current entry ids of datasets changed after the snapshot was built,
+    # their links in the arrays of LanguageLinks are ignored
+    overrides: Dict[int, List[int]] = field(default_factory=dict)
+    override_positions: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+
+    def _mask(self, dataset_ids: Iterable[UUID]) -> np.ndarray:
+        positions = [p for id in dataset_ids if (p := self.positions.get(id)) is not None]
+        mask = np.zeros(len(self.positions), dtype=bool)
+        mask[positions] = True
+        return mask
+
+    def count(
+        self,
+        dataset_ids: Iterable[UUID],
+        language: str,
+        keys: Iterable[str],
+        limit: int,
+        search: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, List[Tuple[str, int]]]:
+        """Count datasets for entries, return top (value, count) pairs for each key.
+
+        When search is set, only entries with value containing the
+        search string for the key are included.
+        """
+        mask = self._mask(dataset_ids)
+        base_mask = mask.copy()
+        base_mask[self.override_positions] = False
+
+        links = self.languages.get(language)
+        base_counts = None
+        if links is not None:
+            selected = base_mask[links.link_positions]
+            base_counts = np.bincount(links.link_entries[selected], minlength=len(links.entry_ids))
+
+        # Count overridden datasets
+        extra_counts: Dict[str, Counter] = defaultdict(Counter)
+        for position in self.override_positions[mask[self.override_positions]]:
+            for entry_id in self.overrides[int(position)]:
+                entry_language, key, value = self.entries[entry_id]
+                if entry_language != language:
+                    continue
+                if links is not None and (index := links.entry_index.get(entry_id)) is not None:
+                    base_counts[index] += 1
+                else:
+                    extra_counts[key][value] += 1
+
+        search = {key: value.casefold() for key, value in (search or {}).items()}
+        result = {}
+        for key in keys:
+            counts = Counter(extra_counts.get(key, {}))
+            if links is not None and (indices := links.entries_by_key.get(key)) is not None:
+                key_counts = base_counts[indices]
+                nonzero = np.flatnonzero(key_counts)
+                for i in nonzero:
+                    value = self.entries[links.entry_ids[indices[i]]][2]
+                    counts[value] += int(key_counts[i])
+            if term := search.get(key):
+                counts = Counter({v: c for v, c in counts.items() if term in v.casefold()})
+            hits = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            if hits:
+                result[key] = hits
+        return result
+
+
+def _get_entries() -> Dict[int, EntryInfo]:
+    return {
+        id: (language, key, value)
+        for id, language, key, value in DatasetIndexEntry.objects.order_by().values_list(
+            "id", "language", "key", "value"
+        )
+    }
+
+
+def _get_links(dataset_ids: Optional[List[UUID]] = None) -> List[Tuple[UUID, int]]:
+    """Return (dataset_id, entry_id) pairs, optionally for given datasets only."""
+    through = DatasetIndexEntry.datasets.through
+    links = through.objects.order_by()
+    if dataset_ids is not None:
+        links = links.filter(dataset_id__in=dataset_ids)
+    return list(links.values_list("dataset_id", "datasetindexentry_id"))
+
+
+def build_snapshot(version: Optional[int]) -> FacetSnapshot:
+    """Load all index entry links into a new snapshot."""
+    entries = _get_entries()
+    links = _get_links()
+
+    positions: Dict[UUID, int] = {}
+    link_positions: Dict[str, List[int]] = defaultdict(list)
+    link_entry_ids: Dict[str, List[int]] = defaultdict(list)
+    for dataset_id, entry_id in links:
+        info = entries.get(entry_id)
+        if info is None:
+            continue  # Entry created after entries were loaded
+        position = positions.setdefault(dataset_id, len(positions))
+        link_positions[info[0]].append(position)
+        link_entry_ids[info[0]].append(entry_id)
+
+    languages = {}
+    for language, entry_ids_of_links in link_entry_ids.items():
+        entry_ids = sorted(set(entry_ids_of_links))
+        entry_index = {entry_id: index for index, entry_id in enumerate(entry_ids)}
+        by_key = defaultdict(list)
+        for index, entry_id in enumerate(entry_ids):
+            by_key[entries[entry_id][1]].append(index)
+        languages[language] = LanguageLinks(
+            entry_ids=entry_ids,
+            entry_index=entry_index,
+            entries_by_key={
+                key: np.array(indices, dtype=np.int64) for key, indices in by_key.items()
+            },
+            link_positions=np.array(link_positions[language], dtype=np.int64),
+            link_entries=np.array(
+                [entry_index[entry_id] for entry_id in entry_ids_of_links], dtype=np.int64
+            ),
+        )
+    logger.info(f"Facet engine loaded {len(links)} links of {len(positions)} datasets")
+    return FacetSnapshot(
+        version=version, positions=positions, entries=entries, languages=languages
+    )
+
+
+def apply_changes(snapshot: FacetSnapshot, version: int, dataset_ids: List[UUID]) -> FacetSnapshot:
+    """Return new snapshot with current links of changed datasets as overrides."""
+    positions = dict(snapshot.positions)
+    entries = dict(snapshot.entries)
+    overrides = dict(snapshot.overrides)
+    for dataset_id in dataset_ids:
+        position = positions.setdefault(dataset_id, len(positions))
+        overrides[position] = []
+
+    links = _get_links(dataset_ids)
+    if missing := {entry_id for _, entry_id in links if entry_id not in entries}:
+        entries.update(
+            (id, (language, key, value))
+            for id, language, key, value in DatasetIndexEntry.objects.filter(
+                id__in=missing
+            ).values_list("id", "language", "key", "value")
+        )
+    for dataset_id, entry_id in links:
+        if entry_id in entries:
+            overrides[positions[dataset_id]].append(entry_id)
+
+    return FacetSnapshot(
+        version=version,
+        positions=positions,
+        entries=entries,
+        languages=snapshot.languages,
+        overrides=overrides,
+        override_positions=np.array(sorted(overrides), dtype=np.int64),
+    )
+
+
+class FacetEngine:
+    """Per-process holder of the current facet snapshot."""
+
+    def __init__(self):
+        self.snapshot: Optional[FacetSnapshot] = None
+        self.lock = threading.Lock()
+
+    def _get_changed_datasets(self, since: int, version: int) -> Optional[List[UUID]]:
+        """Return datasets changed after version since, None if changes are not available."""
+        keys = [f"{CHANGES_KEY}:{v}" for v in range(since + 1, version + 1)]
+        if len(keys) > MAX_OVERRIDES:
+            return None
+        values = get_facet_cache().get_many(keys)
+        if len(values) != len(keys):
+            return None
+        return list({dataset_id for ids in values.values() for dataset_id in ids})
+
+    def get_snapshot(self) -> FacetSnapshot:
+        """Return up-to-date snapshot, updating it if the index has changed."""
+        version = get_facet_version()
+        snapshot = self.snapshot
+        if snapshot is not None and version is not None and snapshot.version == version:
+            return snapshot
+
+        with self.lock:
+            snapshot = self.snapshot
+            if snapshot is not None and version is not None and snapshot.version == version:
+                return snapshot
+
+            changed = None
+            if snapshot is not None and snapshot.version is not None and version is not None:
+                changed = self._get_changed_datasets(snapshot.version, version)
+            if changed is not None and len(snapshot.overrides) + len(changed) <= MAX_OVERRIDES:
+                snapshot = apply_changes(snapshot, version, changed)
+            else:
+                snapshot = build_snapshot(version)
+            self.snapshot = snapshot
+            return snapshot
+
+    def reset(self):
+        with self.lock:
+            self.snapshot = None
+
+
+facet_engine = FacetEngine()
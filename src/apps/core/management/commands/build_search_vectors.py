@@ -0,0 +1,96 @@
+import multiprocessing
+import time
+from argparse import ArgumentParser
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from typing import Iterator
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.core.management.commands.cache_datasets import InlineExecutor, init_worker
+from apps.core.models import Dataset
+from apps.core.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    """Build full-text search vectors of datasets.
+
+    Replaces buildwatson for dataset search when ENABLE_DATASET_SEARCH_VECTOR is enabled.
+    """
+
+    def add_arguments(self, parser: ArgumentParser):
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            required=False,
+            default=False,
+            help="Only build search vectors for datasets that don't have one.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of datasets updated in a single query.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of worker processes.",
+        )
+
+    def iter_dataset_id_chunks(self, chunk_size: int, missing: bool) -> Iterator[list]:
+        """Yield chunks of dataset ids in id order using keyset pagination."""
+        last_id = None
+        while True:
+            queryset = Dataset.all_objects.order_by("id")
+            if missing:
+                queryset = queryset.filter(search_vector__isnull=True)
+            if last_id is not None:
+                queryset = queryset.filter(id__gt=last_id)
+            ids = list(queryset.values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        processes = options["processes"]
+        self.stdout.write(
+            f"Building search vectors in chunks of {chunk_size} using {processes} processes"
+        )
+
+        executor: Executor
+        if processes > 1:
+            connections.close_all()  # Forked workers must not reuse the parent connection
+            executor = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=init_worker,
+            )
+        else:
+            executor = InlineExecutor()
+
+        start = time.monotonic()
+        updated = 0
+
+        def handle_result(count: int):
+            nonlocal updated
+            updated += count
+            rate = updated / max(time.monotonic() - start, 0.001)
+            self.stdout.write(f"Updated {updated} search vectors ({rate:.1f} datasets/s)")
+
+        # Limit number of chunks in flight so ids are not all loaded in advance
+        max_pending = max(processes * 2, 1)
+        pending = set()
+        with executor:
+            for ids in self.iter_dataset_id_chunks(chunk_size, missing=options["missing"]):
+                pending.add(executor.submit(update_search_vectors, ids, batch_size=chunk_size))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        handle_result(future.result())
+            for future in pending:
+                handle_result(future.result())
+        self.stdout.write("All search vectors updated")
@@ -42,8 +42,7 @@ def rebuild_index_for_model(
                 "actors",
                 "actors__person",
                 "actors__organization",
-                "actors__organization__parent",
-                "actors__organization__parent__parent",
+                "actors__organization__ancestor_links__ancestor",
                 "other_identifiers",
                 "relation",
                 "relation__entity",
@@ -1,17 +1,30 @@
+import multiprocessing
+import time
 from argparse import ArgumentParser
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
 from itertools import batched
-from typing import List
+from typing import Iterator, List
 
-from django.contrib.auth.models import AnonymousUser
 from django.core.cache import caches
 from django.core.cache.backends.dummy import DummyCache
 from django.core.management.base import BaseCommand
-from django.db.models import Value, prefetch_related_objects
+from django.db import connections
+from django.db.models import Value
 from rest_framework.serializers import ListSerializer
 
-from apps.core.cache import DatasetSerializerCache
+from apps.cache.serializer_cache import CacheWriteStats
+from apps.core.cache import (
+    DatasetCacheUpdateResult,
+    DatasetSerializerCache,
+    get_cache_serializer_context,
+    prefetch_cached_fields,
+    update_dataset_cache,
+)
 from apps.core.models.catalog_record.dataset import Dataset
-from apps.core.serializers.dataset_serializer import DatasetSerializer
+from apps.core.serializers.dataset_serializer import (
+    CachedFieldsOnlyDatasetSerializer,
+    DatasetSerializer,
+)
 
 
 class CacheListSerializer(ListSerializer):
@@ -29,42 +42,33 @@ class CacheListSerializer(ListSerializer):
         return rep
 
 
-class CachedFieldsOnlyDatasetSerializer(DatasetSerializer):
-    def get_fields(self):
-        fields = super().get_fields()
-        cached_fields = self.cache.cached_fields
-        fields = {name: fields[name] for name in cached_fields}
-        return fields
+def init_worker():
+    """Don't share DB and cache connections with the parent process.
+
+    Inherited DB connections are discarded without closing them, because
+    closing would also end the session of the parent process.
+    """
+    for conn in connections.all(initialized_only=True):
+        conn.connection = None
+    caches.close_all()
+
+
+class InlineExecutor(Executor):
+    """Executor that runs tasks in the current process."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
 
 
 class Command(BaseCommand):
     def prefetch_cachable_fields(self, datasets: List[Dataset], serializer: DatasetSerializer):
-        cached_fields = set(serializer.get_cached_field_sources())
-        cached_prefetch_fields = []
-        for prefetch in Dataset.common_prefetch_fields:
-            if type(prefetch) is str:
-                prefix = prefetch.split("__", 1)[0]
-                if prefix not in cached_fields:
-                    continue
-            cached_prefetch_fields.append(prefetch)
-
-        prefetch_related_objects(datasets, *cached_prefetch_fields)
+        prefetch_cached_fields(datasets, serializer)
         self.stdout.write("Prefetch complete")
 
     def get_serializer_context(self):
-        class View:
-            query_params = {}
-
-        dummy_view = View()
-
-        class DummyRequest:
-            view = dummy_view
-            user = AnonymousUser()
-
-        return {
-            "request": DummyRequest,
-            "view": dummy_view,
-        }
+        return get_cache_serializer_context()
 
     def add_arguments(self, parser: ArgumentParser):
         parser.add_argument(
@@ -75,6 +79,113 @@ class Command(BaseCommand):
             default=False,
             help="Refresh cache for all datasets.",
         )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            required=False,
+            default=False,
+            help="Process datasets in chunks instead of loading all datasets at once.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of datasets in a chunk when using --stream.",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of worker processes when using --stream.",
+        )
+
+    def iter_dataset_id_chunks(self, chunk_size: int) -> Iterator[list]:
+        """Yield chunks of dataset ids in id order using keyset pagination."""
+        last_id = None
+        while True:
+            queryset = Dataset.objects.order_by("id")
+            if last_id is not None:
+                queryset = queryset.filter(id__gt=last_id)
+            ids = list(queryset.values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
+
+    def count_cached(self, chunk_size: int) -> int:
+        """Count datasets that have an up-to-date cache entry."""
+        cached_count = 0
+        for ids in self.iter_dataset_id_chunks(chunk_size):
+            datasets = Dataset.objects.filter(id__in=ids).only("id", "record_modified")
+            cached_count += len(DatasetSerializerCache(datasets, autocommit=False).values)
+        return cached_count
+
+    def handle_stream(self, include_cached: bool, chunk_size: int, processes: int):
+        datasets_count = Dataset.objects.count()
+        self.stdout.write(
+            f"Caching {'all' if include_cached else 'uncached'} datasets "
+            f"in chunks of {chunk_size} using {processes} processes"
+        )
+
+        executor: Executor
+        if processes > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=init_worker,
+            )
+        else:
+            executor = InlineExecutor()
+
+        start = time.monotonic()
+        processed = 0
+        serialized = 0
+        write_stats = CacheWriteStats()
+
+        def handle_result(result: DatasetCacheUpdateResult):
+            nonlocal processed, serialized
+            processed += result.datasets
+            serialized += result.serialized
+            write_stats.entries += result.write_stats.entries
+            write_stats.sharded += result.write_stats.sharded
+            write_stats.pickled_bytes += result.write_stats.pickled_bytes
+            write_stats.stored_bytes += result.write_stats.stored_bytes
+            rate = serialized / max(time.monotonic() - start, 0.001)
+            self.stdout.write(
+                f"Processed {processed}/{datasets_count} datasets, "
+                f"cached {serialized} ({rate:.1f} datasets/s)"
+            )
+
+        # Limit number of chunks in flight so ids are not all loaded in advance
+        max_pending = max(processes * 2, 1)
+        pending = set()
+        with executor:
+            for ids in self.iter_dataset_id_chunks(chunk_size):
+                pending.add(
+                    executor.submit(
+                        update_dataset_cache,
+                        ids,
+                        include_cached=include_cached,
+                        manager="objects",
+                    )
+                )
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        handle_result(future.result())
+            for future in pending:
+                handle_result(future.result())
+
+        self.stdout.write(
+            f"Compression ratio: {write_stats.compression_ratio:.2f}, "
+            f"sharded entries: {write_stats.sharded}"
+        )
+        cached_datasets_count = self.count_cached(chunk_size)
+        if datasets_count == cached_datasets_count:
+            self.stdout.write("Cache ok")
+        else:
+            self.stderr.write("Not all datasets are in cache, check your cache limits")
+            self.stderr.write(f"Cached datasets: {cached_datasets_count}/{datasets_count}")
 
     def handle(self, *args, **options):
         datasets_cache = caches["serialized_datasets"]
@@ -83,6 +194,13 @@ class Command(BaseCommand):
             return
         self.stdout.write(f"Using {datasets_cache.__class__.__name__} cache backend\n")
 
+        if options.get("stream"):
+            return self.handle_stream(
+                include_cached=options.get("all"),
+                chunk_size=options["chunk_size"],
+                processes=options["processes"],
+            )
+
         # Mark datasets as prefetched to avoid Dataset.ensure_prefetch
         # from triggering unneeded prefetches
         all_datasets = Dataset.objects.annotate(is_prefetched=Value(True))
@@ -110,6 +228,12 @@ class Command(BaseCommand):
         self.prefetch_cachable_fields(datasets, serializer.child)
         serializer.data  # Run serialization
 
+        write_stats = cache.write_stats
+        self.stdout.write(
+            f"Compression ratio: {write_stats.compression_ratio:.2f}, "
+            f"sharded entries: {write_stats.sharded}"
+        )
+
         # Check if all datasets are now in cache
         cache.clear()
         cache.fetch_from_source(all_datasets, include_newer=True)
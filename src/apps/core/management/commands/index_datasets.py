@@ -1,28 +1,99 @@
+import multiprocessing
+import time
+from argparse import ArgumentParser
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from typing import Iterator, List
+from uuid import UUID
+
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
+from apps.core.management.commands.cache_datasets import InlineExecutor, init_worker
 from apps.core.models.catalog_record.dataset import Dataset
 from apps.core.models.catalog_record.dataset_index import DatasetIndexEntry
 
 
+def index_datasets(dataset_ids: List[UUID]) -> int:
+    """Update index entries for a chunk of datasets, return number of datasets indexed."""
+    with transaction.atomic():
+        datasets = list(
+            Dataset.objects.filter(id__in=dataset_ids).select_related(
+                "access_rights__access_type", "data_catalog"
+            )
+        )
+        DatasetIndexEntry.objects.create_for_datasets(datasets)
+    return len(datasets)
+
+
 class Command(BaseCommand):
     """Update dataset facet index entries."""
 
-    def handle(self, *args, **options):
-        all_datasets = Dataset.objects.prefetch_related(
-            "access_rights__access_type", "data_catalog"
+    def add_arguments(self, parser: ArgumentParser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of datasets indexed in a single transaction.",
         )
-        count = 0
-        total = len(all_datasets)
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=1,
+            help="Number of worker processes.",
+        )
+
+    def iter_dataset_id_chunks(self, chunk_size: int) -> Iterator[list]:
+        """Yield chunks of dataset ids in id order using keyset pagination."""
+        last_id = None
+        while True:
+            queryset = Dataset.objects.order_by("id")
+            if last_id is not None:
+                queryset = queryset.filter(id__gt=last_id)
+            ids = list(queryset.values_list("id", flat=True)[:chunk_size])
+            if not ids:
+                return
+            yield ids
+            last_id = ids[-1]
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        processes = options["processes"]
+        total = Dataset.objects.count()
         self.stdout.write("Updating index entries for all datasets")
-        with transaction.atomic():
-            for dataset in all_datasets:
-                dataset.update_index()
-                count += 1
-                if count % 100 == 0 or count == total:
-                    self.stdout.write(f"{count}/{total} datasets indexed")
-
-            unused_count, _ = DatasetIndexEntry.objects.filter(datasets__isnull=True).delete()
-            if unused_count:
-                self.stdout.write(f"{unused_count} unused entries deleted")
+
+        executor: Executor
+        if processes > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=init_worker,
+            )
+        else:
+            executor = InlineExecutor()
+
+        start = time.monotonic()
+        count = 0
+
+        def handle_result(indexed: int):
+            nonlocal count
+            count += indexed
+            rate = count / max(time.monotonic() - start, 0.001)
+            self.stdout.write(f"{count}/{total} datasets indexed ({rate:.1f} datasets/s)")
+
+        # Limit number of chunks in flight so ids are not all loaded in advance
+        max_pending = max(processes * 2, 1)
+        pending = set()
+        with executor:
+            for ids in self.iter_dataset_id_chunks(chunk_size):
+                pending.add(executor.submit(index_datasets, ids))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        handle_result(future.result())
+            for future in pending:
+                handle_result(future.result())
+
+        # Remove also entries left unused by changes that didn't schedule a cleanup
+        if unused_count := DatasetIndexEntry.objects.delete_unused_entries():
+            self.stdout.write(f"{unused_count} unused entries deleted")
         self.stdout.write("All dataset index entries updated")
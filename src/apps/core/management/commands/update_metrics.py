@@ -7,6 +7,7 @@ from django.core.management.base import BaseCommand, CommandParser
 from django.utils import timezone
 
 from apps.core import factories
+from apps.core.cache import invalidate_dataset_list_responses
 from apps.core.models import Dataset, DatasetMetrics
 
 logger = logging.getLogger(__name__)
@@ -56,4 +57,5 @@ class Command(BaseCommand):
             count = self.fake_metrics(identifiers)
         else:
             count = self.fetch_metrics()
+        invalidate_dataset_list_responses()  # Responses may include metrics
         self.stdout.write(f"Created or updated metrics for {count} datasets")
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.4 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0072_remoteresource_byte_size_dataservice_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(fields=['record_modified'], name='core_dataset_record_modified'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0.4 on 2026-10-16 10:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0073_dataset_record_modified_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetSearchVector',
+            fields=[
+                ('dataset', models.OneToOneField(editable=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_vector', serialize=False, to='core.dataset')),
+                ('vector', django.contrib.postgres.search.SearchVectorField(editable=False)),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['vector'], name='core_dataset_search_vector')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.4 on 2026-10-16 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0074_datasetsearchvector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(condition=models.Q(('removed__isnull', True)), fields=['modified', 'id'], name='core_dataset_modified_id'),
+        ),
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(condition=models.Q(('removed__isnull', True)), fields=['created', 'id'], name='core_dataset_created_id'),
+        ),
+    ]
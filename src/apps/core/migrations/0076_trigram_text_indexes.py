@@ -0,0 +1,31 @@
+# Generated by Django 6.0.4 on 2026-10-16 12:12
+
+import apps.common.functions
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('common', '0002_trigram_text_functions'),
+        ('core', '0075_dataset_keyset_indexes'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='dataset',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(apps.common.functions.LowerValues('title'), name='gin_trgm_ops'), name='core_dataset_title_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='dataset',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(apps.common.functions.LowerArrayText('keyword'), name='gin_trgm_ops'), name='core_dataset_keyword_trgm'),
+        ),
+        AddIndexConcurrently(
+            model_name='datasetproject',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(apps.common.functions.LowerValues('title'), name='gin_trgm_ops'), name='core_datasetproject_title_trgm'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 6.0.4 on 2026-10-16 13:05
+
+import django.db.migrations.operations.special
+from django.db import migrations, models
+from apps.core.models.catalog_record.dataset_versions import update_latest_version_flags
+
+def update_flags(apps, schema_editor):
+    model = apps.get_model("core", "Dataset")
+    datasets = model.objects.all() # Includes soft deleted datasets
+    update_latest_version_flags(datasets)
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0076_trigram_text_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dataset',
+            name='is_latest_published',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='dataset',
+            name='is_latest_version',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(condition=models.Q(('is_latest_version', True), ('removed__isnull', True)), fields=['modified', 'id'], name='core_dataset_latest_version'),
+        ),
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(condition=models.Q(('is_latest_published', True), ('removed__isnull', True)), fields=['modified', 'id'], name='core_dataset_latest_published'),
+        ),
+        migrations.RunPython(
+            code=update_flags,
+            reverse_code=django.db.migrations.operations.special.RunPython.noop,
+        ),
+    ]
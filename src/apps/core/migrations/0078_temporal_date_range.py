@@ -0,0 +1,24 @@
+# Generated by Django 6.0.4 on 2026-10-16 13:40
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0077_dataset_latest_version_flags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='temporal',
+            name='date_range',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(end_date__isnull=True, start_date__isnull=True, then=None), models.When(start_date__gt=models.F('end_date'), then=None), default=models.Func(models.F('start_date'), models.F('end_date'), models.Value('[]'), function='daterange'), output_field=django.contrib.postgres.fields.ranges.DateRangeField()), output_field=django.contrib.postgres.fields.ranges.DateRangeField()),
+        ),
+        migrations.AddIndex(
+            model_name='temporal',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['date_range'], name='core_temporal_date_range'),
+        ),
+    ]
@@ -0,0 +1,127 @@
+# Generated by Django 6.0.4 on 2026-10-16 14:20
+
+import django.contrib.gis.db.models.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0078_temporal_date_range'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetSpatialExtent',
+            fields=[
+                ('dataset', models.OneToOneField(editable=False, on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='spatial_extent', serialize=False, to='core.dataset')),
+                ('geometry', django.contrib.gis.db.models.fields.GeometryField(editable=False, geography=True, srid=4326)),
+            ],
+        ),
+        # Geolocations and spatials are mostly written with bulk_create and queryset
+        # updates, so DatasetSpatialExtent is kept up to date with statement level
+        # triggers. Transition tables cannot be used with multiple events, so each
+        # event has its own trigger.
+        migrations.RunSQL(
+            sql="""
+            CREATE OR REPLACE FUNCTION core_dataset_refresh_spatial_extent(dataset_ids uuid[])
+            RETURNS void AS $$
+                DELETE FROM core_datasetspatialextent WHERE dataset_id = ANY(dataset_ids);
+                INSERT INTO core_datasetspatialextent (dataset_id, geometry)
+                SELECT s.dataset_id, ST_Collect(g.geometry_2d::geometry)::geography
+                FROM core_geolocation g
+                JOIN core_spatial s ON s.id = g.spatial_id
+                JOIN core_dataset d ON d.id = s.dataset_id
+                WHERE s.dataset_id = ANY(dataset_ids)
+                    AND s.removed IS NULL AND g.removed IS NULL
+                GROUP BY s.dataset_id;
+            $$ LANGUAGE SQL;
+
+            CREATE OR REPLACE FUNCTION core_geolocation_update_spatial_extent()
+            RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    PERFORM core_dataset_refresh_spatial_extent(ARRAY(
+                        SELECT DISTINCT s.dataset_id FROM new_rows r
+                        JOIN core_spatial s ON s.id = r.spatial_id
+                        WHERE s.dataset_id IS NOT NULL
+                    ));
+                ELSIF TG_OP = 'UPDATE' THEN
+                    PERFORM core_dataset_refresh_spatial_extent(ARRAY(
+                        SELECT DISTINCT s.dataset_id
+                        FROM (SELECT spatial_id FROM new_rows UNION SELECT spatial_id FROM old_rows) r
+                        JOIN core_spatial s ON s.id = r.spatial_id
+                        WHERE s.dataset_id IS NOT NULL
+                    ));
+                ELSE
+                    PERFORM core_dataset_refresh_spatial_extent(ARRAY(
+                        SELECT DISTINCT s.dataset_id FROM old_rows r
+                        JOIN core_spatial s ON s.id = r.spatial_id
+                        WHERE s.dataset_id IS NOT NULL
+                    ));
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE OR REPLACE FUNCTION core_spatial_update_spatial_extent()
+            RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'UPDATE' THEN
+                    PERFORM core_dataset_refresh_spatial_extent(ARRAY(
+                        SELECT dataset_id FROM new_rows WHERE dataset_id IS NOT NULL
+                        UNION SELECT dataset_id FROM old_rows WHERE dataset_id IS NOT NULL
+                    ));
+                ELSE
+                    PERFORM core_dataset_refresh_spatial_extent(ARRAY(
+                        SELECT DISTINCT dataset_id FROM old_rows WHERE dataset_id IS NOT NULL
+                    ));
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER core_geolocation_spatial_extent_insert
+            AFTER INSERT ON core_geolocation
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION core_geolocation_update_spatial_extent();
+
+            CREATE TRIGGER core_geolocation_spatial_extent_update
+            AFTER UPDATE ON core_geolocation
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION core_geolocation_update_spatial_extent();
+
+            CREATE TRIGGER core_geolocation_spatial_extent_delete
+            AFTER DELETE ON core_geolocation
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION core_geolocation_update_spatial_extent();
+
+            CREATE TRIGGER core_spatial_spatial_extent_update
+            AFTER UPDATE ON core_spatial
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION core_spatial_update_spatial_extent();
+
+            CREATE TRIGGER core_spatial_spatial_extent_delete
+            AFTER DELETE ON core_spatial
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION core_spatial_update_spatial_extent();
+
+            SELECT core_dataset_refresh_spatial_extent(ARRAY(
+                SELECT DISTINCT s.dataset_id FROM core_spatial s
+                JOIN core_geolocation g ON g.spatial_id = s.id
+                WHERE s.dataset_id IS NOT NULL
+            ));
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS core_geolocation_spatial_extent_insert ON core_geolocation;
+            DROP TRIGGER IF EXISTS core_geolocation_spatial_extent_update ON core_geolocation;
+            DROP TRIGGER IF EXISTS core_geolocation_spatial_extent_delete ON core_geolocation;
+            DROP TRIGGER IF EXISTS core_spatial_spatial_extent_update ON core_spatial;
+            DROP TRIGGER IF EXISTS core_spatial_spatial_extent_delete ON core_spatial;
+            DROP FUNCTION IF EXISTS core_geolocation_update_spatial_extent();
+            DROP FUNCTION IF EXISTS core_spatial_update_spatial_extent();
+            DROP FUNCTION IF EXISTS core_dataset_refresh_spatial_extent(uuid[]);
+            """,
+        ),
+    ]
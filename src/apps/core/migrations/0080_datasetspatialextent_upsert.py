@@ -0,0 +1,53 @@
+# Generated by Django 6.0.4 on 2026-10-16 20:45
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0079_datasetspatialextent'),
+    ]
+
+    operations = [
+        # Upsert extents instead of deleting and inserting them, so concurrent
+        # transactions refreshing the same dataset don't fail on the primary key.
+        # Only extents of datasets without geometries are deleted.
+        migrations.RunSQL(
+            sql="""
+            CREATE OR REPLACE FUNCTION core_dataset_refresh_spatial_extent(dataset_ids uuid[])
+            RETURNS void AS $$
+                INSERT INTO core_datasetspatialextent (dataset_id, geometry)
+                SELECT s.dataset_id, ST_Collect(g.geometry_2d::geometry)::geography
+                FROM core_geolocation g
+                JOIN core_spatial s ON s.id = g.spatial_id
+                JOIN core_dataset d ON d.id = s.dataset_id
+                WHERE s.dataset_id = ANY(dataset_ids)
+                    AND s.removed IS NULL AND g.removed IS NULL
+                GROUP BY s.dataset_id
+                ON CONFLICT (dataset_id) DO UPDATE SET geometry = EXCLUDED.geometry;
+                DELETE FROM core_datasetspatialextent e
+                WHERE e.dataset_id = ANY(dataset_ids) AND NOT EXISTS (
+                    SELECT 1 FROM core_geolocation g
+                    JOIN core_spatial s ON s.id = g.spatial_id
+                    WHERE s.dataset_id = e.dataset_id
+                        AND s.removed IS NULL AND g.removed IS NULL
+                );
+            $$ LANGUAGE SQL;
+            """,
+            reverse_sql="""
+            CREATE OR REPLACE FUNCTION core_dataset_refresh_spatial_extent(dataset_ids uuid[])
+            RETURNS void AS $$
+                DELETE FROM core_datasetspatialextent WHERE dataset_id = ANY(dataset_ids);
+                INSERT INTO core_datasetspatialextent (dataset_id, geometry)
+                SELECT s.dataset_id, ST_Collect(g.geometry_2d::geometry)::geography
+                FROM core_geolocation g
+                JOIN core_spatial s ON s.id = g.spatial_id
+                JOIN core_dataset d ON d.id = s.dataset_id
+                WHERE s.dataset_id = ANY(dataset_ids)
+                    AND s.removed IS NULL AND g.removed IS NULL
+                GROUP BY s.dataset_id;
+            $$ LANGUAGE SQL;
+            """,
+        ),
+    ]
@@ -15,6 +15,8 @@ from .catalog_record import (
     RemoteResource,
     Temporal,
     DatasetIndexEntry,
+    DatasetSearchVector,
+    DatasetSpatialExtent,
 )
 from .concepts import (
     AccessType,
@@ -4,6 +4,8 @@ from .dataset_metrics import DatasetMetrics
 from .dataset_permissions import DatasetPermissions
 from .meta import CatalogRecord, MetadataProvider, OtherIdentifier
 from .dataset_index import DatasetIndexEntry
+from .dataset_search import DatasetSearchVector
+from .dataset_spatial import DatasetSpatialExtent
 from .related import (
     DatasetActor,
     DatasetProject,
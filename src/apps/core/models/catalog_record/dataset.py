@@ -1,10 +1,11 @@
 import logging
 from dataclasses import dataclass
-from typing import Iterator, List, Optional
+from typing import Iterable, Iterator, List, Optional
 from uuid import UUID
 
 from django.conf import settings
 from django.contrib.postgres.fields import ArrayField, HStoreField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.validators import MinLengthValidator
 from django.db import models, transaction
@@ -20,11 +21,16 @@ from watson.search import skip_index_update
 
 from apps.common.copier import ModelCopier
 from apps.common.exceptions import TopLevelValidationError
+from apps.common.functions import LowerArrayText, LowerValues
 from apps.common.helpers import datetime_to_date, get_identifier_variations, normalize_doi
 from apps.common.history import SnapshotHistoricalRecords
 from apps.common.tasks import run_task
 from apps.core.models.access_rights import AccessRights, AccessTypeChoices, REMSApprovalType
-from apps.core.models.catalog_record.dataset_index import DatasetIndexEntry
+from apps.core.models.catalog_record.dataset_index import (
+    DatasetIndexEntry,
+    get_facet_keys,
+    schedule_dataset_index_update,
+)
 from apps.core.models.catalog_record.dataset_permissions import DatasetPermissions
 from apps.core.models.catalog_record.dataset_versions import DatasetVersions
 from apps.core.models.catalog_record.managers import DatasetManager, SoftDeletableDatasetManager
@@ -247,12 +253,20 @@ class Dataset(V2DatasetMixin, CatalogRecord):
         DatasetVersions, related_name="datasets", on_delete=models.SET_NULL, null=True
     )
     dataset_versions_order = models.IntegerField(null=True, blank=True)
+    # Denormalized flags for the latest_versions filter, see update_latest_version_flags
+    is_latest_version = models.BooleanField(default=False, editable=False)
+    is_latest_published = models.BooleanField(default=False, editable=False)
     permissions = models.ForeignKey(
         DatasetPermissions, related_name="datasets", on_delete=models.SET_NULL, null=True
     )
     history = SnapshotHistoricalRecords(
         m2m_fields=(language, theme, field_of_science, infrastructure, other_identifiers),
-        excluded_fields=["permissions", "rems_publish_error"],
+        excluded_fields=[
+            "permissions",
+            "rems_publish_error",
+            "is_latest_version",
+            "is_latest_published",
+        ],
     )
 
     class CumulativeState(models.IntegerChoices):
@@ -269,7 +283,7 @@ class Dataset(V2DatasetMixin, CatalogRecord):
     published_revision = models.IntegerField(default=0, blank=True, editable=False)
     draft_revision = models.IntegerField(default=0, blank=True, editable=False)
     tracker = FieldTracker(
-        fields=["state", "published_revision", "cumulative_state", "draft_revision"]
+        fields=["state", "published_revision", "cumulative_state", "draft_revision", "removed"]
     )
 
     draft_of = models.OneToOneField(
@@ -279,6 +293,8 @@ class Dataset(V2DatasetMixin, CatalogRecord):
     rems_publish_error = models.TextField(null=True, blank=True)
 
     is_prefetched = False  # Should be set to True when using prefetch_related
+    # Set to True when only the relations needed by the serializer have been prefetched
+    is_prefetch_planned = False
 
     # Fields that may be requested when checking dataset editing permissions
     permissions_prefetch_fields = (
@@ -407,6 +423,41 @@ class Dataset(V2DatasetMixin, CatalogRecord):
                 condition=models.Q(removed__isnull=True),
                 name="%(app_label)s_%(class)s_state_versions",
             ),
+            models.Index(
+                fields=("record_modified",),
+                name="%(app_label)s_%(class)s_record_modified",
+            ),
+            # Partial indexes for the latest_versions filter
+            models.Index(
+                fields=("modified", "id"),
+                condition=models.Q(is_latest_version=True, removed__isnull=True),
+                name="%(app_label)s_%(class)s_latest_version",
+            ),
+            models.Index(
+                fields=("modified", "id"),
+                condition=models.Q(is_latest_published=True, removed__isnull=True),
+                name="%(app_label)s_%(class)s_latest_published",
+            ),
+            # Keyset pagination indexes, see DatasetCursorPagination
+            models.Index(
+                fields=("modified", "id"),
+                condition=models.Q(removed__isnull=True),
+                name="%(app_label)s_%(class)s_modified_id",
+            ),
+            models.Index(
+                fields=("created", "id"),
+                condition=models.Q(removed__isnull=True),
+                name="%(app_label)s_%(class)s_created_id",
+            ),
+            # Trigram indexes for text filters, see DatasetFilter
+            GinIndex(
+                OpClass(LowerValues("title"), name="gin_trgm_ops"),
+                name="%(app_label)s_%(class)s_title_trgm",
+            ),
+            GinIndex(
+                OpClass(LowerArrayText("keyword"), name="gin_trgm_ops"),
+                name="%(app_label)s_%(class)s_keyword_trgm",
+            ),
         ]
         # Constraints to ensure dataset versions have a consistent ordering.
         constraints = [
@@ -952,6 +1003,9 @@ class Dataset(V2DatasetMixin, CatalogRecord):
         _deleted = super().delete(*args, **kwargs)
         if soft:
             post_delete.send(Dataset, instance=self, soft=True)
+        elif self.dataset_versions:
+            # Another dataset may now be the latest version
+            self.dataset_versions.update_latest_flags()
         return _deleted
 
     def _validate_cumulative_state(self):
@@ -1315,6 +1369,8 @@ class Dataset(V2DatasetMixin, CatalogRecord):
 
     def ensure_prefetch(self):
         """Ensure related fields have been prefetched."""
+        if self.is_prefetch_planned:
+            return
         is_prefetched = self.is_prefetched and getattr(self, "_prefetched_objects_cache", None)
         if not is_prefetched:
             models.prefetch_related_objects([self], *self.common_prefetch_fields)
@@ -1375,12 +1431,20 @@ class Dataset(V2DatasetMixin, CatalogRecord):
                 self.preservation.save()
 
         self.set_update_reason(f"{self.state}-{self.published_revision}.{self.draft_revision}")
+        latest_flags_changed = self.tracker.has_changed("state") or self.tracker.has_changed(
+            "removed"
+        )
         super().save(*args, **kwargs)
 
         # Updating versions order handled separately when migrating from legacy
         if self.dataset_versions_order is None and not getattr(self, "_saving_legacy", False):
             self.dataset_versions.update_dataset_order()
-            self.refresh_from_db(fields=("dataset_versions_order",))
+            self.refresh_from_db(
+                fields=("dataset_versions_order", "is_latest_version", "is_latest_published")
+            )
+        elif latest_flags_changed and self.dataset_versions:
+            self.dataset_versions.update_latest_flags()
+            self.refresh_from_db(fields=("is_latest_version", "is_latest_published"))
         self.is_prefetched = False  # Prefetch again after save
 
         # Update file publication state when dataset is published or files are added or removed
@@ -1404,9 +1468,25 @@ class Dataset(V2DatasetMixin, CatalogRecord):
             return dataset_created.send(sender=self.__class__, instance=self)
         return dataset_updated.send(sender=self.__class__, instance=self)
 
-    def update_index(self) -> List[DatasetIndexEntry]:
-        """Update facet index entries for dataset."""
-        return DatasetIndexEntry.objects.create_for_dataset(self)
+    def update_index(
+        self, changed_fields: Optional[Iterable[str]] = None
+    ) -> List[DatasetIndexEntry]:
+        """Update facet index entries for dataset and schedule search vector update.
+
+        When changed_fields is set, only index entries that depend on the
+        changed fields are updated. Returns the updated entries, or an empty
+        list when the update is deferred until after commit.
+        """
+        from apps.core.search import schedule_search_vector_update
+
+        schedule_search_vector_update(self.id)
+        keys = get_facet_keys(changed_fields)
+        if not keys:
+            return []
+        if settings.ENABLE_DATASET_INDEX_DEFERRED_UPDATE:
+            schedule_dataset_index_update(self.id, keys)
+            return []
+        return DatasetIndexEntry.objects.create_for_dataset(self, keys=keys)
 
     @classmethod
     def lock_for_update(cls, id: UUID):
@@ -1,10 +1,15 @@
 import logging
-from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Set
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
 
-from django.db import models
+from django.conf import settings
+from django.db import connection, models, transaction
 from django.utils.translation import gettext as _
 
+from apps.actors.models import OrganizationAncestor
 from apps.common.helpers import single_translation
+from apps.common.tasks import on_commit_coalesced, run_task
 
 
 if TYPE_CHECKING:
@@ -14,7 +19,7 @@ logger = logging.getLogger(__name__)
 
 
 from django.db.models.functions import Coalesce
-from django.db.models import F
+from django.db.models import F, OuterRef, Subquery
 
 
 def coalesce_translation(field, language):
@@ -41,135 +46,298 @@ class EntryTuple(NamedTuple):
         return [EntryTuple(entry.language, entry.key, entry.value) for entry in entries]
 
 
-class DatasetIndexEntryManager(models.Manager):
+DatasetEntries = Dict[UUID, Set[EntryTuple]]  # Entry tuples of each dataset
 
-    def _get_access_types(self, dataset: "Dataset", language) -> List[EntryTuple]:
-        access_type = dataset.access_rights and dataset.access_rights.access_type
-        if access_type:
-            if label := single_translation(access_type.pref_label, language):
-                return [EntryTuple(language, "access_type", label)]
-        return []
-
-    def _get_data_catalogs(self, dataset: "Dataset", language) -> List[EntryTuple]:
-        data_catalog = dataset.data_catalog
-        if data_catalog:
-            if label := single_translation(data_catalog.title, language):
-                return [EntryTuple(language, "data_catalog", label)]
-        return []
-
-    def _get_actor_organization_names(self, queryset: models.QuerySet, language: str) -> List[str]:
-        return (
-            queryset.annotate(
-                aggregation_label=Coalesce(
-                    F("organization__parent__parent__pref_label"),
-                    F("organization__parent__pref_label"),
-                    F("organization__pref_label"),
-                )
-            )
-            .annotate(value=coalesce_translation("aggregation_label", language))
-            .values_list("value", flat=True)
-            .order_by()  # Remove ordering to ensure so distinct() works properly
-            .distinct()
-        )
+# Index entry keys that depend on each Dataset field
+FACET_KEYS_BY_FIELD = {
+    "access_rights": {"access_type"},
+    "data_catalog": {"data_catalog"},
+    "keyword": {"keyword"},
+    "actors": {"creator", "organization"},
+    "field_of_science": {"field_of_science"},
+    "infrastructure": {"infrastructure"},
+    "file_set": {"file_type"},
+    "projects": {"project"},
+    "remote_resources": {"data_service"},
+}
+FACET_KEYS = frozenset(key for keys in FACET_KEYS_BY_FIELD.values() for key in keys)
 
-    def _get_creators(self, dataset: "Dataset", language: str) -> List[EntryTuple]:
-        orgs = dataset.actors.filter(roles__icontains="creator", organization__isnull=False)
-        org_names = list(self._get_actor_organization_names(orgs, language))
 
-        person_names = list(
-            dataset.actors.filter(roles__icontains="creator", person__isnull=False)
-            .values_list("person__name", flat=True)
-            .order_by()
-            .distinct()
-        )
-        return [EntryTuple(language, "creator", name) for name in org_names + person_names if name]
+def get_facet_keys(changed_fields: Optional[Iterable[str]] = None) -> Set[str]:
+    """Return index entry keys affected by changed dataset fields, all keys if None."""
+    if changed_fields is None:
+        return set(FACET_KEYS)
+    return {key for field in changed_fields for key in FACET_KEYS_BY_FIELD.get(field, ())}
 
-    def _get_organizations(self, dataset: "Dataset", language: str) -> List[EntryTuple]:
-        orgs = dataset.actors.order_by().filter(organization__isnull=False)
-        org_names = list(self._get_actor_organization_names(orgs, language))
-        return [EntryTuple(language, "organization", name) for name in org_names]
 
-    def _get_keywords(self, dataset: "Dataset", language: str) -> List[EntryTuple]:
-        return [EntryTuple(language, "keyword", keyword) for keyword in dataset.keyword]
+class DatasetIndexEntryManager(models.Manager):
+    """Computes index entries for datasets.
 
-    def _get_reference_data(
-        self, dataset: "Dataset", language: str, attribute: str
-    ) -> List[EntryTuple]:
-        labels = getattr(dataset, attribute).values_list(
-            coalesce_translation("pref_label", language), flat=True
-        )
-        return [EntryTuple(language, attribute, label) for label in labels if label]
-
-    def _get_file_types(self, dataset: "Dataset", language: str) -> List[EntryTuple]:
-        fileset = getattr(dataset, "file_set", None)
-        if not fileset:
-            return []
-
-        labels = (
-            fileset.file_metadata.filter(file_type__isnull=False)
-            .values_list(coalesce_translation("file_type__pref_label", language), flat=True)
-            .order_by()
-            .distinct()
+    Entries are computed for batches of datasets using grouped queries that
+    return (dataset_id, label in each language) rows, so the number of queries
+    does not depend on the number of datasets.
+    """
+
+    languages = ["en", "fi"]
+
+    def _add_dataset_entries(
+        self, datasets: List["Dataset"], entries: DatasetEntries, keys: Set[str]
+    ):
+        """Add entries computed from values stored in dataset or its forward relations."""
+        for dataset in datasets:
+            dataset_entries = entries[dataset.id]
+            access_type = None
+            if "access_type" in keys:
+                access_type = dataset.access_rights and dataset.access_rights.access_type
+            data_catalog = dataset.data_catalog if "data_catalog" in keys else None
+            keywords = dataset.keyword if "keyword" in keys else []
+            for language in self.languages:
+                if access_type:
+                    if label := single_translation(access_type.pref_label, language):
+                        dataset_entries.add(EntryTuple(language, "access_type", label))
+                if data_catalog:
+                    if label := single_translation(data_catalog.title, language):
+                        dataset_entries.add(EntryTuple(language, "data_catalog", label))
+                for keyword in keywords:
+                    dataset_entries.add(EntryTuple(language, "keyword", keyword))
+
+    def _add_grouped_entries(
+        self,
+        entries: DatasetEntries,
+        key: str,
+        queryset: models.QuerySet,
+        label: str,
+        dataset_field="dataset_id",
+        translated=True,
+    ):
+        """Add entries from rows of (dataset id, label in each language)."""
+        if translated:
+            labels = [coalesce_translation(label, language) for language in self.languages]
+        else:
+            labels = [F(label)]
+        rows = queryset.order_by().values_list(dataset_field, *labels).distinct()
+        for dataset_id, *values in rows:
+            if not translated:
+                values = values * len(self.languages)
+            for language, value in zip(self.languages, values):
+                if value:
+                    entries[dataset_id].add(EntryTuple(language, key, value))
+
+    def _add_actor_organizations(
+        self, entries: DatasetEntries, key: str, queryset: models.QuerySet
+    ):
+        """Add top level organization names of actors."""
+        root_label = OrganizationAncestor.objects.filter(
+            descendant_id=OuterRef("organization_id"), ancestor__parent__isnull=True
+        ).values("ancestor__pref_label")[:1]
+        queryset = queryset.filter(organization__isnull=False).annotate(
+            aggregation_label=Subquery(root_label)
         )
-        return [EntryTuple(language, "file_type", label) for label in labels if label]
-
-    def _get_projects(self, dataset: "Dataset", language: str) -> List[EntryTuple]:
-        labels = dataset.projects.values_list(coalesce_translation("title", language), flat=True)
-        return [EntryTuple(language, "project", label) for label in labels if label]
-
-    def _get_data_services(self, dataset: "Dataset", language: str) -> List[EntryTuple]:
-        labels = (
-            dataset.remote_resources.filter(data_service__isnull=False)
-            .values_list(coalesce_translation("data_service__pref_label", language), flat=True)
-            .order_by()
-            .distinct()
+        self._add_grouped_entries(entries, key, queryset, "aggregation_label")
+
+    def get_entries_for_datasets(
+        self, datasets: List["Dataset"], keys: Optional[Set[str]] = None
+    ) -> DatasetEntries:
+        """Compute index entry tuples for datasets.
+
+        When keys is set, only entries with the given keys are computed.
+        """
+        from apps.core.models import (
+            DatasetActor,
+            DatasetProject,
+            FieldOfScience,
+            RemoteResource,
+            ResearchInfra,
         )
-        return [EntryTuple(language, "data_service", label) for label in labels if label]
-
-    def _get_existing_instances(self, entries: Iterable[EntryTuple]) -> List["DatasetIndexEntry"]:
-        filters = models.Q()
-        for language, key, value in entries:
-            filters |= models.Q(language=language, key=key, value=value)
-        return list(DatasetIndexEntry.objects.filter(filters))
-
-    def create_from_tuples(self, entries: Iterable[EntryTuple]) -> List["DatasetIndexEntry"]:
-        return list(
-            self.bulk_create(
-                [
-                    DatasetIndexEntry(language=language, key=key, value=value)
-                    for language, key, value in entries
-                ]
+        from apps.core.models.file_metadata import FileSetFileMetadata
+
+        if keys is None:
+            keys = FACET_KEYS
+        ids = [dataset.id for dataset in datasets]
+        entries: DatasetEntries = {dataset_id: set() for dataset_id in ids}
+        self._add_dataset_entries(datasets, entries, keys)
+
+        actors = DatasetActor.objects.filter(dataset_id__in=ids)
+        creators = actors.filter(roles__icontains="creator")
+        if "creator" in keys:
+            self._add_actor_organizations(entries, "creator", creators)
+            self._add_grouped_entries(
+                entries,
+                "creator",
+                creators.filter(person__isnull=False),
+                "person__name",
+                translated=False,
+            )
+        if "organization" in keys:
+            self._add_actor_organizations(entries, "organization", actors)
+        if "field_of_science" in keys:
+            self._add_grouped_entries(
+                entries,
+                "field_of_science",
+                FieldOfScience.objects.filter(datasets__id__in=ids),
+                "pref_label",
+                dataset_field="datasets__id",
+            )
+        if "infrastructure" in keys:
+            self._add_grouped_entries(
+                entries,
+                "infrastructure",
+                ResearchInfra.objects.filter(datasets__id__in=ids),
+                "pref_label",
+                dataset_field="datasets__id",
+            )
+        if "file_type" in keys:
+            self._add_grouped_entries(
+                entries,
+                "file_type",
+                FileSetFileMetadata.objects.filter(
+                    file_set__dataset_id__in=ids, file_type__isnull=False
+                ),
+                "file_type__pref_label",
+                dataset_field="file_set__dataset_id",
+            )
+        if "project" in keys:
+            self._add_grouped_entries(
+                entries, "project", DatasetProject.objects.filter(dataset_id__in=ids), "title"
+            )
+        if "data_service" in keys:
+            self._add_grouped_entries(
+                entries,
+                "data_service",
+                RemoteResource.objects.filter(dataset_id__in=ids, data_service__isnull=False),
+                "data_service__pref_label",
             )
+        return entries
+
+    def get_or_create_from_tuples(
+        self, entries: Iterable[EntryTuple]
+    ) -> Dict[EntryTuple, "DatasetIndexEntry"]:
+        """Upsert entries and return them with their ids.
+
+        Existing entries are locked until the end of the transaction, which
+        prevents delete_unused_entries from removing them before they are
+        linked to datasets. Entries are sorted to lock them in a consistent order.
+        """
+        entries = sorted(set(entries))
+        if not entries:
+            return {}
+        languages, keys, values = zip(*entries)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {self.model._meta.db_table} (language, key, value)"
+                "  SELECT * FROM unnest(%s::text[], %s::text[], %s::text[])"
+                "  ON CONFLICT (value, key, language) DO UPDATE SET value = EXCLUDED.value"
+                "  RETURNING id, language, key, value",
+                [list(languages), list(keys), list(values)],
+            )
+            rows = cursor.fetchall()
+        return {
+            EntryTuple(language, key, value): self.model(
+                id=id, language=language, key=key, value=value
+            )
+            for id, language, key, value in rows
+        }
+
+    def assign_to_datasets(
+        self,
+        dataset_entries: Dict[UUID, List["DatasetIndexEntry"]],
+        keys: Optional[Set[str]] = None,
+    ) -> Tuple[int, int]:
+        """Replace index entries of datasets, return number of (added, removed) links.
+
+        When keys is set, only existing entries with the given keys are replaced.
+        Entries that are no longer linked to the datasets are checked for removal
+        in a background task after commit.
+        """
+        through = self.model.datasets.through
+        wanted = {
+            (dataset_id, entry.id)
+            for dataset_id, instances in dataset_entries.items()
+            for entry in instances
+        }
+        existing_links = through.objects.filter(dataset_id__in=dataset_entries.keys())
+        if keys is not None:
+            existing_links = existing_links.filter(datasetindexentry__key__in=keys)
+        existing = {
+            (dataset_id, entry_id): link_id
+            for link_id, dataset_id, entry_id in existing_links.values_list(
+                "id", "dataset_id", "datasetindexentry_id"
+            )
+        }
+        removed = {pair: link_id for pair, link_id in existing.items() if pair not in wanted}
+        if removed:
+            through.objects.filter(id__in=removed.values()).delete()
+            schedule_unused_entries_cleanup(entry_id for _, entry_id in removed)
+        added = [
+            through(dataset_id=dataset_id, datasetindexentry_id=entry_id)
+            for dataset_id, entry_id in wanted
+            if (dataset_id, entry_id) not in existing
+        ]
+        if added:
+            through.objects.bulk_create(added, ignore_conflicts=True)
+        if added or removed:
+            from apps.core.cache import schedule_dataset_aggregates_refresh
+
+            # Index changes don't always update dataset modification timestamps
+            schedule_dataset_aggregates_refresh(invalidate=True)
+        if (added or removed) and settings.ENABLE_FACET_ENGINE:
+            from apps.core.facets import schedule_facet_changes
+
+            changed = {dataset_id for dataset_id, _ in removed}
+            changed.update(link.dataset_id for link in added)
+            schedule_facet_changes(changed)
+        return len(added), len(removed)
+
+    def create_for_datasets(
+        self, datasets: List["Dataset"], keys: Optional[Set[str]] = None
+    ) -> Dict[UUID, List["DatasetIndexEntry"]]:
+        """Get or create index entries for datasets and assign them to the datasets.
+
+        Uses a fixed number of queries for any number of datasets. Datasets
+        should have access_rights__access_type and data_catalog loaded.
+        When keys is set, only entries with the given keys are updated.
+        """
+        entries = self.get_entries_for_datasets(datasets, keys=keys)
+        instances = self.get_or_create_from_tuples(
+            entry for dataset_entries in entries.values() for entry in dataset_entries
         )
-
-    def create_for_dataset(self, dataset: "Dataset") -> List["DatasetIndexEntry"]:
+        dataset_instances = {
+            dataset_id: [instances[entry] for entry in dataset_entries]
+            for dataset_id, dataset_entries in entries.items()
+        }
+        self.assign_to_datasets(dataset_instances, keys=keys)
+        for dataset in datasets:
+            # Remove stale prefetched entries like RelatedManager.set does
+            if cache := getattr(dataset, "_prefetched_objects_cache", None):
+                cache.pop("index_entries", None)
+        return dataset_instances
+
+    def create_for_dataset(
+        self, dataset: "Dataset", keys: Optional[Set[str]] = None
+    ) -> List["DatasetIndexEntry"]:
         """Get or create index entries for dataset and assign them to the dataset."""
-        entries: Set[EntryTuple] = set()
-        for language in ["en", "fi"]:
-            entries.update(self._get_access_types(dataset, language))
-            entries.update(self._get_data_catalogs(dataset, language))
-            entries.update(self._get_creators(dataset, language))
-            entries.update(self._get_organizations(dataset, language))
-            entries.update(self._get_keywords(dataset, language))
-            entries.update(self._get_reference_data(dataset, language, "field_of_science"))
-            entries.update(self._get_reference_data(dataset, language, "infrastructure"))
-            entries.update(self._get_file_types(dataset, language))
-            entries.update(self._get_projects(dataset, language))
-            entries.update(self._get_data_services(dataset, language))
-
-        if not entries:
-            dataset.index_entries.clear()
-            return []
-
-        # Get or create instances and link them to the dataset
-        existing_instances = self._get_existing_instances(entries)
-        existing_as_set = set(EntryTuple.from_entries(existing_instances))
-        missing = entries - existing_as_set
-        new_instances = self.create_from_tuples(missing)
-        all_instances = existing_instances + new_instances
-
-        dataset.index_entries.set(all_instances)
-        return all_instances
+        return self.create_for_datasets([dataset], keys=keys)[dataset.id]
+
+    def delete_unused_entries(self, entry_ids: Optional[Iterable[int]] = None) -> int:
+        """Delete entries that are not linked to any dataset, return number of deleted entries.
+
+        When entry_ids is set, only the given entries are checked. Entries
+        locked by a transaction that is assigning them are skipped.
+        """
+        with transaction.atomic():
+            unused = self.filter(datasets__isnull=True)
+            if entry_ids is not None:
+                unused = unused.filter(id__in=list(entry_ids))
+            ids = list(
+                unused.select_for_update(skip_locked=True, of=("self",))
+                .order_by()
+                .values_list("id", flat=True)
+            )
+            if not ids:
+                return 0
+            # Check again after locking, the entries may have been linked meanwhile
+            deleted, _ = self.filter(id__in=ids, datasets__isnull=True).delete()
+        return deleted
 
 
 class DatasetIndexEntry(models.Model):
@@ -201,3 +369,76 @@ class DatasetIndexEntry(models.Model):
                 fields=("value", "key", "language"), name="unique-lang-key-value"
             ),
         ]
+
+
+def delete_unused_index_entries(entry_ids: Optional[List[int]] = None):
+    """Background task for deleting index entries that are no longer used."""
+    if deleted := DatasetIndexEntry.objects.delete_unused_entries(entry_ids):
+        logger.info(f"Deleted {deleted} unused dataset index entries")
+
+
+class UnusedEntriesCleanup:
+    """On-commit callback that deletes entries unlinked from datasets in a transaction."""
+
+    def __init__(self):
+        self.entry_ids = set()
+
+    def __call__(self):
+        run_task(delete_unused_index_entries, entry_ids=sorted(self.entry_ids))
+
+
+def schedule_unused_entries_cleanup(entry_ids: Iterable[int]):
+    """Delete entries after the current transaction is committed if they are no longer used.
+
+    Multiple calls in the same transaction are combined into a single task.
+    """
+    on_commit_coalesced(
+        UnusedEntriesCleanup, lambda callback: callback.entry_ids.update(entry_ids)
+    )
+
+
+def update_dataset_index(keys_by_dataset: Dict[UUID, List[str]]):
+    """Background task for updating index entries of datasets.
+
+    Datasets with the same changed keys are updated together.
+    """
+    from apps.core.models.catalog_record.dataset import Dataset
+
+    datasets_by_keys = defaultdict(list)
+    for dataset_id, keys in keys_by_dataset.items():
+        datasets_by_keys[frozenset(keys)].append(dataset_id)
+
+    with transaction.atomic():
+        for keys, dataset_ids in datasets_by_keys.items():
+            datasets = list(
+                Dataset.all_objects.filter(id__in=dataset_ids).select_related(
+                    "access_rights__access_type", "data_catalog"
+                )
+            )
+            DatasetIndexEntry.objects.create_for_datasets(datasets, keys=set(keys))
+
+
+class DatasetIndexUpdate:
+    """On-commit callback that updates index entries of datasets changed in a transaction."""
+
+    def __init__(self):
+        self.keys_by_dataset = defaultdict(set)
+
+    def __call__(self):
+        run_task(
+            update_dataset_index,
+            keys_by_dataset={
+                dataset_id: sorted(keys) for dataset_id, keys in self.keys_by_dataset.items()
+            },
+        )
+
+
+def schedule_dataset_index_update(dataset_id: UUID, keys: Set[str]):
+    """Update index entries of dataset after the current transaction is committed.
+
+    Multiple updates of the same dataset (and of any datasets) in the
+    same transaction are combined into a single task.
+    """
+    on_commit_coalesced(
+        DatasetIndexUpdate, lambda callback: callback.keys_by_dataset[dataset_id].update(keys)
+    )
@@ -0,0 +1,28 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class DatasetSearchVector(models.Model):
+    """Weighted full-text search vector of a dataset.
+
+    Kept in a separate table so the vector is not loaded or saved with
+    datasets. Values are written with raw SQL by apps.core.search.
+    """
+
+    dataset = models.OneToOneField(
+        "Dataset",
+        primary_key=True,
+        related_name="search_vector",
+        on_delete=models.CASCADE,
+        editable=False,
+    )
+    vector = SearchVectorField(editable=False)
+
+    def __str__(self):
+        return str(self.dataset_id)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=("vector",), name="%(app_label)s_dataset_search_vector"),
+        ]
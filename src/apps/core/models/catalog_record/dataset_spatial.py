@@ -0,0 +1,42 @@
+from typing import Iterable, Optional
+from uuid import UUID
+
+from django.contrib.gis.db import models
+from django.db import connection
+
+
+class DatasetSpatialExtent(models.Model):
+    """Collected geolocations of a dataset for geometry filters.
+
+    Kept in a separate table so the geometry is not loaded or saved with
+    datasets. Values are written by database triggers on spatials and
+    geolocations, see core migration 0079.
+    """
+
+    dataset = models.OneToOneField(
+        "Dataset",
+        primary_key=True,
+        related_name="spatial_extent",
+        on_delete=models.CASCADE,
+        editable=False,
+    )
+    geometry = models.GeometryField(geography=True, editable=False)  # GiST indexed
+
+    def __str__(self):
+        return str(self.dataset_id)
+
+    @classmethod
+    def refresh(cls, dataset_ids: Optional[Iterable[UUID]] = None):
+        """Rebuild spatial extents of datasets, or of all datasets if dataset_ids is None."""
+        with connection.cursor() as cursor:
+            if dataset_ids is None:
+                cursor.execute(f"""
+                    SELECT core_dataset_refresh_spatial_extent(ARRAY(
+                        SELECT dataset_id FROM {cls._meta.db_table}
+                        UNION SELECT dataset_id FROM core_spatial WHERE dataset_id IS NOT NULL
+                    ))
+                    """)
+            else:
+                cursor.execute(
+                    "SELECT core_dataset_refresh_spatial_extent(%s::uuid[])", [list(dataset_ids)]
+                )
@@ -69,6 +69,38 @@ def update_dataset_versions_order(queryset) -> int:
     return update_count
 
 
+def update_latest_version_flags(queryset) -> int:
+    """Update is_latest_version and is_latest_published of datasets in queryset.
+
+    The queryset should contain all datasets of the DatasetVersions being updated.
+    Within each DatasetVersions, is_latest_version marks the non-removed dataset
+    with the highest dataset_versions_order, and is_latest_published the same for
+    published datasets. Only datasets whose flags change are updated.
+
+    Returns:
+        int: Number of updated datasets.
+    """
+    queryset = queryset.order_by()
+    latest = queryset.filter(removed__isnull=True).order_by(
+        "dataset_versions_id", F("dataset_versions_order").desc(nulls_last=True)
+    )
+    latest_ids = latest.distinct("dataset_versions_id").values("id")
+    latest_published_ids = (
+        latest.filter(state="published").distinct("dataset_versions_id").values("id")
+    )
+
+    update_count = 0
+    for field, ids in [
+        ("is_latest_version", latest_ids),
+        ("is_latest_published", latest_published_ids),
+    ]:
+        update_count += (
+            queryset.filter(**{field: True}).exclude(id__in=ids).update(**{field: False})
+        )
+        update_count += queryset.filter(id__in=ids, **{field: False}).update(**{field: True})
+    return update_count
+
+
 class DatasetVersions(AbstractBaseModel):
     """A collection of dataset's versions."""
 
@@ -79,4 +111,10 @@ class DatasetVersions(AbstractBaseModel):
     def update_dataset_order(self) -> int:
         """Recalculate datasets_versions_order field of associated datasets."""
         datasets = self.datasets(manager="all_objects")
-        return update_dataset_versions_order(queryset=datasets)
+        update_count = update_dataset_versions_order(queryset=datasets)
+        update_latest_version_flags(queryset=datasets)
+        return update_count
+
+    def update_latest_flags(self) -> int:
+        """Update is_latest_version and is_latest_published of associated datasets."""
+        return update_latest_version_flags(queryset=self.datasets(manager="all_objects"))
@@ -16,6 +16,7 @@ from apps.common.helpers import prepare_for_copy
 from apps.common.models import AbstractBaseModel
 from apps.core.models.file_metadata import FileSetDirectoryMetadata, FileSetFileMetadata
 from apps.files.models import File, FileStorage
+from apps.files.models.file_storage import schedule_storage_modified_update
 from apps.files.models.file_characteristics import FileCharacteristics
 
 from .dataset import Dataset
@@ -155,7 +156,8 @@ class FileSet(AbstractBaseModel):
         ):
             # Current dataset is public, all files should be published
             files_to_publish = queryset.filter(published__isnull=True)
-            files_to_publish.update(published=timezone.now())
+            if files_to_publish.update(published=timezone.now()):
+                schedule_storage_modified_update([self.storage_id])
             return
 
         # Current dataset is non-public, so we have to check if files
@@ -175,13 +177,15 @@ class FileSet(AbstractBaseModel):
         files_to_unpublish = queryset.filter(published__isnull=False).exclude(
             file_sets__in=published_filesets
         )
-        files_to_unpublish.update(published=None)
+        unpublished_count = files_to_unpublish.update(published=None)
 
         # Non-published files that should be marked published
         files_to_publish = queryset.filter(published__isnull=True).filter(
             file_sets__in=published_filesets
         )
-        files_to_publish.update(published=timezone.now())
+        published_count = files_to_publish.update(published=timezone.now())
+        if unpublished_count or published_count:
+            schedule_storage_modified_update([self.storage_id])
 
     def deprecate_dataset(self):
         """Files are removed, deprecate dataset if needed."""
@@ -1,12 +1,14 @@
 import logging
 from typing import Optional
 
-from django.contrib.postgres.fields import ArrayField, HStoreField
+from django.contrib.postgres.fields import ArrayField, DateRangeField, HStoreField
+from django.contrib.postgres.indexes import GinIndex, GistIndex, OpClass
 from django.db import models
 from django.utils.translation import gettext as _
 
 from apps.actors.models import Actor, Organization
 from apps.common.copier import ModelCopier
+from apps.common.functions import LowerValues
 from apps.common.models import AbstractBaseModel, MediaTypeValidator
 from apps.core.models.concepts import FileType, RelationType, UseCategory
 from apps.core.models.data_services import DataService
@@ -92,6 +94,8 @@ class Temporal(AbstractBaseModel):
         provenance (Provenance): Provenance ForeignKey relation, if part of Provenance
         start_date (models.DateTimeField): Start of the period
         temporal_coverage (models.TextField): Period expressed as a string
+        date_range (DateRangeField): Period as an inclusive date range generated from
+            start_date and end_date, null if both are missing or the period is invalid
     """
 
     copier = ModelCopier(
@@ -117,6 +121,25 @@ class Temporal(AbstractBaseModel):
         null=True,
         blank=True,
     )
+    # Missing start or end date is an unbounded range
+    date_range = models.GeneratedField(
+        expression=models.Case(
+            models.When(start_date__isnull=True, end_date__isnull=True, then=None),
+            models.When(start_date__gt=models.F("end_date"), then=None),
+            default=models.Func(
+                models.F("start_date"),
+                models.F("end_date"),
+                models.Value("[]"),
+                function="daterange",
+            ),
+            output_field=DateRangeField(),
+        ),
+        output_field=DateRangeField(),
+        db_persist=True,
+    )
+
+    class Meta(AbstractBaseModel.Meta):
+        indexes = [GistIndex(fields=["date_range"], name="core_temporal_date_range")]
 
 
 class DatasetProject(AbstractBaseModel):
@@ -142,6 +165,14 @@ class DatasetProject(AbstractBaseModel):
     participating_organizations = models.ManyToManyField(Organization, related_name="projects")
     funding = models.ManyToManyField("Funding", related_name="projects")
 
+    class Meta(AbstractBaseModel.Meta):
+        indexes = [
+            GinIndex(
+                OpClass(LowerValues("title"), name="gin_trgm_ops"),
+                name="core_datasetproject_title_trgm",
+            ),
+        ]
+
 
 class Funding(AbstractBaseModel):
     """Funding for the project and dataset
@@ -8,7 +8,10 @@ from rest_framework import serializers
 from apps.common.helpers import is_valid_uuid, merge_sets
 from apps.core.models import DatasetVersions
 from apps.core.models.legacy import LegacyDataset
-from apps.core.models.catalog_record.dataset_versions import update_dataset_versions_order
+from apps.core.models.catalog_record.dataset_versions import (
+    update_dataset_versions_order,
+    update_latest_version_flags,
+)
 
 
 class LegacyDatasetVersionSerializer(serializers.Serializer):
@@ -168,3 +171,5 @@ def migrate_dataset_versions(apps=django_apps):
     # Reorder dataset versions
     if hasattr(dataset_model, "dataset_versions_order"):
         update_dataset_versions_order(dataset_model.objects.all())
+    if hasattr(dataset_model, "is_latest_version"):
+        update_latest_version_flags(dataset_model.objects.all())
@@ -1,6 +1,6 @@
 import logging
 
-from django.db.models import Q
+from django.db.models import Q, QuerySet
 
 from apps.common.permissions import BaseAccessPolicy
 
@@ -105,37 +105,61 @@ class DatasetAccessPolicy(BaseAccessPolicy):
             return access_rights.is_data_available(request, dataset)
         return False
 
+    @classmethod
+    def get_user_dataset_ids(cls, user, include_admin_organizations=True) -> QuerySet:
+        """Return subquery of ids of datasets the user owns or has been shared.
+
+        The datasets of each role are fetched with a separate indexed query and
+        combined with UNION, so the result can be used in a semi-join
+        (`id__in`) without joining the related tables to the dataset query.
+        """
+        from .models import Dataset, FileSet
+
+        datasets = Dataset.all_objects.order_by()
+        parts = [
+            datasets.filter(metadata_owner__user=user).values("id"),
+            datasets.filter(permissions__editors=user).values("id"),
+        ]
+        if csc_projects := getattr(user, "csc_projects", []):
+            parts.append(
+                FileSet.all_objects.order_by()
+                .filter(storage__csc_project__in=csc_projects)
+                .values("dataset_id")
+            )
+        if include_admin_organizations and user.admin_organizations:
+            parts.append(
+                datasets.filter(
+                    metadata_owner__admin_organization__in=user.admin_organizations
+                ).values("id")
+            )
+        return parts[0].union(*parts[1:])
+
     @classmethod
     def scope_queryset(cls, request, queryset):
-        from .models import Dataset
+        from .models import Dataset, DataCatalog
 
         if (q := super().scope_queryset(request, queryset)) is not None:
             return q
         elif request.user.is_anonymous:
             return queryset.filter(state=Dataset.StateChoices.PUBLISHED)
         groups = request.user.groups.all()
-        csc_projects = getattr(request.user, "csc_projects", [])
+        admin_catalogs = DataCatalog.all_objects.filter(dataset_groups_admin__in=groups)
 
+        # Single semi-join instead of OR over joins that would need distinct()
         return queryset.filter(
             Q(state=Dataset.StateChoices.PUBLISHED)
-            | Q(metadata_owner__user=request.user)
-            | Q(permissions__editors=request.user)
-            | Q(file_set__storage__csc_project__in=csc_projects)
-            | Q(data_catalog__dataset_groups_admin__in=groups)
-            | Q(metadata_owner__admin_organization__in=request.user.admin_organizations)
-        ).distinct()
+            | Q(data_catalog__in=admin_catalogs.values("id"))
+            | Q(id__in=cls.get_user_dataset_ids(request.user))
+        )
 
     @classmethod
     def scope_queryset_owned_or_shared(cls, request, queryset):
         if request.user.is_anonymous:
             return queryset.none()
 
-        csc_projects = getattr(request.user, "csc_projects", [])
         return queryset.filter(
-            Q(metadata_owner__user=request.user)
-            | Q(permissions__editors=request.user)
-            | Q(file_set__storage__csc_project__in=csc_projects)
-        ).distinct()
+            id__in=cls.get_user_dataset_ids(request.user, include_admin_organizations=False)
+        )
 
     @classmethod
     def scope_queryset_admin(cls, request, queryset):
@@ -1,54 +1,94 @@
-from django.db.models import Prefetch, prefetch_related_objects
+from itertools import batched
+from typing import Iterable, List, NamedTuple
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import prefetch_related_objects
 from watson import search
 
-from apps.core.models import Dataset, DatasetActor
+from apps.common.tasks import on_commit_coalesced, run_task
+from apps.core.models import Dataset, DatasetActor, DatasetSearchVector
+
+# Text search configuration of dataset search vectors, same as used by watson
+SEARCH_CONFIG = "pg_catalog.english"
+
+# Relations needed for collecting searchable text of datasets
+search_prefetch_fields = (
+    "actors",
+    "actors__person",
+    "actors__organization",
+    "actors__organization__ancestor_links__ancestor",
+    "other_identifiers",
+    "relation",
+    "relation__entity",
+    "theme",
+)
+
+
+def get_refdata_values(field) -> List[str]:
+    values = set()
+    for entry in field.all():
+        for value in entry.pref_label.values():
+            values.add(value)
+    return sorted(values)
+
+
+def collect_organizations(actor: DatasetActor, organizations: set):
+    """Add names of actor organization and all of its parent organizations."""
+    if not actor.organization:
+        return
+    for link in actor.organization.ancestor_links.all():
+        organization = link.ancestor
+        organizations.add(organization.pref_label.get("fi"))
+        organizations.add(organization.pref_label.get("en"))
+        organizations.add(organization.pref_label.get("sv"))
+        organizations.add(organization.pref_label.get("und"))
+
+
+def get_actor_values(obj: Dataset) -> List[str]:
+    criteria = []
+    criteria.extend([actor.person.name for actor in obj.actors.all() if actor.person])
+    criteria.extend(
+        [
+            actor.person.external_identifier
+            for actor in obj.actors.all()
+            if actor.person and actor.person.external_identifier
+        ]
+    )
+    organizations = set()
+    for actor in obj.actors.all():
+        collect_organizations(actor, organizations)
+    if None in organizations:
+        organizations.remove(None)
+
+    criteria.extend(sorted(organizations))
+    return criteria
+
+
+def get_identifier_values(obj: Dataset) -> List[str]:
+    criteria = []
+    criteria.extend(
+        [
+            rel.entity.entity_identifier
+            for rel in obj.relation.all()
+            if rel.entity.entity_identifier
+        ]
+    )
+    criteria.extend([oi.notation for oi in obj.other_identifiers.all()])
+    return criteria
 
 
 class DatasetSearchAdapter(search.SearchAdapter):
     # Title field is limited to 1000 characters
     max_title_length = 1000
 
-    def _get_refdata_values(self, field):
-        values = set()
-        for entry in field.all():
-            for value in entry.pref_label.values():
-                values.add(value)
-        return sorted(values)
-
-    def _collect_organizations(self, actor: DatasetActor, organizations: set):
-        organization = actor.organization
-        while organization:
-            organizations.add(organization.pref_label.get("fi"))
-            organizations.add(organization.pref_label.get("en"))
-            organizations.add(organization.pref_label.get("sv"))
-            organizations.add(organization.pref_label.get("und"))
-            organization = organization.parent
-
-    def _get_actors(self, obj: Dataset):
-        criteria = []
-        criteria.extend([actor.person.name for actor in obj.actors.all() if actor.person])
-        criteria.extend(
-            [
-                actor.person.external_identifier
-                for actor in obj.actors.all()
-                if actor.person and actor.person.external_identifier
-            ]
-        )
-        organizations = set()
-        for actor in obj.actors.all():
-            self._collect_organizations(actor, organizations)
-        if None in organizations:
-            organizations.remove(None)
-
-        criteria.extend(sorted(organizations))
-        return criteria
-
     def get_title(self, obj: Dataset):
         criteria = []
         criteria.append(str(obj.persistent_identifier))
         criteria.extend(obj.title.values())
-        criteria.extend(self._get_refdata_values(obj.theme))
-        criteria.extend(self._get_actors(obj))
+        criteria.extend(get_refdata_values(obj.theme))
+        criteria.extend(get_actor_values(obj))
         return (" ".join(criteria))[: self.max_title_length]
 
     def get_description(self, obj: Dataset):
@@ -58,17 +98,93 @@ class DatasetSearchAdapter(search.SearchAdapter):
         criteria.extend(obj.keyword)
 
         # Repeat actors here in case they get cut off from title
-        criteria.extend(self._get_actors(obj))
+        criteria.extend(get_actor_values(obj))
         return " ".join(criteria)
 
     def get_content(self, obj: Dataset):
-        criteria = []
-        criteria.extend(
-            [
-                rel.entity.entity_identifier
-                for rel in obj.relation.all()
-                if rel.entity.entity_identifier
-            ]
+        return " ".join(get_identifier_values(obj))
+
+
+class SearchTexts(NamedTuple):
+    """Searchable text of a dataset grouped by tsvector weight."""
+
+    id: UUID
+    a: str  # Title, persistent identifier, themes
+    b: str  # Keywords, actors and their organizations
+    c: str  # Description
+    d: str  # Other identifiers and related entities
+
+
+def get_search_texts(obj: Dataset) -> SearchTexts:
+    title = [obj.persistent_identifier or "", *obj.title.values(), *get_refdata_values(obj.theme)]
+    return SearchTexts(
+        id=obj.id,
+        a=" ".join(title),
+        b=" ".join([*(obj.keyword or []), *get_actor_values(obj)]),
+        c=" ".join(obj.description.values()) if obj.description else "",
+        d=" ".join(get_identifier_values(obj)),
+    )
+
+
+def write_search_vectors(texts: List[SearchTexts]):
+    """Write weighted search vectors of datasets with a single upsert."""
+    if not texts:
+        return
+    ids, a, b, c, d = zip(*texts)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {DatasetSearchVector._meta.db_table} (dataset_id, vector)
+            SELECT texts.id, (
+                setweight(to_tsvector(%(config)s::regconfig, texts.a), 'A')
+                || setweight(to_tsvector(%(config)s::regconfig, texts.b), 'B')
+                || setweight(to_tsvector(%(config)s::regconfig, texts.c), 'C')
+                || setweight(to_tsvector(%(config)s::regconfig, texts.d), 'D')
+            )
+            FROM unnest(
+                %(ids)s::uuid[], %(a)s::text[], %(b)s::text[], %(c)s::text[], %(d)s::text[]
+            ) AS texts(id, a, b, c, d)
+            ON CONFLICT (dataset_id) DO UPDATE SET vector = EXCLUDED.vector
+            """,
+            {
+                "config": SEARCH_CONFIG,
+                "ids": list(ids),
+                "a": list(a),
+                "b": list(b),
+                "c": list(c),
+                "d": list(d),
+            },
         )
-        criteria.extend([oi.notation for oi in obj.other_identifiers.all()])
-        return " ".join(criteria)
+
+
+def update_search_vectors(dataset_ids: Iterable[UUID], batch_size=1000) -> int:
+    """Update search vectors of datasets, return number of updated datasets."""
+    count = 0
+    for batch in batched(dataset_ids, batch_size):
+        datasets = list(Dataset.all_objects.filter(id__in=batch))
+        prefetch_related_objects(datasets, *search_prefetch_fields)
+        write_search_vectors([get_search_texts(dataset) for dataset in datasets])
+        count += len(datasets)
+    return count
+
+
+class SearchVectorUpdate:
+    """On-commit callback that updates search vectors of datasets changed in a transaction."""
+
+    def __init__(self):
+        self.dataset_ids = set()
+
+    def __call__(self):
+        run_task(update_search_vectors, dataset_ids=list(self.dataset_ids))
+
+
+def schedule_search_vector_update(dataset_id: UUID):
+    """Update search vector of dataset after the current transaction is committed.
+
+    Multiple updates of the same dataset (and of any datasets) in the
+    same transaction are combined into a single task.
+    """
+    if not settings.ENABLE_DATASET_SEARCH_VECTOR:
+        return
+
+    on_commit_coalesced(SearchVectorUpdate, lambda callback: callback.dataset_ids.add(dataset_id))
@@ -8,7 +8,11 @@ from rest_framework import serializers
 from apps.actors.models import Organization
 from apps.actors.serializers import HomePageSerializer
 from apps.common.helpers import is_valid_uuid
-from apps.common.serializers.serializers import CommonListSerializer, RecursiveSerializer
+from apps.common.serializers.serializers import (
+    CommonListSerializer,
+    RecursiveSerializer,
+    RepresentationMemoMixin,
+)
 from apps.common.serializers.validators import AllOf
 from apps.core.models.catalog_record.dataset import Dataset
 from apps.core.serializers.dataset_actor_serializers.member_serializer import (
@@ -20,7 +24,7 @@ from apps.core.serializers.dataset_actor_serializers.member_serializer import (
 logger = logging.getLogger(__name__)
 
 
-class DatasetOrganizationSerializer(DatasetMemberSerializer):
+class DatasetOrganizationSerializer(RepresentationMemoMixin, DatasetMemberSerializer):
     """Dataset member organization serializer."""
 
     id = UUIDOrTagField(required=False)
@@ -168,7 +168,8 @@ class DatasetListSerializer(CommonListSerializer):
         self.context["datasets_by_pid"] = mapping
 
     def to_representation(self, data):
-        self.map_pids_to_datasets(data)
+        if {"relation", "other_identifiers"} & set(self.child.fields):
+            self.map_pids_to_datasets(data)
         return super().to_representation(data)
 
 
@@ -278,12 +279,44 @@ class DatasetSerializer(CommonNestedModelSerializer, SerializerCacheSerializer):
         "cumulative_state",
     }
 
+    # Dataset relations used by fields in addition to the field source
+    prefetch_field_dependencies = {
+        "data_sensitivity": ("rationales",),
+        "dataset_versions": ("dataset_versions",),
+        "version": ("dataset_versions",),
+    }
+
+    def get_prefetch_plan(self, prefetches: list) -> list:
+        """Return prefetches needed for rendering the fields of the serializer.
+
+        Prefetches are omitted when the first relation in the lookup is not used
+        by any rendered field, e.g. when only some fields are requested with
+        the `fields` query parameter. Prefetches needed for permission checks
+        are always included.
+        """
+        used_relations = {
+            lookup.split("__", 1)[0] for lookup in Dataset.permissions_prefetch_fields
+        }
+        for field in self._readable_fields:
+            if field.source != "*":
+                used_relations.add(field.source.split(".", 1)[0])
+            used_relations.update(self.prefetch_field_dependencies.get(field.field_name, ()))
+
+        plan = []
+        for prefetch in prefetches:
+            lookup = getattr(prefetch, "prefetch_through", prefetch)  # Prefetch or str
+            if lookup.split("__", 1)[0] in used_relations:
+                plan.append(prefetch)
+        return plan
+
     def apply_partial_prefetch(self, datasets: List[Dataset], prefetches: list):
         """Prefetch related objects with support for partial prefetch for cached datasets.
 
+        Only prefetches needed by the rendered fields are applied, see get_prefetch_plan.
         If any datasets are in the serialized datasets cache, only uncached relations
         are prefetched for them. Other relations are assumed do be in the cache.
         """
+        prefetches = self.get_prefetch_plan(prefetches)
         values = {}
         if cache := self.cache:
             values = cache.values
@@ -307,10 +340,9 @@ class DatasetSerializer(CommonNestedModelSerializer, SerializerCacheSerializer):
 
         # Mark datasets as having been prefetched so
         # dataset.ensure_prefetch() won't trigger another prefetch
-        for dataset in cached_datasets:
-            dataset.is_prefetched = True
-        for dataset in uncached_datasets:
+        for dataset in datasets:
             dataset.is_prefetched = True
+            dataset.is_prefetch_planned = True
 
     def get_fields(self):
         fields = super().get_fields()
@@ -322,8 +354,22 @@ class DatasetSerializer(CommonNestedModelSerializer, SerializerCacheSerializer):
             fields.pop("metrics", None)
         if not query_params.get("include_user_roles"):
             fields.pop("user_roles", None)
+        if requested_fields := query_params.get("fields"):
+            # Render only requested fields
+            not_found = [field for field in requested_fields if field not in fields]
+            if len(not_found):
+                raise serializers.ValidationError(
+                    {"fields": f"Fields not found in dataset: {','.join(not_found)}"}
+                )
+            fields = {name: field for name, field in fields.items() if name in requested_fields}
         return fields
 
+    @property
+    def is_projected(self) -> bool:
+        """Return True if only some of the fields are rendered."""
+        view = self.context.get("view")
+        return bool(getattr(view, "query_params", {}).get("fields"))
+
     def save(self, **kwargs):
         if self.instance:
             if (
@@ -340,8 +386,11 @@ class DatasetSerializer(CommonNestedModelSerializer, SerializerCacheSerializer):
             # so use {} as "empty" value.
             if not self._validated_data.get("metadata_owner"):
                 self._validated_data["metadata_owner"] = {}
+
+        # Update only index entries affected by an update
+        changed_fields = set(self._validated_data) if self.instance else None
         instance = super().save(**kwargs)
-        instance.update_index()
+        instance.update_index(changed_fields=changed_fields)
         return instance
 
     def omit_pid_fields(self, instance: Dataset, ret: dict):
@@ -367,6 +416,8 @@ class DatasetSerializer(CommonNestedModelSerializer, SerializerCacheSerializer):
 
         field = "data_access_reviewer_instructions"
         if access_rights.get(field):
+            # Copy to avoid modifying a cached value
+            access_rights = ret["access_rights"] = {**access_rights}
             has_edit_permission = instance.has_permission_to_edit(self.context["request"].user)
             if has_edit_permission:
                 access_rights[field] = access_rights[field].value
@@ -392,8 +443,8 @@ class DatasetSerializer(CommonNestedModelSerializer, SerializerCacheSerializer):
 
         has_emails = self.context.pop("has_emails", False)
 
-        # Save to serializer cache
-        if cache := self.cache:
+        # Save to serializer cache, partial representations are not cached
+        if (cache := self.cache) and not self.is_projected:
             if value_context := cache.get_value_context(instance):
                 has_emails = has_emails or value_context.get("has_emails", False)
             cache.set_value(
@@ -407,11 +458,6 @@ class DatasetSerializer(CommonNestedModelSerializer, SerializerCacheSerializer):
             ).data
 
         if fields := view.query_params.get("fields"):
-            not_found = [field for field in fields if field not in self.fields]
-            if len(not_found):
-                raise serializers.ValidationError(
-                    {"fields": f"Fields not found in dataset: {','.join(not_found)}"}
-                )
             ret = {k: v for k, v in ret.items() if k in fields}
 
         self.omit_pid_fields(instance, ret)
@@ -428,8 +474,8 @@ class DatasetSerializer(CommonNestedModelSerializer, SerializerCacheSerializer):
         self.handle_access_rights_private_fields(instance, ret)
 
         if has_emails:
-            # Handle email values. Copies dicts and lists to avoid accidentally modifying
-            # data that has not yet been committed to cache.
+            # Handle email values. Copies nested dicts and lists to avoid modifying
+            # data that is shared with the serializer cache.
             handle_private_emails(
                 ret,
                 show_emails=instance.has_permission_to_edit(request.user),
@@ -801,6 +847,16 @@ class DatasetSerializer(CommonNestedModelSerializer, SerializerCacheSerializer):
         return instance
 
 
+class CachedFieldsOnlyDatasetSerializer(DatasetSerializer):
+    """Dataset serializer that only serializes fields stored in the serializer cache."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        cached_fields = self.cache.cached_fields
+        fields = {name: fields[name] for name in cached_fields}
+        return fields
+
+
 class ExpandedMetadataOwnerUserSerializer(serializers.ModelSerializer):
     """Read-only serializer for metadata owner user when expand_user=true.
 
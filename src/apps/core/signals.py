@@ -4,16 +4,22 @@ from typing import Optional
 from cachalot.signals import post_invalidation
 from django.conf import settings
 from django.db import transaction
-from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import Signal, receiver
 from django.utils import timezone
 
 from apps.common.helpers import format_exception
 from apps.common.locks import lock_sync_dataset
 from apps.common.tasks import run_task
-from apps.core.models import Dataset, FileSet
+from apps.core.cache import (
+    schedule_dataset_aggregates_refresh,
+    schedule_dataset_cache_update,
+)
+from apps.core.models import DataCatalog, Dataset, FileSet
+from apps.core.models.catalog_record.dataset_index import schedule_unused_entries_cleanup
 from apps.core.models.contract import Contract
 from apps.core.models.sync import LastSuccessfulV2Sync, SyncAction, V2SyncStatus
+from apps.core.search import schedule_search_vector_update
 from apps.core.services import MetaxV2Client
 from apps.files.models import File
 from apps.files.signals import pre_files_deleted
@@ -128,11 +134,28 @@ def delete_dataset_from_v2(sender, instance: Dataset, soft=False, **kwargs):
         run_task(sync_dataset_to_v2, dataset=instance, action=action)
 
 
+@receiver(post_save, sender=Dataset)
+@receiver(post_delete, sender=Dataset)
+@receiver(post_save, sender=DataCatalog)
+@receiver(post_delete, sender=DataCatalog)
+def handle_dataset_list_changed(sender, **kwargs):
+    """Invalidate dataset list responses and list ETags after commit.
+
+    Datasets are saved also when they are created or updated through the API
+    (dataset_created and dataset_updated), so this covers them too. Bumping the
+    generation at commit time is needed because record_modified is set at save
+    time and a transaction that commits later may have an older timestamp.
+    """
+    schedule_dataset_aggregates_refresh(invalidate=True)
+
+
 @receiver(dataset_updated)
 def handle_dataset_updated(sender, instance: Dataset, **kwargs):
     if settings.METAX_V2_INTEGRATION_ENABLED:
         run_task(sync_dataset_to_v2, dataset=instance, action=SyncAction.UPDATE)
     sync_dataset_to_rems(instance)
+    schedule_dataset_cache_update(instance.id)
+    schedule_search_vector_update(instance.id)
 
 
 @receiver(dataset_created)
@@ -140,10 +163,14 @@ def handle_dataset_created(sender, instance: Dataset, **kwargs):
     if settings.METAX_V2_INTEGRATION_ENABLED:
         run_task(sync_dataset_to_v2, dataset=instance, action=SyncAction.CREATE)
     sync_dataset_to_rems(instance)
+    schedule_dataset_cache_update(instance.id)
+    schedule_search_vector_update(instance.id)
 
 
 @receiver(pre_delete, sender=Dataset)
 def handle_dataset_pre_delete(sender, instance: Dataset, **kwargs):
+    # Links to index entries are deleted with the dataset, remove entries left unused
+    schedule_unused_entries_cleanup(list(instance.index_entries.values_list("id", flat=True)))
     if instance.state == Dataset.StateChoices.PUBLISHED and (
         fileset := getattr(instance, "file_set", None)
     ):
@@ -1,54 +1,35 @@
 import logging
 
+from django.conf import settings
 from django.db.models import Count, F, Q, Window
 from django.db.models.functions import RowNumber
 
 from apps.common.helpers import parse_csv_string, single_translation
+from apps.core.facets import facet_engine
 from apps.core.models import DataService, DatasetIndexEntry
 
 logger = logging.getLogger(__name__)
 
 
-def _get_facet_search_params(request):
+def _get_facet_search_params(query_params):
     facet_search_params: dict[str, str] = {
-        "project": request.query_params.get("project_facet_search"),
-        "creator": request.query_params.get("creator_facet_search"),
-        "organization": request.query_params.get("organization_facet_search"),
-        "field_of_science": request.query_params.get("field_of_science_facet_search"),
-        "keyword": request.query_params.get("keyword_facet_search"),
+        "project": query_params.get("project_facet_search"),
+        "creator": query_params.get("creator_facet_search"),
+        "organization": query_params.get("organization_facet_search"),
+        "field_of_science": query_params.get("field_of_science_facet_search"),
+        "keyword": query_params.get("keyword_facet_search"),
     }
     return {k: v for k, v in facet_search_params.items() if v}
 
 
-def aggregate_queryset(queryset, request):
-    dataset_ids = list(queryset.values_list("id", flat=True))
-    language = request.query_params.get("filter_language")
-    expand_data_services = request.query_params.get("expand_data_services")
-    facet_search_params = _get_facet_search_params(request)
-    limit_hits = request.query_params.get("limit_hits", 20)
-
-    facet_query_params = {
-        "data_catalog": "facet_data_catalog",
-        "access_type": "facet_access_type",
-        "organization": "facet_organization",
-        "creator": "facet_creator",
-        "field_of_science": "facet_field_of_science",
-        "keyword": "facet_keyword",
-        "infrastructure": "facet_infrastructure",
-        "file_type": "facet_file_type",
-        "project": "facet_project",
-    }
-
+def count_entries_sql(dataset_ids, language, keys, facet_search_params, limit_hits):
+    """Return top (value, count) pairs for each facet key using a database query."""
     filters = Q()
-
-    def has_facet_search_params():
-        return len(facet_search_params.keys()) > 0
-
-    if has_facet_search_params():
+    if facet_search_params:
         for facet, value in facet_search_params.items():
             filters |= Q(key=facet, value__icontains=value)
     else:
-        for facet in facet_query_params.keys():
+        for facet in keys:
             filters |= Q(key=facet)
 
     entries = (
@@ -67,6 +48,50 @@ def aggregate_queryset(queryset, request):
         .filter(row_number__lte=limit_hits)
         .values("key", "value", "dataset_count")
     )
+    result = {}
+    for entry in entries:
+        result.setdefault(entry["key"], []).append((entry["value"], entry["dataset_count"]))
+    return result
+
+
+def count_entries_engine(dataset_ids, language, keys, facet_search_params, limit_hits):
+    """Return top (value, count) pairs for each facet key using the in-memory facet engine."""
+    if facet_search_params:
+        keys = facet_search_params.keys()
+    snapshot = facet_engine.get_snapshot()
+    return snapshot.count(
+        dataset_ids, language, keys, limit=int(limit_hits), search=facet_search_params
+    )
+
+
+def aggregate_queryset(queryset, query_params):
+    dataset_ids = list(queryset.values_list("id", flat=True))
+    language = query_params.get("filter_language")
+    expand_data_services = query_params.get("expand_data_services")
+    facet_search_params = _get_facet_search_params(query_params)
+    limit_hits = query_params.get("limit_hits", 20)
+
+    facet_query_params = {
+        "data_catalog": "facet_data_catalog",
+        "access_type": "facet_access_type",
+        "organization": "facet_organization",
+        "creator": "facet_creator",
+        "field_of_science": "facet_field_of_science",
+        "keyword": "facet_keyword",
+        "infrastructure": "facet_infrastructure",
+        "file_type": "facet_file_type",
+        "project": "facet_project",
+    }
+
+    def has_facet_search_params():
+        return len(facet_search_params.keys()) > 0
+
+    count_entries = count_entries_sql
+    if settings.ENABLE_FACET_ENGINE:
+        count_entries = count_entries_engine
+    counts = count_entries(
+        dataset_ids, language, facet_query_params.keys(), facet_search_params, limit_hits
+    )
 
     # Group aggregated results by key, e.g.
     # {
@@ -75,10 +100,10 @@ def aggregate_queryset(queryset, request):
     #   ],
     #    ...
     # }
-    result = {}
-    for entry in entries:
-        key_results = result.setdefault(entry["key"], [])
-        key_results.append({"value": entry["value"], "count": entry["dataset_count"]})
+    result = {
+        key: [{"value": value, "count": count} for value, count in key_counts]
+        for key, key_counts in counts.items()
+    }
 
     # Convert results to shape expected by etsin
     def get_hits(key):
@@ -122,9 +147,9 @@ def aggregate_queryset(queryset, request):
     #   parsed via parse_csv_string(), e.g. ?keyword=cat,dog or
     #   ?keyword="cat, domestic","dog"
     existing_aggregate_query_params: dict[str, list[str]] = {}
-    for query_param_key in request.query_params.keys():
+    for query_param_key in query_params.keys():
         if query_param_key in facet_query_params.values():
-            raw_values: list[str] = request.query_params.getlist(query_param_key)
+            raw_values: list[str] = query_params.getlist(query_param_key)
             values: list[str] = []
             for value in raw_values:
                 values += parse_csv_string(value)
@@ -3,10 +3,15 @@ import operator
 from functools import reduce
 from typing import List
 
+from django.conf import settings
 from django.contrib.gis.geos import GEOSGeometry
 from django.contrib.gis.measure import D
+from django.contrib.postgres.search import SearchQuery, SearchRank
 from django.core.cache import caches
-from django.db.models import Exists, OuterRef, Q, QuerySet
+from django.db.backends.postgresql.psycopg_any import DateRange
+from django.db.models import Exists, F, Func, OuterRef, Q, QuerySet, Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Contains
 from django.utils.translation import gettext_lazy as _
 from django_filters import rest_framework as filters
 from django_filters.fields import CSVWidget
@@ -15,14 +20,18 @@ from rest_framework_gis.filters import GeometryFilter
 from rest_framework.exceptions import ValidationError
 from watson import search
 
+from apps.actors.models import Organization, OrganizationAncestor
 from apps.common.filters import MultipleCharField, MultipleCharFilter, VerboseChoiceFilter
+from apps.common.functions import LowerArrayText, LowerValues
 from apps.common.helpers import is_valid_uuid
+from apps.common.search import escape_search_query
 from apps.core.models.access_rights import REMSApprovalType
-from apps.core.models.catalog_record import Dataset
-from apps.core.models.concepts import AccessType
+from apps.core.models.catalog_record import Dataset, DatasetSpatialExtent, Temporal
+from apps.core.models.concepts import AccessType, FieldOfScience, FileType, ResearchInfra
 from apps.core.models.data_catalog import DataCatalog
 from apps.core.models.preservation import Preservation
 from apps.core.permissions import DatasetAccessPolicy
+from apps.core.search import SEARCH_CONFIG
 from apps.core.views.common_views import DefaultValueOrdering
 
 
@@ -267,9 +276,8 @@ class DatasetFilter(filters.FilterSet):
     )
 
     title = filters.CharFilter(
-        field_name="title__values",
+        method="filter_title",
         max_length=512,
-        lookup_expr="icontains",
         label="title",
     )
 
@@ -282,9 +290,22 @@ class DatasetFilter(filters.FilterSet):
     def search_dataset(self, queryset, name, value):
         if value is None or value == "":
             return queryset
-        if self.form.cleaned_data.get("ordering") is None:
-            return search.filter(queryset=queryset, search_text=value, ranking=True)
-        return search.filter(queryset=queryset, search_text=value, ranking=False)
+        ranking = self.form.cleaned_data.get("ordering") is None
+        if settings.ENABLE_DATASET_SEARCH_VECTOR:
+            return self.search_vector(queryset, value, ranking=ranking)
+        return search.filter(queryset=queryset, search_text=value, ranking=ranking)
+
+    def search_vector(self, queryset, value, ranking: bool):
+        """Search datasets using DatasetSearchVector, optionally ordered by rank."""
+        query_text = escape_search_query(value)
+        if not query_text:
+            return queryset.none()
+        query = SearchQuery(query_text, search_type="raw", config=SEARCH_CONFIG)
+        queryset = queryset.filter(search_vector__vector=query)
+        if ranking:
+            rank = SearchRank(F("search_vector__vector"), query, cover_density=True)
+            queryset = queryset.annotate(search_rank=rank).order_by("-search_rank")
+        return queryset
 
     def filter_access_type(self, queryset, name, value):
         access_types = list(
@@ -301,22 +322,23 @@ class DatasetFilter(filters.FilterSet):
         for group in value:
             if not group:
                 continue
-            union = reduce(
-                operator.or_,
-                (
-                    (
-                        Q(actors__organization__pref_label__values__icontains=x)
-                        | Q(actors__organization__parent__pref_label__values__icontains=x)
-                        | Q(actors__organization__parent__parent__pref_label__values__icontains=x)
-                    )
-                    for x in group
-                ),
-            )
-            org_query = org_query.filter(union)
+            organizations = Organization.all_objects.filter(
+                self._text_contains(LowerValues("pref_label"), group)
+            ).values("id")
+            # Match organizations and their descendants at any depth
+            descendants = OrganizationAncestor.objects.filter(
+                ancestor__in=organizations
+            ).values("descendant_id")
+            org_query = org_query.filter(actors__organization__in=descendants)
         return queryset.filter(Exists(org_query))
 
     def filter_keyword(self, queryset, name, value):
-        return self._filter_list(queryset, value, filter_param="keyword__icontains")
+        return self._filter_text(queryset, value, LowerArrayText("keyword"))
+
+    def filter_title(self, queryset, name, value):
+        if not value:
+            return queryset
+        return queryset.filter(self._text_contains(LowerValues("title"), [value]))
 
     def filter_creator(self, queryset, name, value):
         creator_query = Dataset.all_objects.filter(id=OuterRef("id"))
@@ -325,16 +347,13 @@ class DatasetFilter(filters.FilterSet):
                 continue
             union = Q()
             for val in group:
+                descendants = OrganizationAncestor.objects.filter(
+                    ancestor__pref_label__values__contains=[val]
+                ).values("descendant_id")
                 union = union | (
                     Q(actors__roles__contains=["creator"])
                     & (
-                        Q(actors__organization__pref_label__values__contains=[val])
-                        | Q(actors__organization__parent__pref_label__values__contains=[val])
-                        | Q(
-                            actors__organization__parent__parent__pref_label__values__contains=[
-                                val
-                            ]
-                        )
+                        Q(actors__organization__in=descendants)
                         | Q(actors__person__name__exact=val)
                     )
                 )
@@ -342,30 +361,25 @@ class DatasetFilter(filters.FilterSet):
         return queryset.filter(Exists(creator_query))
 
     def filter_field_of_science(self, queryset, name, value):
-        return self._filter_list(
-            queryset,
-            value,
-            filter_param="field_of_science__pref_label__values__icontains",
+        return self._filter_concept(
+            queryset, value, model=FieldOfScience, filter_param="field_of_science__in"
         )
 
     def filter_infrastructure(self, queryset, name, value):
-        return self._filter_list(
-            queryset,
-            value,
-            filter_param="infrastructure__pref_label__values__icontains",
+        return self._filter_concept(
+            queryset, value, model=ResearchInfra, filter_param="infrastructure__in"
         )
 
     def filter_file_type(self, queryset, name, value):
-        return self._filter_list(
+        return self._filter_concept(
             queryset,
             value,
-            filter_param="file_set__file_metadata__file_type__pref_label__values__icontains",
+            model=FileType,
+            filter_param="file_set__file_metadata__file_type__in",
         )
 
     def filter_project(self, queryset, name, value):
-        return self._filter_list(
-            queryset, value, filter_param="projects__title__values__icontains"
-        )
+        return self._filter_text(queryset, value, LowerValues("projects__title"))
 
     def filter_publishing_channels(self, queryset, name, value):
         if value == "all":
@@ -459,6 +473,42 @@ class DatasetFilter(filters.FilterSet):
             result = result.filter(union)
         return result.distinct()
 
+    def _text_contains(self, expression: Func, values: List[str]) -> Q:
+        """Return condition for lowercased text expression containing any of values.
+
+        Unlike icontains on hstore values or arrays, the text expressions from
+        apps.common.functions can use trigram indexes.
+        """
+        return reduce(
+            operator.or_, (Q(Contains(expression, Lower(Value(x)))) for x in values)
+        )
+
+    def _filter_text(self, queryset: QuerySet, value: List[List[str]], expression: Func):
+        result = queryset
+        for group in value:
+            if not group:
+                continue
+            result = result.filter(self._text_contains(expression, group))
+        return result.distinct()
+
+    def _filter_concept(
+        self, queryset: QuerySet, value: List[List[str]], model, filter_param: str
+    ):
+        """Filter by reference data concepts with pref_label containing any value of each group.
+
+        The matching concepts are resolved in a subquery, so the datasets can be
+        filtered by concept id without matching labels for each dataset row.
+        """
+        result = queryset
+        for group in value:
+            if not group:
+                continue
+            concepts = model.all_objects.filter(
+                self._text_contains(LowerValues("pref_label"), group)
+            ).values("id")
+            result = result.filter(**{filter_param: concepts})
+        return result.distinct()
+
     has_files = filters.BooleanFilter(
         field_name="file_set__files", lookup_expr="isnull", exclude=True, distinct=True
     )
@@ -516,49 +566,35 @@ class DatasetFilter(filters.FilterSet):
         if end_date == None and start_date == None:
             return queryset
 
-        if end_date == None:
-            queryset = queryset.filter(
-                Q(temporal__start_date__isnull=False, temporal__end_date__isnull=True)
-                | Q(temporal__end_date__gte=start_date)
-            ).distinct()
-            return queryset
-
-        if start_date == None:
-            queryset = queryset.filter(
-                Q(temporal__start_date__isnull=True, temporal__end_date__isnull=False)
-                | Q(temporal__start_date__lte=end_date)
-            ).distinct()
-            return queryset
-
-        if end_date < start_date:
+        if end_date and start_date and end_date < start_date:
             raise ValidationError(
                 {
                     "temporal__end_date": "temporal__end_date must not be before temporal__start_date"
                 }
             )
 
-        queryset = queryset.filter(
-            Q(temporal__start_date__lte=end_date, temporal__end_date__gte=start_date)
-            | Q(temporal__start_date__isnull=True, temporal__end_date__gte=start_date)
-            | Q(temporal__end_date__isnull=True, temporal__start_date__lte=end_date)
-        ).distinct()
-        return queryset
+        # Missing start or end date is unbounded, both in the query and in Temporal.date_range
+        query_range = DateRange(start_date, end_date, bounds="[]")
+        temporals = Temporal.all_objects.filter(
+            dataset_id=OuterRef("id"), date_range__overlap=query_range
+        )
+        return queryset.filter(Exists(temporals))
 
     def filter_geometry(self, queryset, name, value):
         query_params = self.form.cleaned_data
         geom = GEOSGeometry(query_params["geolocation"])
         distance = None if not query_params["distance"] else int(query_params["distance"])
 
+        # DatasetSpatialExtent contains all geolocations of a dataset in one geometry,
+        # so both lookups are a single GiST index scan without joining geolocations
         if distance and geom:
-            queryset = queryset.filter(
-                Q(spatial__geolocations__geometry_2d__distance_lte=(geom, D(m=distance)))
-            ).distinct()
+            extents = DatasetSpatialExtent.objects.filter(geometry__dwithin=(geom, D(m=distance)))
         elif geom:
-            queryset = queryset.filter(
-                Q(spatial__geolocations__geometry_2d__intersects=geom)
-            ).distinct()
+            extents = DatasetSpatialExtent.objects.filter(geometry__intersects=geom)
+        else:
+            return queryset
 
-        return queryset
+        return queryset.filter(id__in=extents.values("dataset_id"))
 
     # Facet filters
     facet_access_type = DatasetIndexEntryFilter(key="access_type")
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from rest_framework import exceptions
+from rest_framework.pagination import Cursor, CursorPagination
+
+from apps.common.pagination import (
+    OffsetOrCursorPagination,
+    OffsetPagination,
+    TogglablePaginationMixin,
+)
+from apps.core.cache import get_dataset_list_response_cache
+
+logger = logging.getLogger(__name__)
+
+
+def get_estimated_count(queryset) -> Optional[int]:
+    """Return number of rows estimated by the query planner, None if not available."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+    except Exception as error:
+        logger.warning(f"Failed to estimate dataset count: {error}")
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class DatasetOffsetPagination(OffsetPagination):
+    """Offset pagination for datasets with configurable count strategy.
+
+    Counting all matching datasets can be more expensive than fetching the page.
+    - When DATASET_LIST_COUNT_CACHE_TIMEOUT is set, exact counts are cached
+      for each user and set of filters for the given number of seconds.
+    - When DATASET_LIST_COUNT_ESTIMATE_THRESHOLD is set, the query planner
+      estimate is used as the count when it is at least the threshold.
+
+    When either is enabled, the response includes count_estimated which tells
+    if the count is an estimate. On the last page the count is always exact.
+    """
+
+    count_estimated = False
+
+    @classmethod
+    def is_count_strategy_enabled(cls) -> bool:
+        return bool(
+            settings.DATASET_LIST_COUNT_CACHE_TIMEOUT
+            or settings.DATASET_LIST_COUNT_ESTIMATE_THRESHOLD
+        )
+
+    def get_count_cache_key(self, request) -> str:
+        """Return cache key for count of datasets matching the request filters."""
+        ignored = {*DatasetOffsetOrCursorPagination.params, "ordering"}
+        params = sorted(
+            (key, sorted(values)) for key, values in request.GET.lists() if key not in ignored
+        )
+        user = request.user.id if request.user.is_authenticated else None
+        digest = hashlib.sha256(json.dumps([user, params]).encode()).hexdigest()
+        return f"dataset-count:{digest}"
+
+    def get_count_with_strategy(self, queryset, request) -> Tuple[int, bool]:
+        """Return (count, is_estimate) for queryset."""
+        cache = get_dataset_list_response_cache()
+        cache_key = None
+        if timeout := settings.DATASET_LIST_COUNT_CACHE_TIMEOUT:
+            cache_key = self.get_count_cache_key(request)
+            if (count := cache.get(cache_key)) is not None:
+                return count, False
+
+        if threshold := settings.DATASET_LIST_COUNT_ESTIMATE_THRESHOLD:
+            estimate = get_estimated_count(queryset)
+            if estimate is not None and estimate >= threshold:
+                return estimate, True
+
+        count = self.get_count(queryset)
+        if cache_key:
+            cache.set(cache_key, count, timeout=timeout)
+        return count, False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not (self.pagination_enabled(request) and self.is_count_strategy_enabled()):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.count, self.count_estimated = self.get_count_with_strategy(queryset, request)
+        if not self.count_estimated:
+            if self.count == 0 or self.offset > self.count:
+                return []
+            return list(queryset[self.offset : self.offset + self.limit])
+
+        # Fetch one extra dataset to know if there is a next page
+        results = list(queryset[self.offset : self.offset + self.limit + 1])
+        page = results[: self.limit]
+        if len(results) > self.limit:
+            self.count = max(self.count, self.offset + len(results))
+        elif page or self.offset == 0:
+            # Last page, the exact count is known
+            self.count = self.offset + len(page)
+            self.count_estimated = False
+        else:
+            self.count = min(self.count, self.offset)
+        return page
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.is_count_strategy_enabled():
+            response.data["count_estimated"] = self.count_estimated
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_estimated"] = {
+            "type": "boolean",
+            "description": "True if count is estimated by the database query planner.",
+        }
+        return response_schema
+
+
+class DatasetCursorPagination(TogglablePaginationMixin, CursorPagination):
+    """Keyset pagination for datasets.
+
+    The page position is the (ordering field, id) pair of the last dataset
+    on the previous page, so each page is fetched with an index range scan
+    regardless of how deep it is, and no count query is made. Unlike
+    DRF CursorPagination, the position is unique and no offset is needed
+    for datasets with equal timestamps.
+    """
+
+    ordering = "-modified"
+    allowed_orderings = {"created", "-created", "modified", "-modified"}
+    template = None
+
+    page_size = 20  # default
+    page_size_query_param = "limit"
+
+    # Declare which query parameters are used by pagination so they can be used in validation
+    params = {
+        CursorPagination.cursor_query_param,
+        page_size_query_param,
+        *TogglablePaginationMixin.params,
+    }
+
+    def get_ordering(self, request, queryset, view):
+        """Return (field, descending) from the ordering filter parameter."""
+        ordering = request.query_params.get("ordering") or self.ordering
+        if ordering not in self.allowed_orderings:
+            raise exceptions.ValidationError(
+                {
+                    "ordering": "Value not allowed for cursor pagination. Allowed values are "
+                    + ", ".join(f"'{value}'" for value in sorted(self.allowed_orderings))
+                    + "."
+                }
+            )
+        return ordering.lstrip("-"), ordering.startswith("-")
+
+    def decode_position(self, position: str):
+        try:
+            value, id = position.split("|")
+            return datetime.fromisoformat(value), UUID(id)
+        except ValueError:
+            raise exceptions.NotFound(self.invalid_cursor_message)
+
+    def encode_position(self, dataset) -> str:
+        return f"{getattr(dataset, self.field).isoformat()}|{dataset.id}"
+
+    def filter_after(self, queryset, position, descending: bool):
+        """Return datasets after position in (field, id) order."""
+        value, id = position
+        op = "lt" if descending else "gt"
+        # The redundant lte/gte condition lets Postgres use an index range scan
+        return queryset.filter(
+            Q(**{f"{self.field}__{op}e": value})
+            & (Q(**{f"{self.field}__{op}": value}) | Q(**{self.field: value, f"id__{op}": id}))
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.pagination_enabled(request):
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, descending = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        # Reverse cursors fetch the previous page in reverse order
+        fetch_descending = descending != reverse
+        prefix = "-" if fetch_descending else ""
+        queryset = queryset.order_by(f"{prefix}{self.field}", f"{prefix}id")
+        if self.cursor and self.cursor.position:
+            queryset = self.filter_after(
+                queryset, self.decode_position(self.cursor.position), fetch_descending
+            )
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=self.encode_position(self.page[-1]))
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=self.encode_position(self.page[0]))
+        )
+
+
+class DatasetOffsetOrCursorPagination(OffsetOrCursorPagination):
+    """Dataset paginator that uses offset or cursor pagination based on request."""
+
+    offset_pagination_class = DatasetOffsetPagination
+    cursor_pagination_class = DatasetCursorPagination
+    pagination_type_description = """Pagination type.
+            Cursor pagination only supports `ordering` values `created`, `-created`, `modified`
+            and `-modified`, ignores search ranking and does not return the total dataset count,
+            but each page is equally fast to fetch, which makes it suitable for harvesting."""
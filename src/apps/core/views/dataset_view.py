@@ -8,12 +8,12 @@
 from dataclasses import dataclass
 import logging
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional
 
 from django.conf import settings
 from django.core.cache import caches
 from django.db import transaction
-from django.db.models import Exists, OuterRef, QuerySet, Value
+from django.db.models import Count, Exists, Max, OuterRef, Q, QuerySet, Value
 from django.http import Http404, HttpResponse
 from django.utils.decorators import method_decorator
 from django.utils.http import parse_http_date
@@ -27,14 +27,22 @@ from rest_framework.generics import get_object_or_404
 from rest_framework.renderers import JSONRenderer
 from rest_framework.reverse import reverse
 
+from apps.cache import single_flight
 from apps.common.helpers import ensure_dict, omit_empty
 from apps.common.serializers.serializers import (
     CommonModelSerializer,
     FlushQueryParamsSerializer,
     IncludeRemovedQueryParamsSerializer,
 )
-from apps.common.views import CommonModelViewSet
-from apps.core.cache import DatasetSerializerCache
+from apps.common.views import CommonModelViewSet, ETagMixin
+from apps.core.cache import (
+    DatasetSerializerCache,
+    get_dataset_aggregates_cache_key,
+    get_dataset_list_generation,
+    get_dataset_list_response_cache,
+    get_dataset_list_response_cache_key,
+    get_dataset_list_watermark,
+)
 from apps.core.models.catalog_record import Dataset, FileSet
 from apps.core.models.catalog_record.related import EntityRelation
 from apps.core.models.concepts import RelationType
@@ -77,6 +85,7 @@ from apps.rems.serializers import (
 )
 
 from .dataset_aggregation import aggregate_queryset
+from .dataset_pagination import DatasetOffsetOrCursorPagination
 
 logger = logging.getLogger(__name__)
 serialized_datasets_cache = caches["serialized_datasets"]
@@ -92,7 +101,7 @@ serialized_datasets_cache = caches["serialized_datasets"]
         }
     ),
 )
-class DatasetViewSet(CommonModelViewSet):
+class DatasetViewSet(ETagMixin, CommonModelViewSet):
     filter_actions = ["list", "aggregates"]
     query_serializers = [
         {"class": LatestVersionQueryParamsSerializer, "actions": ["list", "aggregates"]},
@@ -158,12 +167,27 @@ class DatasetViewSet(CommonModelViewSet):
     filterset_class = DatasetFilter
     http_method_names = ["get", "post", "put", "patch", "delete", "options"]
 
+    # Allow to select paginator by setting pagination_type to "offset" or "cursor"
+    pagination_class = DatasetOffsetOrCursorPagination
+
+    @property
+    def paginator(self):
+        """The paginator instance associated with the view."""
+        # Modified to include request in the paginator init
+        if not hasattr(self, "_paginator"):
+            self._paginator = self.pagination_class(self.request)
+        return self._paginator
+
     def filter_queryset(self, queryset):
         queryset = super().filter_queryset(queryset)
         if self.query_params.get("latest_versions"):
             # Return only the latest dataset versions available for the current user.
             # By default, includes drafts if the user can see them.
-            if self.request.GET.get("state") == Dataset.StateChoices.PUBLISHED:
+            only_published = (
+                self.request.GET.get("state") == Dataset.StateChoices.PUBLISHED
+                or self.request.user.is_anonymous
+            )
+            if only_published:
                 # Ignore drafts to allow users to see the latest published version
                 # with ?latest_versions=true&state=published
                 # even if there exists a later draft.
@@ -171,12 +195,30 @@ class DatasetViewSet(CommonModelViewSet):
             else:
                 available_datasets = self.get_queryset()
 
+            later_version_exists = Exists(
+                available_datasets.filter(
+                    dataset_versions_id=OuterRef("dataset_versions_id"),
+                    dataset_versions_order__gt=OuterRef("dataset_versions_order"),
+                )
+            )
+            if self.query_params.get("include_removed") or self.request.META.get(
+                "HTTP_IF_MODIFIED_SINCE"
+            ):
+                # The flags only consider all non-removed datasets
+                return queryset.filter(~later_version_exists)
+            if only_published:
+                return queryset.filter(is_latest_published=True)
+            if self.request.user.is_superuser:
+                return queryset.filter(is_latest_version=True)
+
+            # The latest version visible to the user is either the latest version,
+            # or the latest published version or a draft when later versions are
+            # not visible. Older published versions are never the latest visible.
             return queryset.filter(
-                ~Exists(
-                    available_datasets.filter(
-                        dataset_versions_id=OuterRef("dataset_versions_id"),
-                        dataset_versions_order__gt=OuterRef("dataset_versions_order"),
-                    )
+                Q(is_latest_version=True)
+                | (
+                    (Q(is_latest_published=True) | Q(state=Dataset.StateChoices.DRAFT))
+                    & ~later_version_exists
                 )
             )
         return queryset
@@ -265,6 +307,15 @@ class DatasetViewSet(CommonModelViewSet):
             qs = self.access_policy.scope_queryset(self.request, qs)
         return qs
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method == "GET":
+            # Serialize shared reference data and organizations only once per response
+            context["representation_memo"] = {}
+            if settings.ENABLE_COMPILED_DATASET_SERIALIZER:
+                context["compiled_representation"] = True
+        return context
+
     def get_serializer(self, *args, cached_instances=[], cache_autocommit=True, **kwargs):
         serializer_cache = None
         # Use cached fields for serialization of datasets in cached_instances
@@ -272,8 +323,63 @@ class DatasetViewSet(CommonModelViewSet):
 
         return super().get_serializer(*args, cache=serializer_cache, **kwargs)
 
+    def get_list_response_cache_key(self) -> Optional[str]:
+        """Return response cache key if the list response can be cached.
+
+        Only responses containing published datasets for anonymous users are cached.
+        """
+        request = self.request
+        if (
+            settings.ENABLE_DATASET_LIST_RESPONSE_CACHE
+            and request.user.is_anonymous
+            and request.GET.get("state") == Dataset.StateChoices.PUBLISHED
+            and not request.META.get("HTTP_IF_MODIFIED_SINCE")
+        ):
+            return get_dataset_list_response_cache_key(request, get_dataset_list_watermark())
+        return None
+
+    def use_etag(self) -> bool:
+        """Return True if ETags are used for the request.
+
+        Responses for authenticated users depend on their permissions, which can
+        change without updating record_modified (e.g. editors, csc_projects and
+        admin organizations), so ETags are only used for anonymous requests.
+        """
+        return self.request.user.is_anonymous
+
     def list(self, request, *args, **kwargs):
-        """List datasets."""
+        """List datasets, using the response cache when possible.
+
+        The list ETag is determined by the dataset list generation, which is
+        incremented after datasets are changed, so unchanged lists are answered
+        with 304 Not Modified before any datasets are fetched.
+        """
+        etag = None
+        if self.use_etag() and (generation := get_dataset_list_generation()) is not None:
+            etag = self.get_etag(generation, request.META.get("HTTP_IF_MODIFIED_SINCE"))
+            if not_modified := self.get_not_modified_response(etag):
+                return not_modified
+
+        response_cache = get_dataset_list_response_cache()
+        if response_cache_key := self.get_list_response_cache_key():
+            data = response_cache.get(response_cache_key)
+            if data is not None:
+                return response.Response(data, headers={"ETag": etag} if etag else None)
+
+        resp = self.list_datasets(request)
+        if resp.status_code == 200:
+            if etag:
+                resp["ETag"] = etag
+            if response_cache_key:
+                response_cache.set(
+                    response_cache_key,
+                    resp.data,
+                    timeout=settings.DATASET_LIST_RESPONSE_CACHE_TIMEOUT,
+                )
+        return resp
+
+    def list_datasets(self, request):
+        """List datasets without response cache."""
         only_published = request.GET.get("state") == Dataset.StateChoices.PUBLISHED
         queryset = self.filter_queryset(self.get_queryset(only_published=only_published))
 
@@ -297,7 +403,10 @@ class DatasetViewSet(CommonModelViewSet):
         dataset_serializer: DatasetSerializer = list_serializer.child
         cache = dataset_serializer.cache
         if cache and settings.DEBUG_DATASET_CACHE:
-            logger.info(f"Datasets in cache: {len(cache.values)}/{len(datasets)}")
+            logger.info(
+                f"Datasets in cache: {len(cache.values)}/{len(datasets)} "
+                f"(local: {cache.stats['local']}, source: {cache.stats['source']})"
+            )
         dataset_serializer.apply_partial_prefetch(datasets, prefetches)
 
         serialized_data = list_serializer.data  # Run serialization
@@ -334,9 +443,32 @@ class DatasetViewSet(CommonModelViewSet):
         self.check_object_permissions(self.request, obj)
         return obj, prefetches
 
+    def get_retrieve_etag(self, instance: Dataset) -> str:
+        """Return ETag for a single dataset.
+
+        The response also contains information about other versions and
+        drafts of the dataset, so their modification timestamps and count
+        are included. Changes that don't update record_modified (e.g. metrics
+        and data catalogs) are covered by the dataset list generation.
+        """
+        related = Q(id=instance.id) | Q(draft_of_id=instance.id)
+        if instance.dataset_versions_id:
+            related |= Q(dataset_versions_id=instance.dataset_versions_id)
+        watermark = Dataset.all_objects.filter(related).aggregate(
+            latest=Max("record_modified"), count=Count("id")
+        )
+        return self.get_etag(
+            instance.id, watermark["latest"], watermark["count"], get_dataset_list_generation()
+        )
+
     def retrieve(self, request, *args, **kwargs):
-        """Retrieve single dataset. Modified for cache use."""
+        """Retrieve single dataset. Modified for cache and ETag use."""
         instance, prefetches = self._get_object_with_deferred_prefetch()
+        etag = None
+        if self.use_etag():
+            etag = self.get_retrieve_etag(instance)
+            if not_modified := self.get_not_modified_response(etag):
+                return not_modified
 
         serializer: DatasetSerializer = self.get_serializer(instance, cached_instances=[instance])
         if (cache := serializer.cache) and settings.DEBUG_DATASET_CACHE:
@@ -344,7 +476,7 @@ class DatasetViewSet(CommonModelViewSet):
 
         serializer.apply_partial_prefetch([instance], prefetches)
 
-        return response.Response(serializer.data)
+        return response.Response(serializer.data, headers={"ETag": etag} if etag else None)
 
     @action(detail=True, methods=["post"], url_path="new-version")
     def new_version(self, request, pk=None):
@@ -531,10 +663,39 @@ class DatasetViewSet(CommonModelViewSet):
             PIDMSClient().update_doi_dataset(dataset.id, dataset.persistent_identifier)
         dataset.signal_update()
 
+    def get_aggregates_cache_key(self) -> Optional[str]:
+        """Return cache key if the aggregates can be cached.
+
+        Only aggregates for anonymous users, i.e. of published datasets, are cached.
+        """
+        request = self.request
+        if (
+            settings.ENABLE_DATASET_AGGREGATES_CACHE
+            and request.user.is_anonymous
+            and not request.META.get("HTTP_IF_MODIFIED_SINCE")
+        ):
+            return get_dataset_aggregates_cache_key(
+                request.query_params, get_dataset_list_watermark()
+            )
+        return None
+
     @action(detail=False)
     def aggregates(self, request):
-        queryset = self.filter_queryset(self.get_queryset())
-        aggregates = aggregate_queryset(queryset, request)
+        def compute_aggregates():
+            queryset = self.filter_queryset(self.get_queryset())
+            return aggregate_queryset(queryset, request.query_params)
+
+        if cache_key := self.get_aggregates_cache_key():
+            # Default aggregates are usually precomputed, concurrent
+            # requests for other aggregates are computed only once
+            aggregates = single_flight.get_or_compute(
+                get_dataset_list_response_cache(),
+                cache_key,
+                compute_aggregates,
+                timeout=settings.DATASET_AGGREGATES_CACHE_TIMEOUT,
+            )
+        else:
+            aggregates = compute_aggregates()
         return response.Response(aggregates, status=status.HTTP_200_OK)
 
     def perform_destroy(self, instance):
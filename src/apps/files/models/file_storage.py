@@ -10,11 +10,12 @@ import operator
 import re
 import uuid
 from collections import namedtuple
-from typing import Dict, List, Set, Tuple, Union
+from typing import Dict, Iterable, List, Set, Tuple, Union
 
 from django.conf import settings
 from django.db import models
 from django.db.models.functions import Concat
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from model_utils.managers import SoftDeletableManager
 from rest_framework import exceptions
@@ -28,6 +29,7 @@ from apps.common.models import (
     CustomSoftDeletableManager,
     ProxyBasePolymorphicModel,
 )
+from apps.common.tasks import on_commit_coalesced
 from apps.users.models import MetaxUser
 
 
@@ -546,3 +548,24 @@ class IDAFileStorage(ProjectFileStorage):
 
     class Meta:
         proxy = True
+
+
+class FileStorageModifiedUpdate:
+    """On-commit callback that updates modification timestamps of file storages."""
+
+    def __init__(self):
+        self.storage_ids = set()
+
+    def __call__(self):
+        FileStorage.objects.filter(id__in=self.storage_ids).update(modified=timezone.now())
+
+
+def schedule_storage_modified_update(storage_ids: Iterable[uuid.UUID]):
+    """Update file storage modification timestamps after the current transaction is committed.
+
+    Storages changed in the same transaction are updated with a single query, so
+    concurrent file writes don't hold locks on the storage rows during the transaction.
+    """
+    on_commit_coalesced(
+        FileStorageModifiedUpdate, lambda callback: callback.storage_ids.update(storage_ids)
+    )
@@ -17,6 +17,7 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.settings import api_settings
 
+from apps.common.bulk import copy_upsert
 from apps.common.exceptions import ResourceLocked
 from apps.common.helpers import get_technical_metax_user
 from apps.common.locks import select_queryset_for_update
@@ -541,22 +542,26 @@ class FileBulkSerializer(serializers.ListSerializer):
             for file in files
             if file.characteristics and getattr(file.characteristics, "_changed", False)
         ]
-        FileCharacteristics.objects.bulk_create(
-            changed_characteristics,
-            batch_size=5000,
-            update_conflicts=True,  # Update characteristics that already exist
-            unique_fields=["id"],
-            update_fields=characteristics_fields,
-        )
-
         being_created = {f.id for f in files if f._state.adding}
-        files = File.objects.bulk_create(
-            files,
-            batch_size=5000,
-            update_conflicts=True,  # Update files that already exist
-            unique_fields=["id"],
-            update_fields=fields_to_update,
-        )
+        if settings.ENABLE_FILE_BULK_COPY:
+            # Stream rows with COPY and merge them with a single statement per model
+            copy_upsert(changed_characteristics, update_fields=characteristics_fields)
+            files = copy_upsert(files, update_fields=fields_to_update)
+        else:
+            FileCharacteristics.objects.bulk_create(
+                changed_characteristics,
+                batch_size=5000,
+                update_conflicts=True,  # Update characteristics that already exist
+                unique_fields=["id"],
+                update_fields=characteristics_fields,
+            )
+            files = File.objects.bulk_create(
+                files,
+                batch_size=5000,
+                update_conflicts=True,  # Update files that already exist
+                unique_fields=["id"],
+                update_fields=fields_to_update,
+            )
         # Related objects need to be fetched again from DB after save
         prefetch_related_objects(
             files,
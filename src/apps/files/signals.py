@@ -7,13 +7,13 @@ import requests
 import urllib3
 from django.conf import settings
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db.models.signals import m2m_changed, post_delete, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.utils import timezone
 from django.dispatch import Signal, receiver
 from rest_framework import exceptions, status
 
 from apps.files.models import File
-from apps.files.models.file_storage import FileStorage
+from apps.files.models.file_storage import FileStorage, schedule_storage_modified_update
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +85,12 @@ def handle_sync_files(sender, actions: List[dict], **kwargs):
     File.all_objects.bulk_update(files_with_new_legacy_ids, fields=["legacy_id"], batch_size=2000)
 
 
+@receiver(post_save, sender=File)
+def handle_file_saved(sender, instance, **kwargs):
+    # Update storage modification timestamp, bulk operations update it separately
+    schedule_storage_modified_update([instance.storage_id])
+
+
 @receiver(pre_files_deleted, sender=File)
 def handle_files_deleted(sender, queryset, **kwargs):
     # Update storage modification timestamps
@@ -15,7 +15,7 @@ from rest_framework.response import Response
 
 from apps.common.helpers import cachalot_toggle, get_attr_or_item
 from apps.common.serializers.fields import CommaSeparatedListField
-from apps.common.views import CommonViewSet
+from apps.common.views import CommonViewSet, ETagMixin
 from apps.files.functions import SplitPart
 from apps.files.helpers import (
     get_directory_metadata_model,
@@ -123,7 +123,7 @@ class DirectoryQueryParams(DirectoryCommonQueryParams):
         return value
 
 
-class DirectoryViewSet(CommonViewSet, AccessViewSetMixin, viewsets.ViewSet):
+class DirectoryViewSet(ETagMixin, CommonViewSet, AccessViewSetMixin, viewsets.ViewSet):
     """API for browsing directories of a storage project.
 
     Directories are transient and do not have a model of their own.
@@ -362,10 +362,38 @@ class DirectoryViewSet(CommonViewSet, AccessViewSetMixin, viewsets.ViewSet):
                 metadata["directory_metadata"] = directory_metadata
         return metadata
 
+    def get_directory_etag(self, params) -> str:
+        """Return ETag for directory content.
+
+        Computed from the file storage modification timestamp, which is updated
+        whenever files in the storage change, so files don't need to be scanned.
+        When listing dataset directories, the dataset modification timestamp
+        covers changes to dataset files and metadata.
+        """
+        storage_modified = (
+            FileStorage.objects.filter(id=params["storage_id"])
+            .values_list("modified", flat=True)
+            .first()
+        )
+        dataset_modified = None
+        if dataset := params.get("dataset"):
+            from apps.core.models import Dataset
+
+            dataset_modified = (
+                Dataset.all_objects.filter(id=dataset)
+                .values_list("record_modified", flat=True)
+                .first()
+            )
+        return self.get_etag(storage_modified, dataset_modified)
+
     @swagger_auto_schema(responses={200: DirectorySerializer})
     def list(self, request, *args, **kwargs):
         """Directory content view."""
         params = self.query_params
+        etag = self.get_directory_etag(params)
+        if not_modified := self.get_not_modified_response(etag):
+            return not_modified
+
         with cachalot_toggle(enabled=params["pagination"]):
             directories = self.get_directories(params)
             parent_data = {}
@@ -422,4 +450,4 @@ class DirectoryViewSet(CommonViewSet, AccessViewSetMixin, viewsets.ViewSet):
                 and not directories.exists()
             ):
                 del results["directory"]
-            return Response({**pagination_data, **results})
+            return Response({**pagination_data, **results}, headers={"ETag": etag})
@@ -4,16 +4,19 @@
 #
 # :author: CSC - IT Center for Science Ltd., Espoo Finland <servicedesk@csc.fi>
 # :license: MIT
+import json
 import logging
-from typing import Dict, Iterable, List, Optional, Set, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from uuid import UUID
 
 from django import forms
 from django.conf import settings
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import DatabaseError, transaction
 from django.db.models import F, Q, QuerySet, Value
 from django.db.models.functions import Concat
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_filters import OrderingFilter, rest_framework as filters
@@ -21,6 +24,8 @@ from drf_yasg.utils import swagger_auto_schema
 from rest_framework import exceptions, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
 
 from apps.common.exceptions import ResourceLocked
 from apps.common.filters import VerboseChoiceFilter
@@ -55,6 +60,8 @@ from apps.files.views.file_pagination import FileOffsetOrCursorPagination
 
 logger = logging.getLogger(__name__)
 
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
 
 class FileCommonFilterset(filters.FilterSet):
     """File attribute specific filters for files."""
@@ -333,6 +340,14 @@ class FileBulkQuerySerializer(serializers.Serializer):
     ignore_errors = serializers.BooleanField(
         default=False, help_text=_("Commit changes and return 200 even if there are errors.")
     )
+    chunk_size = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        help_text=_(
+            "Number of files validated and committed at a time in NDJSON requests. "
+            "Values larger than the default are limited to the default."
+        ),
+    )
 
 
 bulk_response_schemas = {
@@ -518,10 +533,13 @@ class FileViewSet(BaseFileViewSet):
         except DjangoValidationError as e:
             raise serializers.ValidationError(e.messages)  # avoid 500 from invalid uuid
 
-    def bulk_action(self, files, action):
+    def bulk_action(self, action):
+        if self.request.content_type.split(";")[0].strip() == NDJSON_CONTENT_TYPE:
+            return self.stream_bulk_action(action)
+
         ignore_errors = self.query_params["ignore_errors"]
         serializer = FileBulkSerializer(
-            data=files,
+            data=self.request.data,
             action=action,
             ignore_errors=ignore_errors,
             context={"request": self.request},
@@ -541,13 +559,95 @@ class FileViewSet(BaseFileViewSet):
 
         return Response(serializer.data, status=status)
 
+    def stream_bulk_action(self, action) -> StreamingHttpResponse:
+        """Apply bulk action to a NDJSON request and stream the results as NDJSON.
+
+        The request body is read one line at a time and the files are validated and
+        saved in chunks of chunk_size files. The response is streamed after the view
+        returns, i.e. outside the ATOMIC_REQUESTS transaction, so each chunk is
+        committed in its own transaction.
+        """
+        max_chunk_size = settings.FILE_BULK_STREAM_CHUNK_SIZE
+        chunk_size = min(self.query_params.get("chunk_size", max_chunk_size), max_chunk_size)
+        return StreamingHttpResponse(
+            self._stream_bulk_results(
+                action,
+                ignore_errors=self.query_params["ignore_errors"],
+                chunk_size=chunk_size,
+            ),
+            content_type=NDJSON_CONTENT_TYPE,
+        )
+
+    def _iter_ndjson_chunks(self, chunk_size: int) -> Iterator[Tuple[List, List[str]]]:
+        """Yield parsed items and invalid lines from the request body in chunks."""
+        items, invalid_lines = [], []
+        for line in self.request.stream or []:  # stream is None for empty body
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                invalid_lines.append(line.decode(errors="replace"))
+            if len(items) + len(invalid_lines) >= chunk_size:
+                yield items, invalid_lines
+                items, invalid_lines = [], []
+        if items or invalid_lines:
+            yield items, invalid_lines
+
+    def _stream_bulk_results(self, action, ignore_errors: bool, chunk_size: int) -> Iterator[str]:
+        """Save files one chunk at a time, yielding success and failed objects as lines.
+
+        Without ignore_errors, nothing is saved from a chunk with failed objects and the
+        remaining chunks are not processed. Previous chunks stay committed. Errors that
+        fail the whole chunk, e.g. locked files or database errors, are reported as
+        the last line.
+        """
+
+        def to_line(value) -> str:
+            return json.dumps(value, cls=JSONEncoder) + "\n"
+
+        for items, invalid_lines in self._iter_ndjson_chunks(chunk_size):
+            serializer = FileBulkSerializer(
+                data=items,
+                action=action,
+                ignore_errors=ignore_errors,
+                context={"request": self.request},
+            )
+            for line in invalid_lines:
+                serializer.fail(
+                    object=line, errors={api_settings.NON_FIELD_ERRORS_KEY: _("Invalid JSON.")}
+                )
+            try:
+                with transaction.atomic():
+                    serializer.is_valid(raise_exception=True)
+                    serializer.save()
+                    if serializer.instance:
+                        sync_files.send(sender=File, actions=serializer.instance)
+            except exceptions.APIException as err:
+                # Status code is already sent, report error as the last line
+                detail = err.detail if isinstance(err.detail, dict) else {"detail": err.detail}
+                yield to_line({"errors": detail})
+                return
+            except DatabaseError:
+                # Chunk was rolled back, previous chunks stay committed
+                logger.exception("Saving NDJSON bulk file chunk failed")
+                yield to_line({"errors": {"detail": _("Saving files failed.")}})
+                return
+
+            data = serializer.data
+            for value in [*data["success"], *data["failed"]]:
+                yield to_line(value)
+            if data["failed"] and not ignore_errors:
+                return
+
     @swagger_auto_schema(
         request_body=FileBulkSerializer(action=BulkAction.INSERT),
         responses=bulk_response_schemas,
     )
     @action(detail=False, methods=["post"], url_path="post-many")
     def post_many(self, request):
-        return self.bulk_action(request.data, action=BulkAction.INSERT)
+        return self.bulk_action(action=BulkAction.INSERT)
 
     @swagger_auto_schema(
         request_body=FileBulkSerializer(action=BulkAction.UPDATE),
@@ -555,7 +655,7 @@ class FileViewSet(BaseFileViewSet):
     )
     @action(detail=False, methods=["post"], url_path="patch-many")
     def patch_many(self, request):
-        return self.bulk_action(request.data, action=BulkAction.UPDATE)
+        return self.bulk_action(action=BulkAction.UPDATE)
 
     @swagger_auto_schema(
         request_body=FileBulkSerializer(action=BulkAction.UPSERT),
@@ -563,7 +663,7 @@ class FileViewSet(BaseFileViewSet):
     )
     @action(detail=False, methods=["post"], url_path="put-many")
     def put_many(self, request):
-        return self.bulk_action(request.data, action=BulkAction.UPSERT)
+        return self.bulk_action(action=BulkAction.UPSERT)
 
     @swagger_auto_schema(
         request_body=FileBulkSerializer(action=BulkAction.DELETE),
@@ -571,7 +671,7 @@ class FileViewSet(BaseFileViewSet):
     )
     @action(detail=False, methods=["post"], url_path="delete-many")
     def delete_many(self, request):
-        return self.bulk_action(request.data, action=BulkAction.DELETE)
+        return self.bulk_action(action=BulkAction.DELETE)
 
     @swagger_auto_schema(
         operation_id="v3_files_delete_list",
@@ -1,9 +1,9 @@
 from django.utils.translation import gettext as _
 
-from apps.common.serializers.serializers import CommonModelSerializer
+from apps.common.serializers.serializers import CommonModelSerializer, RepresentationMemoMixin
 
 
-class BaseRefdataSerializer(CommonModelSerializer):
+class BaseRefdataSerializer(RepresentationMemoMixin, CommonModelSerializer):
     omit_related = False
 
     def get_fields(self):
@@ -19,10 +19,14 @@ class BaseRefdataSerializer(CommonModelSerializer):
     def to_representation(self, instance):
         rep = super().to_representation(instance)
         if len(rep["pref_label"].keys()) > 4:
-            rep["pref_label"] = {
-                key: rep["pref_label"][key]
-                for key in ["fi", "en", "sv", "und"]
-                if key in rep["pref_label"].keys()
+            # Copy to avoid modifying a memoized representation
+            rep = {
+                **rep,
+                "pref_label": {
+                    key: rep["pref_label"][key]
+                    for key in ["fi", "en", "sv", "und"]
+                    if key in rep["pref_label"].keys()
+                },
             }
         return rep
 
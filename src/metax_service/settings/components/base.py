@@ -262,6 +262,14 @@ REST_FRAMEWORK = {
     "DATETIME_FORMAT": "%Y-%m-%dT%H:%M:%SZ",
 }
 ENABLE_DRF_TOKEN_AUTH = env.bool("ENABLE_DRF_TOKEN_AUTH", False)
+# Use compiled field accessors instead of DRF field traversal when serializing datasets for GET
+ENABLE_COMPILED_DATASET_SERIALIZER = env.bool("ENABLE_COMPILED_DATASET_SERIALIZER", False)
+# Use DatasetSearchVector instead of watson search entries for dataset ?search=
+ENABLE_DATASET_SEARCH_VECTOR = env.bool("ENABLE_DATASET_SEARCH_VECTOR", False)
+# Update dataset facet index entries in a background task after commit
+ENABLE_DATASET_INDEX_DEFERRED_UPDATE = env.bool("ENABLE_DATASET_INDEX_DEFERRED_UPDATE", False)
+# Count dataset aggregates from in-memory facet index snapshot instead of SQL
+ENABLE_FACET_ENGINE = env.bool("ENABLE_FACET_ENGINE", False)
 if ENABLE_DRF_TOKEN_AUTH:
     INSTALLED_APPS = INSTALLED_APPS + ["rest_framework.authtoken"]
     AUTH_CLASSES = REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"]
@@ -329,6 +337,11 @@ STORAGE_SERVICE_FILE_STORAGES = {
 # Time in seconds before File select for update times out
 FILE_LOCK_TIMEOUT = env.int("FILE_LOCK_TIMEOUT", 15)
 
+# Default and maximum number of files committed at a time in NDJSON bulk file requests
+FILE_BULK_STREAM_CHUNK_SIZE = env.int("FILE_BULK_STREAM_CHUNK_SIZE", 10000)
+# Write files in bulk file requests with COPY and a merge statement instead of bulk_create
+ENABLE_FILE_BULK_COPY = env.bool("ENABLE_FILE_BULK_COPY", False)
+
 # User groups that can see all projects in storage service
 PROJECT_STORAGE_SERVICE_USER_GROUPS = {"ida", "pas"}
 
@@ -4,7 +4,13 @@ from metax_service.settings.components.base import env
 
 ENABLE_MEMCACHED = env.bool("ENABLE_MEMCACHED", False)
 CACHALOT_DATABASES = ["default"]  # Only use cache for the default connection
-CACHALOT_UNCACHABLE_TABLES = {"django_migrations", "core_v2syncstatus"}
+# Tables written by database triggers are not seen by cachalot and must not be cached
+CACHALOT_UNCACHABLE_TABLES = {
+    "django_migrations",
+    "core_v2syncstatus",
+    "actors_organizationancestor",
+    "core_datasetspatialextent",
+}
 CACHALOT_TIMEOUT = env.int("CACHALOT_TIMEOUT", 7200)  # Cachalot cache entry TTL in seconds
 MEMCACHED_HOST = env.str("MEMCACHED_HOST", "localhost")
 MEMCACHED_PORT = env.str("MEMCACHED_PORT", "11211")
@@ -34,6 +40,31 @@ else:
 
 ENABLE_DATASET_CACHE = env.bool("ENABLE_DATASET_CACHE", False)
 DEBUG_DATASET_CACHE = env.bool("DEBUG_DATASET_CACHE", False)  # Log cache info
+# Serialize datasets to cache in a background task after they are created or updated
+ENABLE_DATASET_CACHE_EAGER_UPDATE = env.bool("ENABLE_DATASET_CACHE_EAGER_UPDATE", False)
+
+# Cache list responses of published datasets for anonymous users in the default cache
+ENABLE_DATASET_LIST_RESPONSE_CACHE = env.bool("ENABLE_DATASET_LIST_RESPONSE_CACHE", False)
+DATASET_LIST_RESPONSE_CACHE_TIMEOUT = env.int("DATASET_LIST_RESPONSE_CACHE_TIMEOUT", 300)
+
+# Cache dataset aggregates for anonymous users and precompute the default aggregates
+ENABLE_DATASET_AGGREGATES_CACHE = env.bool("ENABLE_DATASET_AGGREGATES_CACHE", False)
+DATASET_AGGREGATES_CACHE_TIMEOUT = env.int("DATASET_AGGREGATES_CACHE_TIMEOUT", 300)
+
+# Cache exact dataset list counts for this many seconds per user and filters, 0 disables
+DATASET_LIST_COUNT_CACHE_TIMEOUT = env.int("DATASET_LIST_COUNT_CACHE_TIMEOUT", 0)
+# Use query planner estimate as dataset list count when it is at least this large, 0 disables
+DATASET_LIST_COUNT_ESTIMATE_THRESHOLD = env.int("DATASET_LIST_COUNT_ESTIMATE_THRESHOLD", 0)
+
+# Per-process LRU cache in front of the serialized_datasets cache, disabled when 0
+DATASET_CACHE_LOCAL_MAX_ENTRIES = env.int("DATASET_CACHE_LOCAL_MAX_ENTRIES", 0)
+DATASET_CACHE_LOCAL_MAX_BYTES = env.int("DATASET_CACHE_LOCAL_MAX_BYTES", 64 * 1024 * 1024)
+
+# Cached datasets larger than DATASET_CACHE_COMPRESS_MIN_SIZE bytes are compressed and
+# datasets still larger than DATASET_CACHE_MAX_ITEM_SIZE are split into multiple cache values.
+# The memcached item size limit is 1 MiB by default, including key and item overhead.
+DATASET_CACHE_COMPRESS_MIN_SIZE = env.int("DATASET_CACHE_COMPRESS_MIN_SIZE", 1024)
+DATASET_CACHE_MAX_ITEM_SIZE = env.int("DATASET_CACHE_MAX_ITEM_SIZE", 1000 * 1000)
 
 if ENABLE_DATASET_CACHE:
     if ENABLE_MEMCACHED:
@@ -4,6 +4,7 @@ import pytest
 from django.db import IntegrityError
 
 from apps.actors.factories import OrganizationFactory
+from apps.actors.models import Organization, OrganizationAncestor
 
 pytestmark = [pytest.mark.django_db]
 
@@ -33,3 +34,35 @@ def test_create_duplicate_organization_code():
 def test_create_organization_without_scheme():
     with pytest.raises(IntegrityError):
         OrganizationFactory.create(in_scheme="")
+
+
+def get_ancestors(organization):
+    return {
+        (link.ancestor_id, link.depth)
+        for link in OrganizationAncestor.objects.filter(descendant=organization)
+    }
+
+
+def test_organization_ancestors():
+    main = OrganizationFactory.create()
+    sub = OrganizationFactory.create(parent=main)
+    subsub = OrganizationFactory.create(parent=sub)
+    assert get_ancestors(main) == {(main.id, 0)}
+    assert get_ancestors(subsub) == {(subsub.id, 0), (sub.id, 1), (main.id, 2)}
+
+    # Moving an organization updates its descendants
+    other = OrganizationFactory.create()
+    sub.parent = other
+    sub.save()
+    assert get_ancestors(subsub) == {(subsub.id, 0), (sub.id, 1), (other.id, 2)}
+
+    sub.parent = None
+    sub.save()
+    assert get_ancestors(subsub) == {(subsub.id, 0), (sub.id, 1)}
+
+
+def test_organization_ancestors_bulk_create():
+    main = Organization(pref_label={"en": "main"}, is_reference_data=False)
+    sub = Organization(pref_label={"en": "sub"}, is_reference_data=False, parent=main)
+    Organization.all_objects.bulk_create([sub, main])  # Children before parents
+    assert get_ancestors(sub) == {(sub.id, 0), (main.id, 1)}
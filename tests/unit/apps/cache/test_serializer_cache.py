@@ -0,0 +1,222 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+import pytest
+
+from apps.cache import encoding
+from apps.cache.serializer_cache import CacheWriteStats, LocalLRUCache, SerializerCacheBase
+
+now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class Instance:
+    id: UUID
+    modified: datetime
+
+
+class ExampleCache(SerializerCacheBase):
+    cache_name = "serialized_datasets"
+    cached_fields = {"id", "title"}
+    modified_attr = "modified"
+
+    @classmethod
+    def get_local_cache_limits(cls):
+        return 3, 10000
+
+
+@pytest.fixture(autouse=True)
+def clear_local_caches():
+    SerializerCacheBase._local_caches.clear()
+    yield
+    SerializerCacheBase._local_caches.clear()
+
+
+def test_local_lru_cache_max_entries():
+    cache = LocalLRUCache(max_entries=2, max_bytes=1000)
+    cache.set("a", {"value": "a"}, 10)
+    cache.set("b", {"value": "b"}, 10)
+    assert cache.get_many(["a"]) == {"a": {"value": "a"}}  # Mark "a" as recently used
+    cache.set("c", {"value": "c"}, 10)
+    assert cache.get_many(["a", "b", "c"]) == {"a": {"value": "a"}, "c": {"value": "c"}}
+    assert cache.size == 20
+
+
+def test_local_lru_cache_max_bytes():
+    cache = LocalLRUCache(max_entries=10, max_bytes=100)
+    cache.set("a", {"value": "a"}, 40)
+    cache.set("b", {"value": "b"}, 40)
+    cache.set("c", {"value": "c"}, 40)
+    assert set(cache.get_many(["a", "b", "c"])) == {"b", "c"}
+    assert cache.size == 80
+
+    # Too large values are not cached
+    cache.set("d", {"value": "d"}, 101)
+    assert cache.get_many(["d"]) == {}
+
+    # Replacing a value updates size
+    cache.set("b", {"value": "b"}, 10)
+    assert cache.size == 50
+    cache.delete("b")
+    assert cache.size == 40
+    cache.clear()
+    assert cache.size == 0
+    assert len(cache) == 0
+
+
+def test_serializer_cache_local_tier(dataset_cache):
+    instance = Instance(id=uuid4(), modified=now)
+    cache = ExampleCache([instance])
+    assert cache.stats["local"].misses == 1
+    assert cache.stats["source"].misses == 1
+
+    cache.set_value(instance, {"id": instance.id, "title": "hello", "other": "x"})
+    assert ExampleCache.get_source_entries([instance.id])[instance.id][0]["title"] == "hello"
+
+    # Value is found from the local tier, source is not used
+    dataset_cache.clear()
+    cache = ExampleCache([instance])
+    assert cache.get_value(instance) == {"id": instance.id, "title": "hello", "_modified": now}
+    assert cache.stats["local"].hits == 1
+    assert cache.stats["source"].hits == 0
+    assert cache.stats["source"].misses == 0
+
+    # Local tier value is ignored when the instance has been modified
+    instance.modified = now + timedelta(seconds=1)
+    cache = ExampleCache([instance])
+    assert cache.get_value(instance) is None
+    assert cache.stats["local"].misses == 1
+    assert cache.stats["source"].misses == 1
+
+
+def test_serializer_cache_local_tier_filled_from_source(dataset_cache):
+    instance = Instance(id=uuid4(), modified=now)
+    ExampleCache.set_source_entries(
+        {instance.id: {"id": instance.id, "title": "from source", "_modified": now}}
+    )
+
+    cache = ExampleCache([instance])
+    assert cache.get_value(instance)["title"] == "from source"
+    assert cache.stats["source"].hits == 1
+
+    dataset_cache.clear()
+    cache = ExampleCache([instance])
+    assert cache.get_value(instance)["title"] == "from source"
+    assert cache.stats["local"].hits == 1
+
+
+def test_serializer_cache_local_tier_disabled(dataset_cache):
+    class NoLocalCache(ExampleCache):
+        @classmethod
+        def get_local_cache_limits(cls):
+            return 0, 0
+
+    instance = Instance(id=uuid4(), modified=now)
+    cache = NoLocalCache([instance])
+    cache.set_value(instance, {"id": instance.id, "title": "hello"})
+    assert NoLocalCache.get_local_cache() is None
+
+    dataset_cache.clear()
+    cache = NoLocalCache([instance])
+    assert cache.get_value(instance) is None
+    assert cache.stats["local"].misses == 0
+    assert cache.stats["source"].misses == 1
+
+
+class CompressedCache(ExampleCache):
+    @classmethod
+    def get_local_cache_limits(cls):
+        return 0, 0
+
+    @classmethod
+    def get_compress_min_size(cls):
+        return 100
+
+    @classmethod
+    def get_max_item_size(cls):
+        return 1000
+
+
+def test_encoding_roundtrip():
+    value = {"title": "a" * 1000}
+    data, pickled_size = encoding.encode(value, compress_min_size=100)
+    assert data[:1] in (encoding.ZLIB, encoding.ZSTD)
+    assert len(data) < pickled_size
+    assert encoding.decode(data) == (value, pickled_size)
+
+    # Small values are not compressed
+    data, pickled_size = encoding.encode({"title": "a"}, compress_min_size=100)
+    assert data[:1] == encoding.PICKLE
+    assert encoding.decode(data) == ({"title": "a"}, pickled_size)
+
+    with pytest.raises(encoding.DecodeError):
+        encoding.decode(b"xinvalid")
+
+
+def test_serializer_cache_compressed(dataset_cache):
+    instance = Instance(id=uuid4(), modified=now)
+    cache = CompressedCache([instance])
+    value = {"id": instance.id, "title": "hello " * 100}
+    cache.set_value(instance, value)
+    assert cache.write_stats.entries == 1
+    assert cache.write_stats.sharded == 0
+    assert cache.write_stats.compression_ratio > 2
+    assert len(dataset_cache.get(instance.id)) < 200
+
+    cache = CompressedCache([instance])
+    assert cache.get_value(instance) == {**value, "_modified": now}
+
+
+def test_serializer_cache_sharded(dataset_cache):
+    instance = Instance(id=uuid4(), modified=now)
+    cache = CompressedCache([instance])
+    value = {"id": instance.id, "title": "".join(uuid4().hex for _ in range(200))}
+    cache.set_value(instance, value)
+    assert cache.write_stats.sharded == 1
+    assert len(dataset_cache._cache) > 3
+
+    cache = CompressedCache([instance])
+    assert cache.get_value(instance) == {**value, "_modified": now}
+
+    # Shards are not fetched for outdated entries
+    instance.modified = now + timedelta(seconds=1)
+    assert CompressedCache([instance]).get_value(instance) is None
+
+    # Missing shards cause a cache miss
+    instance.modified = now
+    dataset_cache.clear()
+    stats = CacheWriteStats()
+    values = CompressedCache.encode_source_entries(
+        {instance.id: {**value, "_modified": now}}, stats=stats
+    )
+    assert stats.sharded == 1
+    dataset_cache.set(instance.id, values[instance.id])  # Only manifest is written
+    assert CompressedCache([instance]).get_value(instance) is None
+
+
+def test_serializer_cache_legacy_value(dataset_cache):
+    instance = Instance(id=uuid4(), modified=now)
+    dataset_cache.set(instance.id, {"id": instance.id, "title": "legacy", "_modified": now})
+    cache = CompressedCache([instance])
+    assert cache.get_value(instance)["title"] == "legacy"
+
+
+def test_serializer_cache_value_not_copied(dataset_cache):
+    instance = Instance(id=uuid4(), modified=now)
+    cache = ExampleCache([instance], autocommit=False)
+    title = {"en": "hello"}
+    cache.set_value(instance, {"id": instance.id, "title": title})
+
+    # Value is not copied and a read-only view is returned
+    value = cache.get_value(instance)
+    assert value["title"] is title
+    with pytest.raises(TypeError):
+        value["title"] = {"en": "modified"}
+
+    # Commit uses data pickled in set_value
+    title["en"] = "modified after set_value"
+    cache.commit_changed_to_source()
+    entry = ExampleCache.get_source_entries([instance.id])[instance.id][0]
+    assert entry["title"] == {"en": "hello"}
+    assert cache.pickled == {}
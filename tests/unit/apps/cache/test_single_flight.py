@@ -0,0 +1,53 @@
+import threading
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from apps.cache import single_flight
+
+
+def test_single_flight_cached_value():
+    cache = LocMemCache("single-flight-cached", {})
+    assert single_flight.get_or_compute(cache, "key", lambda: "value") == "value"
+    assert single_flight.get_or_compute(cache, "key", lambda: "other") == "value"
+    assert cache.get("key:lock") is None
+
+
+def test_single_flight_concurrent():
+    cache = LocMemCache("single-flight-concurrent", {})
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    leader = threading.Thread(
+        target=lambda: results.append(single_flight.get_or_compute(cache, "key", compute))
+    )
+    leader.start()
+    started.wait(5)
+    followers = [
+        threading.Thread(
+            target=lambda: results.append(single_flight.get_or_compute(cache, "key", compute))
+        )
+        for _ in range(3)
+    ]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert results == ["value"] * 4
+    assert len(calls) == 1
+
+
+def test_single_flight_wait_timeout():
+    cache = LocMemCache("single-flight-timeout", {})
+    cache.add("key:lock", True)  # Computation by a process that never finishes
+    value = single_flight.get_or_compute(cache, "key", lambda: "value", wait_timeout=0)
+    assert value == "value"
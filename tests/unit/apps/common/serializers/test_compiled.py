@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from rest_framework import serializers
+
+from apps.common.serializers.compiled import compiled_to_representation
+
+
+@dataclass
+class Nested:
+    value: int
+
+
+@dataclass
+class Instance:
+    name: str
+    nested: Optional[Nested]
+
+    def upper_name(self):
+        return self.name.upper()
+
+    @property
+    def missing(self):
+        raise AttributeError("missing")
+
+
+class ExampleSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    upper_name = serializers.CharField()
+    nested_value = serializers.IntegerField(source="nested.value", default=0)
+    missing = serializers.CharField(required=False)
+    missing_default = serializers.CharField(source="missing", default="default")
+    whole = serializers.SerializerMethodField()
+    write_only = serializers.CharField(write_only=True)
+
+    def get_whole(self, instance):
+        return f"whole {instance['name'] if isinstance(instance, dict) else instance.name}"
+
+
+def test_compiled_to_representation():
+    serializer = ExampleSerializer()
+    instances = [
+        Instance(name="test", nested=Nested(value=1)),
+        Instance(name="test", nested=None),
+        {"name": "dict", "upper_name": "DICT", "nested": {"value": 2}},
+    ]
+    for instance in instances:
+        expected = serializer.to_representation(instance)
+        assert compiled_to_representation(serializer, instance) == expected
+    assert compiled_to_representation(serializer, instances[0]) == {
+        "name": "test",
+        "upper_name": "TEST",
+        "nested_value": 1,
+        "missing_default": "default",
+        "whole": "whole test",
+    }
+
+
+class ConstantField(serializers.Field):
+    def get_attribute(self, instance):
+        return "constant"
+
+    def to_representation(self, value):
+        return value
+
+
+class OverriddenAttributeSerializer(serializers.Serializer):
+    name = ConstantField()
+
+
+def test_compiled_to_representation_overridden_get_attribute():
+    serializer = OverriddenAttributeSerializer()
+    instance = Instance(name="test", nested=None)
+    assert compiled_to_representation(serializer, instance) == {"name": "constant"}
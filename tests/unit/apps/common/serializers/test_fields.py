@@ -102,3 +102,13 @@ def test_handle_private_emails():
         "emal": "<hidden>",
         "more": [{"here": "<hidden>"}],
     }
+
+
+def test_handle_private_emails_nested_values_not_modified():
+    value = PrivateEmailValue("teppo@example.com")
+    nested = [{"here": value}, {"other": "value"}]
+    data = {"more": nested}
+    handle_private_emails(data, show_emails=False)
+    assert data == {"more": [{"here": "<hidden>"}, {"other": "value"}]}
+    assert nested == [{"here": value}, {"other": "value"}]
+    assert data["more"][1] is nested[1]  # Unchanged values are not copied
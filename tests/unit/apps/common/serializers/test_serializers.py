@@ -269,3 +269,45 @@ def test_nested_serializer_self_source():
     assert dataset.title == {"en": "updated dataset title"}
     assert dataset.access_rights.description == {"en": "updated access rights description"}
     assert list(dataset.spatial.values_list("geographic_name", flat=True)) == ["Updated location"]
+
+
+def test_representation_memo(mocker):
+    from apps.core.models.concepts import Language
+
+    language = Language(
+        url="https://example.com/language",
+        in_scheme="https://example.com",
+        pref_label={"en": "Language"},
+    )
+    serializer = Language.get_serializer_class()(context={"representation_memo": {}})
+    spy = mocker.spy(CommonModelSerializer, "to_representation")
+    rep = serializer.to_representation(language)
+    assert serializer.to_representation(language) is rep
+    assert spy.call_count == 1
+
+    # Context values affecting the representation are included in the memo key
+    serializer.context["include_nulls"] = True
+    assert serializer.to_representation(language) is not rep
+    assert spy.call_count == 2
+
+    # Without memo, instance is serialized every time
+    serializer = Language.get_serializer_class()()
+    assert serializer.to_representation(language) is not serializer.to_representation(language)
+
+
+def test_representation_memo_context_flags():
+    from apps.actors.models import Organization
+    from apps.core.serializers.dataset_actor_serializers.organization_serializer import (
+        DatasetOrganizationSerializer,
+    )
+
+    organization = Organization(pref_label={"en": "Org"}, email="org@example.com")
+    context = {"representation_memo": {}, "include_nulls": True}
+    serializer = DatasetOrganizationSerializer(context=context)
+    rep = serializer.to_representation(organization)
+    assert context["has_emails"] is True
+
+    # Flags set during serialization are set also when reusing the representation
+    del context["has_emails"]
+    assert serializer.to_representation(organization) is rep
+    assert context["has_emails"] is True
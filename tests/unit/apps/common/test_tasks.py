@@ -0,0 +1,47 @@
+import pytest
+from django.db import transaction
+
+from apps.common.tasks import on_commit_coalesced
+
+
+class CollectValues:
+    calls = []
+
+    def __init__(self):
+        self.values = set()
+
+    def __call__(self):
+        self.calls.append(self.values)
+
+
+@pytest.fixture
+def calls():
+    CollectValues.calls = []
+    return CollectValues.calls
+
+
+@pytest.mark.django_db(transaction=True)
+def test_on_commit_coalesced(calls):
+    """Test that changes in the same transaction are combined into one callback."""
+    with transaction.atomic():
+        on_commit_coalesced(CollectValues, lambda callback: callback.values.add(1))
+        on_commit_coalesced(CollectValues, lambda callback: callback.values.add(2))
+        assert calls == []
+    assert calls == [{1, 2}]
+
+    # Outside transaction the callback is run immediately
+    on_commit_coalesced(CollectValues, lambda callback: callback.values.add(3))
+    assert calls == [{1, 2}, {3}]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_on_commit_coalesced_rollback(calls):
+    """Test that callbacks from a rolled back transaction are not reused."""
+    with pytest.raises(ValueError):
+        with transaction.atomic():
+            on_commit_coalesced(CollectValues, lambda callback: callback.values.add(1))
+            raise ValueError()
+
+    with transaction.atomic():
+        on_commit_coalesced(CollectValues, lambda callback: callback.values.add(2))
+    assert calls == [{2}]
@@ -4,7 +4,8 @@ from unittest.mock import ANY
 
 import pytest
 from django.contrib.auth.models import Group
-from django.db import connections, transaction, utils
+from django.db import connection, connections, transaction, utils
+from django.test.utils import CaptureQueriesContext
 from psycopg.errors import LockNotAvailable
 from rest_framework.reverse import reverse
 from tests.utils import assert_nested_subdict, matchers
@@ -158,6 +159,22 @@ def test_list_datasets_fields_param(admin_client, dataset_a, dataset_b):
     }
 
 
+def test_list_datasets_fields_param_prefetch(admin_client, dataset_a, dataset_b):
+    with CaptureQueriesContext(connection) as all_fields:
+        res = admin_client.get(reverse("dataset-list"))
+        assert res.status_code == 200
+
+    # Relations not needed for requested fields are not prefetched
+    with CaptureQueriesContext(connection) as some_fields:
+        res = admin_client.get(reverse("dataset-list"), {"fields": "id,title,actors"})
+        assert res.status_code == 200
+    assert len(some_fields) < len(all_fields) - 20
+    queries = " ".join(query["sql"] for query in some_fields.captured_queries)
+    assert "core_datasetactor" in queries
+    assert "core_provenance" not in queries
+    assert res.data["results"][0].keys() == {"id", "title", "actors"}
+
+
 def test_list_datasets_faulty_fields_param(admin_client, dataset_a, dataset_b):
     res = admin_client.get(reverse("dataset-list"), {"fields": "id,foo,bar,created"})
     assert res.status_code == 400
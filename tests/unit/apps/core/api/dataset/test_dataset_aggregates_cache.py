@@ -0,0 +1,103 @@
+import pytest
+from django.core.cache import caches
+
+from apps.core.views import dataset_view
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.dataset,
+    pytest.mark.usefixtures("data_catalog", "reference_data"),
+]
+
+
+@pytest.fixture
+def aggregates_cache(settings):
+    settings.ENABLE_DATASET_AGGREGATES_CACHE = True
+    settings.CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "dataset-aggregates",
+    }
+    cache = caches["default"]
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture
+def aggregate_spy(mocker):
+    return mocker.patch.object(
+        dataset_view, "aggregate_queryset", wraps=dataset_view.aggregate_queryset
+    )
+
+
+def get_keywords(res):
+    assert res.status_code == 200, res.data
+    return [hit["value"]["en"] for hit in res.data["keyword"]["hits"]]
+
+
+def post_dataset(admin_client, dataset_json, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        res = admin_client.post("/v3/datasets", dataset_json, content_type="application/json")
+    assert res.status_code == 201, res.data
+    return res.data
+
+
+def test_default_aggregates_precomputed(
+    aggregates_cache,
+    aggregate_spy,
+    admin_client,
+    client,
+    dataset_a_json,
+    django_capture_on_commit_callbacks,
+    django_assert_max_num_queries,
+):
+    dataset_a_json["keyword"] = ["cat"]
+    dataset = post_dataset(admin_client, dataset_a_json, django_capture_on_commit_callbacks)
+
+    # Only the watermark is queried
+    with django_assert_max_num_queries(1):
+        assert get_keywords(client.get("/v3/datasets/aggregates?filter_language=en")) == ["cat"]
+        res = client.get("/v3/datasets/aggregates?filter_language=fi&publishing_channels=etsin")
+        assert res.status_code == 200
+    assert aggregate_spy.call_count == 0
+
+    # Aggregates are refreshed after update
+    with django_capture_on_commit_callbacks(execute=True):
+        res = admin_client.patch(
+            f"/v3/datasets/{dataset['id']}", {"keyword": ["dog"]}, content_type="application/json"
+        )
+    assert res.status_code == 200, res.data
+    assert get_keywords(client.get("/v3/datasets/aggregates?filter_language=en")) == ["dog"]
+    assert aggregate_spy.call_count == 0
+
+
+def test_aggregates_cached(
+    aggregates_cache,
+    aggregate_spy,
+    admin_client,
+    client,
+    dataset_a_json,
+    django_capture_on_commit_callbacks,
+):
+    dataset_a_json["keyword"] = ["cat", "dog"]
+    post_dataset(admin_client, dataset_a_json, django_capture_on_commit_callbacks)
+
+    url = "/v3/datasets/aggregates?filter_language=en&keyword_facet_search=ca"
+    assert get_keywords(client.get(url)) == ["cat"]
+    assert get_keywords(client.get(url)) == ["cat"]
+    assert aggregate_spy.call_count == 1
+
+
+def test_aggregates_cache_authenticated(
+    aggregates_cache,
+    aggregate_spy,
+    admin_client,
+    dataset_a_json,
+    django_capture_on_commit_callbacks,
+):
+    dataset_a_json["keyword"] = ["cat"]
+    post_dataset(admin_client, dataset_a_json, django_capture_on_commit_callbacks)
+
+    url = "/v3/datasets/aggregates?filter_language=en"
+    assert get_keywords(admin_client.get(url)) == ["cat"]
+    assert get_keywords(admin_client.get(url)) == ["cat"]
+    assert aggregate_spy.call_count == 2
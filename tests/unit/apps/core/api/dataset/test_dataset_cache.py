@@ -6,18 +6,31 @@ from django.utils import timezone
 from tests.utils import matchers
 
 from apps.common.serializers.fields import PrivateEmailValue
+from apps.core import cache as cache_module
+from apps.core.cache import DatasetSerializerCache
+from apps.core.factories import PublishedDatasetFactory
 
 logger = logging.getLogger(__name__)
 
 pytestmark = [pytest.mark.django_db, pytest.mark.dataset]
 
 
+def get_cached(dataset_id):
+    if entry := DatasetSerializerCache.get_source_entries([dataset_id]).get(dataset_id):
+        return entry[0]
+    return None
+
+
+def set_cached(dataset_id, value):
+    DatasetSerializerCache.set_source_entries({dataset_id: value})
+
+
 @pytest.mark.usefixtures("data_catalog", "reference_data")
 def test_create_dataset_in_cache(dataset_cache, admin_client, dataset_a_json):
     dataset_a_json["actors"][0]["person"] = {"name": "teppo", "email": "teppo@example.com"}
     res = admin_client.post("/v3/datasets", dataset_a_json, content_type="application/json")
     assert res.status_code == 201, res.data
-    cached_item = dataset_cache.get(res.data["id"])
+    cached_item = get_cached(res.data["id"])
     assert cached_item.get("id") == res.data["id"]
     assert cached_item.get("title") == dataset_a_json["title"]
     assert cached_item.get("actors") == [
@@ -66,7 +79,7 @@ def test_update_dataset_in_cache_overwrite_old(dataset_cache, admin_client, data
     )
     assert res.status_code == 200
 
-    cached_item = dataset_cache.get(dataset_id)
+    cached_item = get_cached(dataset_id)
     assert cached_item["title"] == {"en": "new title"}
 
 
@@ -79,9 +92,9 @@ def test_get_cached_dataset(dataset_cache, admin_client, dataset_a_json):
     dataset_id = res.data["id"]
 
     # Modify data stored in cache without altering modification timestamp
-    cached_item = {**dataset_cache.get(dataset_id)}
+    cached_item = {**get_cached(dataset_id)}
     cached_item["title"] = {"en": "title modified in cache"}
-    dataset_cache.set(dataset_id, cached_item)
+    set_cached(dataset_id, cached_item)
 
     # Dataset should use altered data from cache
     res = admin_client.get(f"/v3/datasets/{dataset_id}", content_type="application/json")
@@ -90,7 +103,7 @@ def test_get_cached_dataset(dataset_cache, admin_client, dataset_a_json):
 
     # Alter timestamp in cache
     cached_item["_modified"] += timedelta(seconds=1.234)
-    dataset_cache.set(dataset_id, cached_item)
+    set_cached(dataset_id, cached_item)
 
     # Timestamp in cache no longer matches dataset, cache value should be ignored
     res = admin_client.get(f"/v3/datasets/{dataset_id}", content_type="application/json")
@@ -107,7 +120,7 @@ def test_get_dataset_in_cache_modified(dataset_cache, admin_client, dataset_a_js
     assert res.status_code == 201
     assert res.data["title"] == {"en": "original title"}
     dataset_id = res.data["id"]
-    assert dataset_cache.get(dataset_id)["title"] == {"en": "original title"}
+    assert get_cached(dataset_id)["title"] == {"en": "original title"}
 
     # Get should overwrite cache entry that is newer than the dataset. This solves
     # some potential edge cases compared to not overwriting newer cache data.
@@ -119,26 +132,26 @@ def test_get_dataset_in_cache_modified(dataset_cache, admin_client, dataset_a_js
     # - Dataset transaction fails after the updated version is already in the cache
     #   - Overwrite: Cache contains latest committed data.
     #   - Don't overwrite: Cache will contain stale data until dataset is modified.
-    future_cached_item = dataset_cache.get(dataset_id)
+    future_cached_item = get_cached(dataset_id)
     future_cached_item["title"] = {"en": "future title"}
     future_cached_item["_modified"] = now + timedelta(weeks=10)
-    dataset_cache.set(dataset_id, future_cached_item)
+    set_cached(dataset_id, future_cached_item)
 
     res = admin_client.get(f"/v3/datasets/{dataset_id}", content_type="application/json")
     assert res.status_code == 200
     assert res.data["title"] == {"en": "original title"}
-    assert dataset_cache.get(dataset_id)["title"] == {"en": "original title"}
+    assert get_cached(dataset_id)["title"] == {"en": "original title"}
 
     # Get should overwrite cache entry that is older than the dataset.
-    old_cached_item = dataset_cache.get(dataset_id)
+    old_cached_item = get_cached(dataset_id)
     old_cached_item["title"] = {"en": "old title"}
     old_cached_item["_modified"] = now - timedelta(weeks=10)
-    dataset_cache.set(dataset_id, old_cached_item)
+    set_cached(dataset_id, old_cached_item)
 
     res = admin_client.get(f"/v3/datasets/{dataset_id}", content_type="application/json")
     assert res.status_code == 200
     assert res.data["title"] == {"en": "original title"}
-    assert dataset_cache.get(dataset_id)["title"] == {"en": "original title"}
+    assert get_cached(dataset_id)["title"] == {"en": "original title"}
 
 
 @pytest.mark.usefixtures("data_catalog", "reference_data")
@@ -171,7 +184,7 @@ def test_cache_update_files_on_draft_merge(dataset_cache, admin_client, dataset_
     assert res.status_code == 200, res.data
 
     # Cache for the published dataset should still show the original values
-    cached_item = dataset_cache.get(dataset_id)
+    cached_item = get_cached(dataset_id)
     assert cached_item["title"] == {"en": "Old title"}
     assert cached_item.get("fileset") is None
 
@@ -179,6 +192,41 @@ def test_cache_update_files_on_draft_merge(dataset_cache, admin_client, dataset_
     res = admin_client.post(f"/v3/datasets/{draft_id}/publish", content_type="application/json")
     assert res.status_code == 200, res.data
 
-    cached_item = dataset_cache.get(dataset_id)
+    cached_item = get_cached(dataset_id)
     assert cached_item["title"] == {"en": "Updated title"}
     assert cached_item["fileset"]["total_files_count"] == 8
+
+
+@pytest.mark.usefixtures("data_catalog", "reference_data")
+def test_eager_cache_update(dataset_cache, settings, django_capture_on_commit_callbacks, mocker):
+    settings.ENABLE_DATASET_CACHE_EAGER_UPDATE = True
+    dataset_1 = PublishedDatasetFactory(title={"en": "title 1"})
+    dataset_2 = PublishedDatasetFactory(title={"en": "title 2"})
+    update_dataset_cache = mocker.spy(cache_module, "update_dataset_cache")
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        dataset_1.title = {"en": "new title 1"}
+        dataset_1.save()
+        dataset_1.signal_update()
+        dataset_1.signal_update()
+        dataset_2.signal_update()
+        assert get_cached(dataset_1.id) is None
+
+    # Updates are combined into a single task
+    assert len([c for c in callbacks if isinstance(c, cache_module.DatasetCacheUpdate)]) == 1
+    assert update_dataset_cache.call_count == 1
+    assert set(update_dataset_cache.call_args.kwargs["dataset_ids"]) == {
+        dataset_1.id,
+        dataset_2.id,
+    }
+    assert get_cached(dataset_1.id)["title"] == {"en": "new title 1"}
+    assert get_cached(dataset_2.id)["title"] == {"en": "title 2"}
+
+
+@pytest.mark.usefixtures("data_catalog", "reference_data")
+def test_eager_cache_update_disabled(dataset_cache, django_capture_on_commit_callbacks):
+    dataset = PublishedDatasetFactory()
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        dataset.signal_update()
+    assert len(callbacks) == 0
+    assert get_cached(dataset.id) is None
@@ -0,0 +1,61 @@
+import pytest
+
+from apps.core.factories import PublishedDatasetFactory
+
+pytestmark = [pytest.mark.django_db, pytest.mark.dataset]
+
+
+def get_both(client, settings, url, **kwargs):
+    """Return response content with and without the compiled serializer."""
+    settings.ENABLE_COMPILED_DATASET_SERIALIZER = False
+    res = client.get(url, **kwargs)
+    assert res.status_code == 200
+    settings.ENABLE_COMPILED_DATASET_SERIALIZER = True
+    compiled_res = client.get(url, **kwargs)
+    assert compiled_res.status_code == 200
+    return res.content, compiled_res.content
+
+
+@pytest.fixture
+def maximal_dataset(admin_client, dataset_maximal_json, data_catalog, reference_data):
+    res = admin_client.post("/v3/datasets", dataset_maximal_json, content_type="application/json")
+    assert res.status_code == 201, res.data
+    return res.data
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        "",
+        "?include_nulls=true",
+        "?include_allowed_actions=true&include_metrics=true&include_user_roles=true",
+        "?expand_catalog=true",
+        "?fields=id,title,actors",
+    ],
+)
+def test_compiled_serializer_parity_retrieve(admin_client, settings, maximal_dataset, params):
+    content, compiled_content = get_both(
+        admin_client, settings, f"/v3/datasets/{maximal_dataset['id']}{params}"
+    )
+    assert compiled_content == content
+
+
+def test_compiled_serializer_parity_anonymous(client, settings, maximal_dataset):
+    content, compiled_content = get_both(client, settings, f"/v3/datasets/{maximal_dataset['id']}")
+    assert compiled_content == content
+
+
+@pytest.mark.usefixtures("data_catalog", "reference_data")
+def test_compiled_serializer_parity_list(admin_client, settings, maximal_dataset):
+    PublishedDatasetFactory()
+    content, compiled_content = get_both(
+        admin_client, settings, "/v3/datasets?include_nulls=true&pagination=false"
+    )
+    assert compiled_content == content
+
+
+def test_compiled_serializer_parity_cached(admin_client, settings, dataset_cache, maximal_dataset):
+    content, compiled_content = get_both(
+        admin_client, settings, f"/v3/datasets/{maximal_dataset['id']}"
+    )
+    assert compiled_content == content
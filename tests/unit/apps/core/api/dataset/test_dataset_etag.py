@@ -0,0 +1,90 @@
+import pytest
+
+from apps.core.factories import PublishedDatasetFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.dataset,
+    pytest.mark.usefixtures("data_catalog", "reference_data"),
+]
+
+
+def test_dataset_retrieve_etag(client, django_assert_max_num_queries):
+    dataset = PublishedDatasetFactory()
+    url = f"/v3/datasets/{dataset.id}"
+    res = client.get(url)
+    assert res.status_code == 200
+    etag = res["ETag"]
+
+    # Dataset is not serialized for matching ETag
+    with django_assert_max_num_queries(5):
+        res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+    assert res["ETag"] == etag
+
+    dataset.title = {"en": "new title"}
+    dataset.save()
+    res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res.data["title"] == {"en": "new title"}
+    assert res["ETag"] != etag
+
+
+def test_dataset_retrieve_etag_new_version(admin_client, client):
+    dataset = PublishedDatasetFactory()
+    url = f"/v3/datasets/{dataset.id}"
+    etag = client.get(url)["ETag"]
+
+    res = admin_client.post(f"{url}/new-version", content_type="application/json")
+    assert res.status_code == 201
+    res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert len(res.data["dataset_versions"]) == 2
+
+
+def test_dataset_retrieve_etag_authenticated(admin_client, client):
+    dataset = PublishedDatasetFactory()
+    url = f"/v3/datasets/{dataset.id}"
+    etag = client.get(url)["ETag"]
+
+    # Response for authenticated users depends on permissions, no ETag
+    res = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert not res.has_header("ETag")
+
+
+def test_dataset_list_etag(client, django_capture_on_commit_callbacks):
+    PublishedDatasetFactory()
+    url = "/v3/datasets?state=published&pagination=true"
+    res = client.get(url)
+    assert res.status_code == 200
+    etag = res["ETag"]
+    res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+
+    # List generation is incremented when the transaction is committed
+    with django_capture_on_commit_callbacks(execute=True):
+        PublishedDatasetFactory()
+    res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res.data["count"] == 2
+
+
+def test_dataset_list_etag_authenticated(admin_client, client):
+    PublishedDatasetFactory()
+    url = "/v3/datasets?state=published&pagination=true"
+    etag = client.get(url)["ETag"]
+    res = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert not res.has_header("ETag")
+
+
+def test_dataset_list_etag_query_count(client, django_assert_max_num_queries):
+    PublishedDatasetFactory()
+    url = "/v3/datasets?state=published&pagination=true"
+    etag = client.get(url)["ETag"]
+
+    # Matching list ETag is answered without querying datasets
+    with django_assert_max_num_queries(1):
+        res = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
@@ -0,0 +1,109 @@
+import pytest
+
+from apps.core.facets import facet_engine
+from apps.core.models import Dataset
+from apps.core.views.dataset_aggregation import count_entries_engine, count_entries_sql
+
+pytestmark = [pytest.mark.django_db, pytest.mark.dataset]
+
+keys = [
+    "data_catalog",
+    "access_type",
+    "organization",
+    "creator",
+    "field_of_science",
+    "keyword",
+    "infrastructure",
+    "file_type",
+    "project",
+]
+
+
+@pytest.fixture(autouse=True)
+def facet_engine_settings(settings):
+    settings.ENABLE_FACET_ENGINE = True
+    settings.CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "facet-engine-test",
+    }
+    facet_engine.reset()
+    yield
+    facet_engine.reset()
+
+
+def sorted_counts(counts):
+    return {key: sorted(values) for key, values in counts.items()}
+
+
+def assert_same_counts(dataset_ids, language="en", facet_search_params=None):
+    args = (dataset_ids, language, keys, facet_search_params or {}, 100)
+    engine_counts = count_entries_engine(*args)
+    assert sorted_counts(engine_counts) == sorted_counts(count_entries_sql(*args))
+    return engine_counts
+
+
+@pytest.fixture
+def datasets(
+    admin_client,
+    dataset_a_json,
+    dataset_b_json,
+    data_catalog,
+    reference_data,
+    django_capture_on_commit_callbacks,
+):
+    dataset_a_json["keyword"] = ["cat", "dog"]
+    dataset_b_json["keyword"] = ["dog", "horse"]
+    ids = []
+    for dataset_json in [dataset_a_json, dataset_b_json]:
+        with django_capture_on_commit_callbacks(execute=True):
+            res = admin_client.post("/v3/datasets", dataset_json, content_type="application/json")
+        assert res.status_code == 201, res.data
+        ids.append(res.data["id"])
+    return [Dataset.objects.get(id=id).id for id in ids]
+
+
+def test_facet_engine_counts(datasets):
+    counts = assert_same_counts(datasets)
+    assert sorted(counts["keyword"]) == [("cat", 1), ("dog", 2), ("horse", 1)]
+    assert assert_same_counts(datasets[:1])["keyword"] == [("cat", 1), ("dog", 1)]
+    assert assert_same_counts([]) == {}
+    assert assert_same_counts(datasets, language="fi")
+
+
+def test_facet_engine_search(datasets):
+    counts = assert_same_counts(datasets, facet_search_params={"keyword": "O"})
+    assert counts == {"keyword": [("dog", 2), ("horse", 1)]}
+
+
+def test_facet_engine_limit(datasets):
+    counts = count_entries_engine(datasets, "en", ["keyword"], {}, 1)
+    assert counts == {"keyword": [("dog", 2)]}
+
+
+def test_facet_engine_incremental_update(
+    admin_client, datasets, django_capture_on_commit_callbacks
+):
+    assert_same_counts(datasets)
+    snapshot = facet_engine.get_snapshot()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        res = admin_client.patch(
+            f"/v3/datasets/{datasets[0]}",
+            {"keyword": ["cat", "mouse"]},
+            content_type="application/json",
+        )
+    assert res.status_code == 200, res.data
+
+    counts = assert_same_counts(datasets)
+    assert sorted(counts["keyword"]) == [("cat", 1), ("dog", 1), ("horse", 1), ("mouse", 1)]
+    updated = facet_engine.get_snapshot()
+    assert updated.languages is snapshot.languages  # Arrays were not reloaded
+    assert len(updated.overrides) == 1
+
+
+def test_facet_engine_aggregates(admin_client, datasets):
+    res = admin_client.get("/v3/datasets/aggregates?filter_language=en")
+    assert res.status_code == 200
+    hits = res.data["keyword"]["hits"]
+    assert hits[0] == {"value": {"en": "dog"}, "count": 2}
+    assert len(hits) == 3
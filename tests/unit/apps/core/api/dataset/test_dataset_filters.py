@@ -812,6 +812,39 @@ def test_filter_by_organization_name(admin_client, dataset_a, data_catalog, refe
     assert [d["id"] for d in res.data] == [str(dataset.id)]
 
 
+def test_filter_by_organization_name_any_depth(admin_client, data_catalog, reference_data):
+    org = factories.OrganizationFactory(pref_label={"en": "Toporg"})
+    for _ in range(3):
+        org = factories.OrganizationFactory(parent=org)
+    dataset = factories.DatasetFactory()
+    dataset.actors.set([factories.DatasetActorFactory(organization=org, roles=["creator"])])
+
+    for param in ["actors__organization__pref_label=toporg", "actors__roles__creator=Toporg"]:
+        res = admin_client.get(f"/v3/datasets?{param}&pagination=false")
+        assert [d["id"] for d in res.data] == [str(dataset.id)]
+
+
+def test_filter_by_text_ignores_case(admin_client, data_catalog, reference_data):
+    dataset = factories.DatasetFactory(
+        title={"en": "Growth of 50% Trees", "fi": "Puiden Kasvu"}, keyword=["Forest_Data"]
+    )
+    factories.DatasetProjectFactory(dataset=dataset, title={"en": "Tree Project"})
+    other = factories.DatasetFactory(title={"en": "Growth of 50 trees"}, keyword=["ForestXData"])
+
+    def get_ids(params):
+        res = admin_client.get(f"/v3/datasets?{params}&pagination=false")
+        assert res.status_code == 200, res.data
+        return {d["id"] for d in res.data}
+
+    assert get_ids("title=kasvu") == {str(dataset.id)}
+    assert get_ids("title=50%25 tREES") == {str(dataset.id)}  # % is not a wildcard
+    assert get_ids("title=growth") == {str(dataset.id), str(other.id)}
+    assert get_ids("keyword=forest_") == {str(dataset.id)}  # _ is not a wildcard
+    assert get_ids("keyword=FOREST") == {str(dataset.id), str(other.id)}
+    assert get_ids("projects__title=tree proj") == {str(dataset.id)}
+    assert get_ids("projects__title=tree proj,nothing&keyword=missing") == set()
+
+
 def test_filter_by_id(admin_client, dataset_a, dataset_b, dataset_c):
     dataset_id = str(Dataset.objects.first().id)
 
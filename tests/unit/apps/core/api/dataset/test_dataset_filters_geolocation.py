@@ -1,6 +1,7 @@
 import pytest
 from django.contrib.gis.geos import Point, Polygon
 from apps.core import factories
+from apps.core.models import DatasetSpatialExtent
 
 @pytest.mark.parametrize(
     "distance,geometry,count",
@@ -71,3 +72,23 @@ def test_geolocation_filter_polygon_overlapping(admin_client, geometry, count):
     res = admin_client.get(f"/v3/datasets?geolocation={geometry}")
     assert res.status_code == 200, res.data
     assert res.data["count"] == count
+
+
+def test_geolocation_filter_spatial_extent_updated(admin_client):
+    dataset = factories.DatasetFactory()
+    spatial = factories.SpatialFactory(dataset=dataset, geolocations__geometry=Point(25.0, 60.0))
+    geolocation = factories.GeoLocationFactory(spatial=spatial, geometry=Point(26.0, 61.0))
+    assert DatasetSpatialExtent.objects.get(dataset=dataset).geometry.num_geom == 2
+
+    res = admin_client.get(f"/v3/datasets?geolocation={Point(26.0, 61.0)}")
+    assert res.data["count"] == 1
+
+    # Removed geolocations should not match
+    geolocation.delete()
+    res = admin_client.get(f"/v3/datasets?geolocation={Point(26.0, 61.0)}")
+    assert res.data["count"] == 0
+    res = admin_client.get(f"/v3/datasets?geolocation={Point(25.0, 60.0)}")
+    assert res.data["count"] == 1
+
+    spatial.delete()
+    assert not DatasetSpatialExtent.objects.filter(dataset=dataset).exists()
@@ -1,3 +1,5 @@
+from datetime import date
+
 import pytest
 
 from apps.core import factories
@@ -271,3 +273,28 @@ def test_temporal_filter_with_only_temporal_coverage(admin_client, start_date, e
     res = admin_client.get("/v3/datasets", data=query)
     assert res.status_code == 200, res.data
     assert res.data["count"] == count
+
+
+def test_temporal_filter_multiple_temporals(admin_client):
+    dataset = factories.DatasetFactory(
+        temporal=[
+            factories.TemporalFactory(start_date="2023-01-01", end_date="2023-06-30"),
+            factories.TemporalFactory(start_date="2023-03-01", end_date="2023-12-31"),
+            factories.TemporalFactory(start_date="2025-01-01", end_date=None),
+        ]
+    )
+    # Ranges are stored in canonical form with exclusive upper bound
+    assert {(t.date_range.lower, t.date_range.upper) for t in dataset.temporal.all()} == {
+        (date(2023, 1, 1), date(2023, 7, 1)),
+        (date(2023, 3, 1), date(2024, 1, 1)),
+        (date(2025, 1, 1), None),
+    }
+
+    # Dataset is returned once even if multiple temporals match
+    res = admin_client.get("/v3/datasets?temporal__start_date=2023-04-01")
+    assert res.status_code == 200, res.data
+    assert res.data["count"] == 1
+    res = admin_client.get(
+        "/v3/datasets?temporal__start_date=2024-01-01&temporal__end_date=2024-12-31"
+    )
+    assert res.data["count"] == 0
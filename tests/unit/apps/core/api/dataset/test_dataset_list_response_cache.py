@@ -0,0 +1,75 @@
+import pytest
+from django.core.cache import caches
+
+from apps.core.factories import PublishedDatasetFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.dataset,
+    pytest.mark.usefixtures("data_catalog", "reference_data"),
+]
+
+
+@pytest.fixture
+def response_cache(settings):
+    settings.ENABLE_DATASET_LIST_RESPONSE_CACHE = True
+    settings.CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "dataset-list-responses",
+    }
+    cache = caches["default"]
+    yield cache
+    cache.clear()
+
+
+def get_titles(res):
+    assert res.status_code == 200, res.data
+    return [dataset["title"]["en"] for dataset in res.data["results"]]
+
+
+def test_list_response_cache(response_cache, client, django_assert_max_num_queries):
+    dataset = PublishedDatasetFactory(title={"en": "old title"})
+    url = "/v3/datasets?state=published&pagination=true"
+    assert get_titles(client.get(url)) == ["old title"]
+
+    # Only the watermark is queried for cached responses
+    with django_assert_max_num_queries(1):
+        assert get_titles(client.get(url)) == ["old title"]
+
+    # Modifying dataset changes the watermark
+    dataset.title = {"en": "new title"}
+    dataset.save()
+    assert get_titles(client.get(url)) == ["new title"]
+
+
+def test_list_response_cache_param_order(response_cache, client, django_assert_max_num_queries):
+    PublishedDatasetFactory()
+    client.get("/v3/datasets?state=published&title=test&ordering=created")
+    with django_assert_max_num_queries(1):
+        client.get("/v3/datasets?ordering=created&title=test&state=published")
+
+
+def test_list_response_cache_deleted(response_cache, client, django_capture_on_commit_callbacks):
+    dataset = PublishedDatasetFactory(title={"en": "title"})
+    url = "/v3/datasets?state=published"
+    assert get_titles(client.get(url)) == ["title"]
+    with django_capture_on_commit_callbacks(execute=True):
+        dataset.delete(soft=False)
+    assert get_titles(client.get(url)) == []
+
+
+def test_list_response_cache_authenticated(response_cache, user_client, mocker):
+    PublishedDatasetFactory()
+    spy = mocker.spy(response_cache, "set")
+    res = user_client.get("/v3/datasets?state=published")
+    assert res.status_code == 200
+    assert spy.call_count == 0
+
+
+def test_list_response_cache_disabled(response_cache, settings, client, mocker):
+    settings.ENABLE_DATASET_LIST_RESPONSE_CACHE = False
+    PublishedDatasetFactory()
+    spy = mocker.spy(response_cache, "set")
+    res = client.get("/v3/datasets?state=published")
+    assert res.status_code == 200
+    assert spy.call_count == 0
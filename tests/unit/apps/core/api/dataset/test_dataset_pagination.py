@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlencode
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.factories import PublishedDatasetFactory
+from apps.core.models import Dataset
+from apps.core.views import dataset_pagination
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.dataset,
+    pytest.mark.usefixtures("data_catalog", "reference_data"),
+]
+
+
+@pytest.fixture
+def datasets():
+    """Create datasets, some of which have equal modification timestamps."""
+    datasets = [PublishedDatasetFactory() for _ in range(7)]
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i, dataset in enumerate(datasets):
+        Dataset.all_objects.filter(id=dataset.id).update(modified=base + timedelta(days=i // 2))
+    return list(Dataset.objects.filter(id__in=[d.id for d in datasets]))
+
+
+def get_ids(res):
+    assert res.status_code == 200, res.data
+    return [dataset["id"] for dataset in res.data["results"]]
+
+
+@pytest.mark.parametrize("ordering", ["modified", "-modified", "created", "-created"])
+def test_dataset_cursor_pagination(admin_client, datasets, ordering):
+    field = ordering.lstrip("-")
+    descending = ordering.startswith("-")
+    expected = [
+        str(d.id)
+        for d in sorted(datasets, key=lambda d: (getattr(d, field), d.id), reverse=descending)
+    ]
+    params = {"pagination_type": "cursor", "limit": 3, "ordering": ordering}
+    url = f"/v3/datasets?{urlencode(params)}"
+
+    pages = []
+    previous_urls = []
+    while url:
+        with CaptureQueriesContext(connection) as ctx:
+            res = admin_client.get(url)
+        assert not any('"__count"' in query["sql"] for query in ctx.captured_queries)
+        assert "count" not in res.data
+        pages.append(get_ids(res))
+        previous_urls.append(res.data["previous"])
+        url = res.data["next"]
+    assert [id for page in pages for id in page] == expected
+    assert [len(page) for page in pages] == [3, 3, 1]
+
+    # Previous links return the earlier pages
+    assert previous_urls[0] is None
+    assert get_ids(admin_client.get(previous_urls[2])) == pages[1]
+    res = admin_client.get(previous_urls[1])
+    assert get_ids(res) == pages[0]
+    assert res.data["previous"] is None
+
+
+def test_dataset_cursor_pagination_default_ordering(admin_client, datasets):
+    expected = [str(d.id) for d in sorted(datasets, key=lambda d: (d.modified, d.id))][::-1]
+    res = admin_client.get("/v3/datasets?pagination_type=cursor&limit=10")
+    assert get_ids(res) == expected
+    assert res.data["next"] is None
+
+
+def test_dataset_cursor_pagination_invalid_ordering(admin_client, datasets):
+    res = admin_client.get("/v3/datasets?pagination_type=cursor&ordering=id")
+    assert res.status_code == 400
+    assert "not allowed for cursor" in res.json()["ordering"]
+
+
+def test_dataset_cursor_pagination_invalid_cursor(admin_client, datasets):
+    res = admin_client.get("/v3/datasets?pagination_type=cursor&cursor=invalid")
+    assert res.status_code == 404
+
+
+def test_dataset_cursor_pagination_offset_not_allowed(admin_client, datasets):
+    res = admin_client.get("/v3/datasets?pagination_type=cursor&offset=10")
+    assert res.status_code == 400
+    assert "offset" in res.json()
+
+
+@pytest.fixture
+def count_cache(settings):
+    settings.DATASET_LIST_COUNT_CACHE_TIMEOUT = 60
+    settings.CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "dataset-counts",
+    }
+    cache = caches["default"]
+    yield cache
+    cache.clear()
+
+
+def test_dataset_count_estimated(admin_client, datasets, settings, mocker):
+    settings.DATASET_LIST_COUNT_ESTIMATE_THRESHOLD = 100
+    mocker.patch.object(dataset_pagination, "get_estimated_count", return_value=1000)
+    res = admin_client.get("/v3/datasets?limit=3")
+    assert len(get_ids(res)) == 3
+    assert res.data["count"] == 1000
+    assert res.data["count_estimated"] is True
+    assert res.data["next"] is not None
+
+    # Count is exact on the last page
+    res = admin_client.get("/v3/datasets?limit=3&offset=6")
+    assert len(get_ids(res)) == 1
+    assert res.data["count"] == 7
+    assert res.data["count_estimated"] is False
+    assert res.data["next"] is None
+
+    # Small estimates are not used
+    dataset_pagination.get_estimated_count.return_value = 10
+    res = admin_client.get("/v3/datasets?limit=3")
+    assert res.data["count"] == 7
+    assert res.data["count_estimated"] is False
+
+
+def test_dataset_estimated_count_query(datasets):
+    assert dataset_pagination.get_estimated_count(Dataset.objects.all()) >= 0
+
+
+def test_dataset_count_cached(admin_client, datasets, count_cache):
+    res = admin_client.get("/v3/datasets?limit=3")
+    assert res.data["count"] == 7
+    assert res.data["count_estimated"] is False
+
+    PublishedDatasetFactory()
+    res = admin_client.get("/v3/datasets?limit=3&offset=3&ordering=created")
+    assert res.data["count"] == 7  # Pagination and ordering don't affect count cache key
+    res = admin_client.get("/v3/datasets?limit=3&state=published")
+    assert res.data["count"] == 8
+
+    count_cache.clear()
+    res = admin_client.get("/v3/datasets?limit=3")
+    assert res.data["count"] == 8
+
+
+def test_dataset_count_strategy_disabled(admin_client, datasets):
+    res = admin_client.get("/v3/datasets?limit=3")
+    assert res.data["count"] == 7
+    assert "count_estimated" not in res.data
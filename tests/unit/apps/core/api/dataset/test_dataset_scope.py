@@ -0,0 +1,100 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser, Group
+from django.db.models import Q
+from django.test import RequestFactory
+
+from apps.core import factories
+from apps.core.models import Dataset
+from apps.core.permissions import DatasetAccessPolicy
+from apps.users.factories import MetaxUserFactory
+
+pytestmark = [pytest.mark.django_db, pytest.mark.dataset]
+
+
+def reference_scope(user, queryset):
+    """Dataset scope as a single OR over joins, used to check the optimized scope."""
+    if user.is_superuser:
+        return queryset
+    if user.is_anonymous:
+        return queryset.filter(state=Dataset.StateChoices.PUBLISHED)
+    return queryset.filter(
+        Q(state=Dataset.StateChoices.PUBLISHED)
+        | Q(metadata_owner__user=user)
+        | Q(permissions__editors=user)
+        | Q(file_set__storage__csc_project__in=user.csc_projects)
+        | Q(data_catalog__dataset_groups_admin__in=user.groups.all())
+        | Q(metadata_owner__admin_organization__in=user.admin_organizations)
+    ).distinct()
+
+
+def reference_owned_or_shared(user, queryset):
+    return queryset.filter(
+        Q(metadata_owner__user=user)
+        | Q(permissions__editors=user)
+        | Q(file_set__storage__csc_project__in=user.csc_projects)
+    ).distinct()
+
+
+@pytest.fixture
+def scope_users(data_catalog, reference_data):
+    """Create datasets where each user has a different role."""
+    owner = MetaxUserFactory(username="owner")
+    editor = MetaxUserFactory(username="editor")
+    project_member = MetaxUserFactory(username="member", csc_projects=["project"])
+    org_admin = MetaxUserFactory(username="org_admin", admin_organizations=["admin.org"])
+    catalog_admin = MetaxUserFactory(username="catalog_admin")
+    outsider = MetaxUserFactory(username="outsider", csc_projects=["other"])
+    superuser = MetaxUserFactory(username="superuser", is_superuser=True)
+
+    group, _ = Group.objects.get_or_create(name="scope_catalog_admins")
+    catalog_admin.groups.add(group)
+    admin_catalog = factories.DataCatalogFactory()
+    admin_catalog.dataset_groups_admin.set([group])
+
+    factories.PublishedDatasetFactory(metadata_owner__user=owner)
+    factories.DatasetFactory(metadata_owner__user=owner)
+    factories.DatasetFactory(metadata_owner__admin_organization="admin.org")
+    factories.DatasetFactory(data_catalog=admin_catalog)
+    factories.DatasetFactory()
+    shared = factories.DatasetFactory()
+    shared.permissions.editors.add(editor)
+    storage = factories.FileStorageFactory(storage_service="ida", csc_project="project")
+    for _ in range(2):  # Datasets with files in the project, last one is removed
+        dataset = factories.DatasetFactory(metadata_owner__user=owner)
+        factories.FileSetFactory(dataset=dataset, storage=storage)
+    Dataset.objects.filter(id=dataset.id).update(removed="2024-01-01T00:00:00Z")
+    return [owner, editor, project_member, org_admin, catalog_admin, outsider, superuser]
+
+
+def get_request(user):
+    request = RequestFactory().get("/")
+    request.user = user
+    return request
+
+
+def sorted_ids(queryset):
+    return sorted(queryset.values_list("id", flat=True))
+
+
+@pytest.mark.parametrize("manager", ["objects", "all_objects"])
+def test_dataset_scope_equivalence(scope_users, manager):
+    queryset = getattr(Dataset, manager).all()
+    for user in [*scope_users, AnonymousUser()]:
+        scoped = DatasetAccessPolicy.scope_queryset(get_request(user), queryset)
+        assert sorted_ids(scoped) == sorted_ids(reference_scope(user, queryset)), user
+        assert scoped.count() == reference_scope(user, queryset).count(), user
+
+
+def test_dataset_owned_or_shared_equivalence(scope_users):
+    queryset = Dataset.objects.all()
+    for user in scope_users:
+        scoped = DatasetAccessPolicy.scope_queryset_owned_or_shared(get_request(user), queryset)
+        expected = reference_owned_or_shared(user, queryset)
+        assert sorted_ids(scoped) == sorted_ids(expected), user
+
+
+def test_dataset_scope_without_distinct(scope_users):
+    user = scope_users[0]
+    scoped = DatasetAccessPolicy.scope_queryset(get_request(user), Dataset.objects.all())
+    assert not scoped.query.distinct
+    assert "UNION" in str(scoped.query)
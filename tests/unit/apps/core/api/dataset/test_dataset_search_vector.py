@@ -0,0 +1,108 @@
+import pytest
+
+from apps.core.models import DatasetSearchVector
+
+pytestmark = [pytest.mark.django_db, pytest.mark.dataset]
+
+
+@pytest.fixture(autouse=True)
+def search_vector_settings(settings):
+    settings.ENABLE_DATASET_SEARCH_VECTOR = True
+
+
+def post_dataset(client, dataset_json, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        res = client.post("/v3/datasets", dataset_json, content_type="application/json")
+    assert res.status_code == 201, res.data
+    return res.data
+
+
+def test_search_vector_created(
+    admin_client, dataset_a_json, data_catalog, reference_data, django_capture_on_commit_callbacks
+):
+    dataset = post_dataset(admin_client, dataset_a_json, django_capture_on_commit_callbacks)
+    assert DatasetSearchVector.objects.filter(dataset_id=dataset["id"]).exists()
+
+
+def test_search_vector_disabled(
+    admin_client,
+    dataset_a_json,
+    data_catalog,
+    reference_data,
+    django_capture_on_commit_callbacks,
+    settings,
+):
+    settings.ENABLE_DATASET_SEARCH_VECTOR = False
+    dataset = post_dataset(admin_client, dataset_a_json, django_capture_on_commit_callbacks)
+    assert not DatasetSearchVector.objects.filter(dataset_id=dataset["id"]).exists()
+
+
+def test_search_vector_phrase(
+    admin_client,
+    dataset_a_json,
+    dataset_b_json,
+    data_catalog,
+    reference_data,
+    django_capture_on_commit_callbacks,
+):
+    dataset_a_json["title"] = {"en": "Testidatasetti X has a title x y"}
+    dataset_b_json["title"] = {"en": "Testidatasetti Y has a title x y"}
+    post_dataset(admin_client, dataset_a_json, django_capture_on_commit_callbacks)
+    post_dataset(admin_client, dataset_b_json, django_capture_on_commit_callbacks)
+    res = admin_client.get("/v3/datasets?search=testidatasetti x has")
+    assert res.data["count"] == 2
+    res = admin_client.get('/v3/datasets?search="testidatasetti x has"')
+    assert res.data["count"] == 1
+    res = admin_client.get("/v3/datasets?search=testidata")  # Prefix match
+    assert res.data["count"] == 2
+    res = admin_client.get("/v3/datasets?search=nonexistent")
+    assert res.data["count"] == 0
+
+
+def test_search_vector_ranking(
+    admin_client,
+    dataset_a_json,
+    dataset_b_json,
+    data_catalog,
+    reference_data,
+    django_capture_on_commit_callbacks,
+):
+    dataset_a_json["title"] = {"en": "Dataset about birds"}
+    dataset_a_json["description"] = {"en": "Contains measurements"}
+    dataset_a_json["keyword"] = ["zebra"]
+    dataset_b_json["title"] = {"en": "Dataset about zebras"}
+    dataset_b_json["description"] = {"en": "Contains measurements"}
+    a = post_dataset(admin_client, dataset_a_json, django_capture_on_commit_callbacks)
+    b = post_dataset(admin_client, dataset_b_json, django_capture_on_commit_callbacks)
+
+    # Title matches rank higher than keyword matches
+    res = admin_client.get("/v3/datasets?search=zebra")
+    assert [d["id"] for d in res.data["results"]] == [b["id"], a["id"]]
+
+    # Explicit ordering overrides ranking
+    res = admin_client.get("/v3/datasets?search=zebra&ordering=created")
+    assert [d["id"] for d in res.data["results"]] == [a["id"], b["id"]]
+
+
+def test_search_vector_updated(
+    admin_client, dataset_a_json, data_catalog, reference_data, django_capture_on_commit_callbacks
+):
+    dataset = post_dataset(admin_client, dataset_a_json, django_capture_on_commit_callbacks)
+    res = admin_client.get("/v3/datasets?search=updatedtitle")
+    assert res.data["count"] == 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        res = admin_client.patch(
+            f"/v3/datasets/{dataset['id']}",
+            {"title": {"en": "updatedtitle"}},
+            content_type="application/json",
+        )
+    assert res.status_code == 200, res.data
+    res = admin_client.get("/v3/datasets?search=updatedtitle")
+    assert res.data["count"] == 1
+
+
+def test_search_vector_only_special_characters(admin_client, data_catalog, reference_data):
+    res = admin_client.get("/v3/datasets?search=%26%7C%21")
+    assert res.status_code == 200
+    assert res.data["count"] == 0
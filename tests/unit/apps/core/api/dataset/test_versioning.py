@@ -1,6 +1,8 @@
 import logging
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from apps.core import factories
 from apps.core.models import Dataset
@@ -391,6 +393,52 @@ def test_dataset_versions_ordering(datasets_in_odd_order, admin_client, user_cli
     ]
 
 
+def get_latest_flags(datasets):
+    return [
+        (dataset.is_latest_version, dataset.is_latest_published)
+        for dataset in Dataset.all_objects.filter(id__in=[d.id for d in datasets]).order_by(
+            "dataset_versions_order"
+        )
+    ]
+
+
+def test_dataset_versions_latest_flags(datasets_in_odd_order, client):
+    [dataset1, dataset1dft, dataset2, dataset2dft] = datasets_in_odd_order
+    assert get_latest_flags(datasets_in_odd_order) == [
+        (False, False),  # Version 1
+        (False, False),  # Version 1 draft
+        (False, True),  # Version 2
+        (True, False),  # Version 2 draft
+    ]
+
+    # Flags are a plain filter without a subquery
+    with CaptureQueriesContext(connection) as ctx:
+        res = client.get("/v3/datasets?latest_versions=true&pagination=false")
+    assert [d["title"]["en"] for d in res.data] == ["Version 2"]
+    list_queries = [q["sql"] for q in ctx.captured_queries if "is_latest_published" in q["sql"]]
+    assert list_queries
+    assert not any("EXISTS" in sql for sql in list_queries)
+
+    dataset2.refresh_from_db()
+    dataset2.merge_draft()
+    assert get_latest_flags([dataset1, dataset1dft, dataset2]) == [
+        (False, False),
+        (False, False),
+        (True, True),
+    ]
+
+    dataset2.delete()
+    assert get_latest_flags([dataset1, dataset1dft, dataset2]) == [
+        (False, True),
+        (True, False),
+        (False, False),
+    ]
+
+    dataset2.removed = None
+    dataset2.save()
+    assert get_latest_flags([dataset1, dataset1dft, dataset2])[-1] == (True, True)
+
+
 def test_dataset_versions_latest_versions_by_state(
     datasets_in_odd_order, admin_client, user_client
 ):
@@ -0,0 +1,20 @@
+import pytest
+from django.core.management import call_command
+
+from apps.core import factories
+from apps.core.models import Dataset, DatasetSearchVector
+from apps.core.views.dataset_filters import DatasetFilter
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("args", [[], ["--missing", "--chunk-size=1"]])
+def test_build_search_vectors(args):
+    factories.PublishedDatasetFactory(title={"en": "hello world"})
+    factories.PublishedDatasetFactory(title={"en": "hello metax user"})
+    factories.PublishedDatasetFactory(title={"en": "something else"})
+    assert DatasetSearchVector.objects.count() == 0
+
+    call_command("build_search_vectors", *args)
+    assert DatasetSearchVector.objects.count() == 3
+    qs = DatasetFilter().search_vector(Dataset.objects.all(), "hello", ranking=True)
+    assert qs.count() == 2
@@ -2,8 +2,11 @@ from io import StringIO
 
 import pytest
 from django.core.management import call_command
+from tests.utils import matchers
 
+from apps.core.cache import DatasetSerializerCache
 from apps.core.factories import PublishedDatasetFactory
+from apps.core.models import Dataset
 from apps.files.models import File
 
 pytestmark = [
@@ -13,6 +16,12 @@ pytestmark = [
 ]
 
 
+def get_cached(dataset_id):
+    if entry := DatasetSerializerCache.get_source_entries([dataset_id]).get(dataset_id):
+        return entry[0]
+    return None
+
+
 def test_cache_datasets(dataset_cache):
     datasets = [PublishedDatasetFactory(title={"en": f"title {i}"}) for i in range(10)]
     out = StringIO()
@@ -26,12 +35,13 @@ def test_cache_datasets(dataset_cache):
         "Caching 10 uncached datasets",
         "Prefetch complete",
         "Cached 10/10 datasets",
+        matchers.StringContaining("sharded entries: 0"),
         "Cache ok",
     ]
 
     # Check that cache contains correct data
-    assert dataset_cache.get(datasets[3].id)["title"] == {"en": "title 3"}
-    assert dataset_cache.get(datasets[4].id)["title"] == {"en": "title 4"}
+    assert get_cached(datasets[3].id)["title"] == {"en": "title 3"}
+    assert get_cached(datasets[4].id)["title"] == {"en": "title 4"}
 
     # Some datasets are modified, their cached values should be invalid
     datasets[3].title = {"en": "new title 3"}
@@ -50,12 +60,13 @@ def test_cache_datasets(dataset_cache):
         "Caching 2 uncached datasets",
         "Prefetch complete",
         "Cached 2/2 datasets",
+        matchers.StringContaining("sharded entries: 0"),
         "Cache ok",
     ]
 
     # Check that cache contains updated data
-    assert dataset_cache.get(datasets[3].id)["title"] == {"en": "new title 3"}
-    assert dataset_cache.get(datasets[4].id)["title"] == {"en": "title 4"}
+    assert get_cached(datasets[3].id)["title"] == {"en": "new title 3"}
+    assert get_cached(datasets[4].id)["title"] == {"en": "title 4"}
 
     # Test clearing dataset cache
     assert len(dataset_cache._cache) == 10
@@ -68,8 +79,8 @@ def test_cache_datasets(dataset_cache):
 
     # Verify that cached data is gone
     assert len(dataset_cache._cache) == 0
-    assert dataset_cache.get(datasets[3].id) is None
-    assert dataset_cache.get(datasets[4].id) is None
+    assert get_cached(datasets[3].id) is None
+    assert get_cached(datasets[4].id) is None
 
 
 def test_cache_datasets_all(dataset_cache):
@@ -87,6 +98,7 @@ def test_cache_datasets_all(dataset_cache):
         "Caching all datasets",
         "Prefetch complete",
         "Cached 3/3 datasets",
+        matchers.StringContaining("sharded entries: 0"),
         "Cache ok",
     ]
 
@@ -103,3 +115,55 @@ def test_clear_dataset_cache_disabled():
     call_command("clear_dataset_cache", stderr=err)
     errors = err.getvalue().strip().split("\n")
     assert errors == ["The serialized_datasets cache is not enabled"]
+
+
+def test_cache_datasets_stream(dataset_cache):
+    datasets = [PublishedDatasetFactory(title={"en": f"title {i}"}) for i in range(5)]
+    call_command("cache_datasets", stream=True, chunk_size=2)  # Cache all datasets
+    datasets[3].title = {"en": "new title 3"}
+    datasets[3].save()
+
+    out = StringIO()
+    err = StringIO()
+    call_command("cache_datasets", stdout=out, stderr=err, stream=True, chunk_size=2)
+    assert len(err.getvalue()) == 0
+    output = out.getvalue().strip().split("\n")
+    assert output == [
+        "Using LocMemCache cache backend",
+        "Caching uncached datasets in chunks of 2 using 1 processes",
+        matchers.StringContaining("Processed 2/5 datasets, cached"),
+        matchers.StringContaining("Processed 4/5 datasets, cached"),
+        matchers.StringContaining("Processed 5/5 datasets, cached"),
+        matchers.StringContaining("sharded entries: 0"),
+        "Cache ok",
+    ]
+    assert "datasets/s" in output[2]
+    assert get_cached(datasets[3].id)["title"] == {"en": "new title 3"}
+
+
+def test_cache_datasets_stream_all(dataset_cache):
+    _datasets = [PublishedDatasetFactory(title={"en": f"title {i}"}) for i in range(3)]
+    call_command("cache_datasets")  # Datasets already in cache
+
+    out = StringIO()
+    call_command("cache_datasets", stdout=out, stream=True, all=True, chunk_size=10)
+    output = out.getvalue().strip().split("\n")
+    assert output[1] == "Caching all datasets in chunks of 10 using 1 processes"
+    assert output[2].startswith("Processed 3/3 datasets, cached 3 ")
+    assert output[-1] == "Cache ok"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_cache_datasets_stream_processes(dataset_cache):
+    _datasets = [PublishedDatasetFactory(title={"en": f"title {i}"}) for i in range(3)]
+
+    out = StringIO()
+    call_command(
+        "cache_datasets", stdout=out, stderr=StringIO(), stream=True, chunk_size=2, processes=2
+    )
+    output = out.getvalue().strip().split("\n")
+    assert output[1] == "Caching uncached datasets in chunks of 2 using 2 processes"
+    assert any(line.startswith("Processed 3/3 datasets") for line in output)
+
+    # Workers must not close the DB session of the parent process
+    assert Dataset.objects.count() == 3
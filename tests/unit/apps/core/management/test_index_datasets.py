@@ -4,6 +4,7 @@ import pytest
 from django.core.management import call_command
 
 from apps.core.factories import DatasetFactory, DatasetActorFactory
+from apps.core.models import Dataset
 from apps.core.models.catalog_record.dataset_index import DatasetIndexEntry
 
 pytestmark = [
@@ -12,7 +13,7 @@ pytestmark = [
 ]
 
 
-def test_index_datasets(dataset_cache):
+def test_index_datasets(dataset_cache, django_capture_on_commit_callbacks):
     dataset1 = DatasetFactory(access_rights=None)
     dataset2 = DatasetFactory(access_rights=None)
     dataset3 = DatasetFactory(access_rights=None)
@@ -38,7 +39,6 @@ def test_index_datasets(dataset_cache):
     call_command("index_datasets", stdout=out, stderr=err)
     assert err.getvalue() == ""
     assert "3/3 datasets indexed" in out.getvalue()
-    assert "unused entries deleted" not in out.getvalue()
 
     # All datasets have same creator org, no creator persons
     assert DatasetIndexEntry.objects.filter(language="en", key="creator").count() == 1
@@ -56,16 +56,85 @@ def test_index_datasets(dataset_cache):
     )
     assert contributor_org_entry.datasets.count() == 1
 
-    # Entries for datasets that are no longer in use should be deleted
-    dataset1.delete()
+    # Entries for datasets that are no longer in use should be deleted after commit
+    with django_capture_on_commit_callbacks(execute=True):
+        dataset1.delete()
     out = StringIO()
     err = StringIO()
     call_command("index_datasets", stdout=out, stderr=err)
     assert err.getvalue() == ""
     assert "2/2 datasets indexed" in out.getvalue()
-    assert "unused entries deleted" in out.getvalue()
 
     assert DatasetIndexEntry.objects.filter(language="en", key="organization").count() == 1
     assert not DatasetIndexEntry.objects.filter(
         language="en", key="organization", value="Contributor Org"
     ).exists()
+
+
+def test_index_datasets_chunks(dataset_cache):
+    datasets = [DatasetFactory(access_rights=None, keyword=[f"kw{i}"]) for i in range(3)]
+    for dataset in datasets:
+        dataset.actors.set(
+            [
+                DatasetActorFactory(
+                    organization__pref_label={"en": "Org"}, roles=["creator"], person=None
+                )
+            ]
+        )
+    DatasetIndexEntry.objects.all().delete()
+
+    out = StringIO()
+    call_command("index_datasets", "--chunk-size=2", stdout=out)
+    assert "2/3 datasets indexed" in out.getvalue()
+    assert "3/3 datasets indexed" in out.getvalue()
+    for i, dataset in enumerate(datasets):
+        assert set(dataset.index_entries.filter(language="en").values_list("key", "value")) == {
+            ("keyword", f"kw{i}"),
+            ("creator", "Org"),
+            ("organization", "Org"),
+        }
+
+    # Reindexing removes links to outdated entries
+    datasets[0].keyword = ["changed"]
+    datasets[0].save()
+    call_command("index_datasets", stdout=StringIO())
+    keywords = datasets[0].index_entries.filter(key="keyword").values_list("value", flat=True)
+    assert set(keywords) == {"changed"}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_index_datasets_processes(dataset_cache):
+    datasets = [DatasetFactory(access_rights=None, keyword=[f"kw{i}"]) for i in range(3)]
+    DatasetIndexEntry.objects.all().delete()
+
+    out = StringIO()
+    call_command("index_datasets", "--chunk-size=1", "--processes=2", stdout=out)
+    assert "3/3 datasets indexed" in out.getvalue()
+
+    # Workers must not close the DB session of the parent process
+    assert Dataset.objects.count() == 3
+    for i, dataset in enumerate(datasets):
+        keywords = dataset.index_entries.filter(key="keyword").values_list("value", flat=True)
+        assert set(keywords) == {f"kw{i}"}
+
+
+def test_index_datasets_delete_unused(dataset_cache):
+    DatasetFactory(access_rights=None, keyword=["used"])
+    DatasetIndexEntry.objects.create(language="en", key="keyword", value="unused")
+
+    out = StringIO()
+    call_command("index_datasets", stdout=out)
+    assert "1 unused entries deleted" in out.getvalue()
+    keywords = DatasetIndexEntry.objects.filter(key="keyword").values_list("value", flat=True)
+    assert set(keywords) == {"used"}
+
+
+def test_create_for_datasets_query_count(django_assert_max_num_queries):
+    datasets = [DatasetFactory(access_rights=None, keyword=[f"kw{i}"]) for i in range(10)]
+    for dataset in datasets:
+        dataset.actors.set(
+            [DatasetActorFactory(organization__pref_label={"en": "Org"}, roles=["creator"])]
+        )
+    with django_assert_max_num_queries(15):
+        entries = DatasetIndexEntry.objects.create_for_datasets(datasets)
+    assert len(entries) == 10
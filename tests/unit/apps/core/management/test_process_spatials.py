@@ -2,8 +2,8 @@ import json
 from django.core.management import call_command
 from django.contrib.gis.geos import GEOSGeometry
 
-from apps.core.models import Spatial
-from apps.core.factories import LocationFactory
+from apps.core.models import DatasetSpatialExtent, Spatial
+from apps.core.factories import DatasetFactory, LocationFactory, SpatialFactory
 
 import pytest
 
@@ -50,3 +50,14 @@ def test_process_spatials():
 
     assert s5.geolocations.count() == 1
     assert s5.geolocations.all()[0].geometry_2d.wkt == "POINT (60 25)"
+
+
+@pytest.mark.django_db
+def test_process_spatials_rebuilds_spatial_extents():
+    dataset = DatasetFactory()
+    SpatialFactory(dataset=dataset, geolocations__geometry=GEOSGeometry("POINT (25 60)"))
+    DatasetSpatialExtent.objects.all().delete()
+
+    call_command("process_spatial_geometries")
+    extent = DatasetSpatialExtent.objects.get(dataset=dataset)
+    assert extent.geometry.num_geom == 1
@@ -179,16 +179,26 @@ def test_dataset_copied_fields():
     # are intentionally omitted when creating a copy.
     assert omit == {
         "dataset.projects.participating_organizations.children",
+        "dataset.projects.participating_organizations.ancestor_links",
+        "dataset.projects.participating_organizations.descendant_links",
         "dataset.custom_rems_licenses",
         "dataset.legacydataset",
         "dataset.metrics",
         "dataset.provenance.is_associated_with.organization.children",
+        "dataset.provenance.is_associated_with.organization.ancestor_links",
+        "dataset.provenance.is_associated_with.organization.descendant_links",
         "dataset.actors.organization.children",
+        "dataset.actors.organization.ancestor_links",
+        "dataset.actors.organization.descendant_links",
         "dataset.projects.funding.funder.organization.children",
+        "dataset.projects.funding.funder.organization.ancestor_links",
+        "dataset.projects.funding.funder.organization.descendant_links",
         "dataset.next_draft",
         "dataset.rems_resources",
         "dataset.sync_status",
         "dataset.index_entries",
+        "dataset.search_vector",
+        "dataset.spatial_extent",
     }
 
 
@@ -1,7 +1,7 @@
 import pytest
 
 from apps.core import factories
-from apps.core.models.catalog_record.dataset_index import EntryTuple
+from apps.core.models.catalog_record.dataset_index import DatasetIndexEntry, EntryTuple
 from apps.core.models import (
     AccessType,
     FieldOfScience,
@@ -123,3 +123,49 @@ def test_dataset_update_index_for_no_facets():
     dataset = factories.DatasetFactory(data_catalog=None, access_rights=None)
     tuples = EntryTuple.from_entries(dataset.update_index())
     assert tuples == [], f"Expected no entries, got {tuples=}"
+
+
+def get_tuples(dataset):
+    return sorted((e.key, e.language, e.value) for e in dataset.index_entries.all())
+
+
+def test_dataset_update_index_changed_fields(all_facets_dataset, django_assert_max_num_queries):
+    dataset = all_facets_dataset
+    dataset.update_index()
+    before = get_tuples(dataset)
+
+    # Fields that don't affect the index don't cause index queries
+    with django_assert_max_num_queries(0):
+        assert dataset.update_index(changed_fields={"title", "description"}) == []
+
+    # Only keyword entries are updated, entries of other keys are kept
+    dataset.keyword = ["changed"]
+    dataset.save()
+    tuples = EntryTuple.from_entries(dataset.update_index(changed_fields={"keyword"}))
+    assert {t.key for t in tuples} == {"keyword"}
+    assert get_tuples(dataset) == sorted(
+        [t for t in before if t[0] != "keyword"]
+        + [("keyword", "en", "changed"), ("keyword", "fi", "changed")]
+    )
+
+
+def test_dataset_update_index_deferred(
+    all_facets_dataset, settings, django_capture_on_commit_callbacks
+):
+    settings.ENABLE_DATASET_INDEX_DEFERRED_UPDATE = True
+    dataset = all_facets_dataset
+    with django_capture_on_commit_callbacks(execute=True):
+        assert dataset.update_index() == []
+        assert get_tuples(dataset) == []
+    assert len(get_tuples(dataset)) == 28
+
+
+def test_unused_entries_deleted(all_facets_dataset, django_capture_on_commit_callbacks):
+    dataset = all_facets_dataset
+    dataset.update_index()
+    dataset.keyword = ["changed"]
+    dataset.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        dataset.update_index(changed_fields={"keyword"})
+    assert not DatasetIndexEntry.objects.filter(key="keyword", value="hello").exists()
+    assert DatasetIndexEntry.objects.filter(key="keyword", value="changed").exists()
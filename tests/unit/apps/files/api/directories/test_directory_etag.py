@@ -0,0 +1,91 @@
+import pytest
+from django.utils import timezone
+
+from apps.core import factories
+from apps.files.models.file_storage import FileStorageModifiedUpdate
+
+pytestmark = [pytest.mark.django_db, pytest.mark.file]
+
+
+def test_directory_etag(admin_client, file_tree_a, django_assert_max_num_queries):
+    params = {"path": "/dir", **file_tree_a["params"]}
+    res = admin_client.get("/v3/directories", params)
+    assert res.status_code == 200
+    etag = res["ETag"]
+
+    # Matching ETag is answered without listing directory contents
+    with django_assert_max_num_queries(3):
+        res = admin_client.get("/v3/directories", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 304
+    assert res["ETag"] == etag
+    assert res.content == b""
+
+    # Weak comparison is used for If-None-Match
+    res = admin_client.get("/v3/directories", params, HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+    assert res.status_code == 304
+
+    # ETag depends on query parameters
+    res = admin_client.get(
+        "/v3/directories", {**params, "pagination": False}, HTTP_IF_NONE_MATCH=etag
+    )
+    assert res.status_code == 200
+    assert res["ETag"] != etag
+
+
+def test_directory_etag_file_modified(
+    admin_client, file_tree_a, django_capture_on_commit_callbacks
+):
+    params = {"path": "/dir", **file_tree_a["params"]}
+    etag = admin_client.get("/v3/directories", params)["ETag"]
+
+    # Storage timestamp is updated after commit
+    file = file_tree_a["files"]["/dir/a.txt"]
+    with django_capture_on_commit_callbacks(execute=True):
+        file.modified = timezone.now()
+        file.save()
+    res = admin_client.get("/v3/directories", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res["ETag"] != etag
+
+
+def test_directory_etag_file_removed(
+    admin_client, file_tree_a, django_capture_on_commit_callbacks
+):
+    params = {"path": "/dir", **file_tree_a["params"]}
+    etag = admin_client.get("/v3/directories", params)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        file_tree_a["files"]["/dir/sub1/file1.csv"].delete()
+    res = admin_client.get("/v3/directories", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res.data["directory"]["file_count"] == 14
+
+
+def test_directory_etag_file_published(
+    admin_client, file_tree_a, django_capture_on_commit_callbacks
+):
+    params = {"path": "/dir", "count_published": True, **file_tree_a["params"]}
+    etag = admin_client.get("/v3/directories", params)["ETag"]
+
+    fileset = factories.FileSetFactory(
+        dataset=factories.PublishedDatasetFactory(),
+        storage=file_tree_a["storage"],
+        files=[file_tree_a["files"]["/dir/a.txt"]],
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        fileset.update_published()
+    res = admin_client.get("/v3/directories", params, HTTP_IF_NONE_MATCH=etag)
+    assert res.status_code == 200
+    assert res.data["directory"]["published_file_count"] == 1
+
+
+def test_directory_etag_storage_update_combined(file_tree_a, django_capture_on_commit_callbacks):
+    storage = file_tree_a["storage"]
+    files = file_tree_a["files"]
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        files["/dir/a.txt"].save()
+        files["/dir/b.txt"].save()
+    # Storage timestamp is updated once per transaction
+    assert len([c for c in callbacks if isinstance(c, FileStorageModifiedUpdate)]) == 1
+    storage_modified = type(storage).objects.get(id=storage.id).modified
+    assert storage_modified > storage.modified
@@ -1,16 +1,19 @@
+import json
 import uuid
 from typing import List
 
 import pytest
 from rest_framework.reverse import reverse
 from rest_framework.serializers import DateTimeField, RegexField
-from django.db import transaction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
 
 from apps.common.locks import select_queryset_for_update
 from tests.utils import assert_nested_subdict
 from apps.files import factories
 from apps.files.models import File, FileCharacteristics, FileStorage
 from apps.files.serializers import FileSerializer
+from apps.files.serializers.file_bulk_serializer import FileBulkSerializer
 
 pytestmark = [pytest.mark.django_db, pytest.mark.file]
 
@@ -872,3 +875,159 @@ def test_files_bulk_lock_file(pas_client, action_url):
     # After the extra_connection transaction ends, file1 is no longer locked
     res = pas_client.post(action_url("update"), [file1], content_type="application/json")
     assert res.status_code == 200, res.data
+
+
+def to_ndjson(files: List[dict]) -> str:
+    return "".join(json.dumps(f, cls=DjangoJSONEncoder) + "\n" for f in files)
+
+
+def parse_ndjson_response(res) -> List[dict]:
+    return [json.loads(line) for line in b"".join(res.streaming_content).splitlines()]
+
+
+def test_files_insert_many_ndjson(ida_client):
+    files = build_files_json(
+        [
+            {"id": None, "exists": False},
+            {"id": None, "exists": False},
+            {"id": None, "exists": False},
+        ]
+    )
+    res = ida_client.post(
+        reverse("file-post-many") + "?chunk_size=2",
+        to_ndjson(files),
+        content_type="application/x-ndjson",
+    )
+    assert res.status_code == 200
+    assert res["Content-Type"] == "application/x-ndjson"
+    assert_nested_subdict(
+        [{"object": f, "action": "insert"} for f in files],
+        parse_ndjson_response(res),
+    )
+    assert File.objects.count() == 3
+
+
+def test_files_insert_many_ndjson_max_chunk_size(ida_client, settings):
+    settings.FILE_BULK_STREAM_CHUNK_SIZE = 1
+    files = build_files_json(
+        [
+            {"id": None, "exists": False},
+            {"id": None, "exists": False},
+        ]
+    )
+    body = to_ndjson(files[:1]) + "not json\n" + to_ndjson(files[1:])
+    res = ida_client.post(
+        reverse("file-post-many") + "?chunk_size=10",
+        body,
+        content_type="application/x-ndjson",
+    )
+    assert res.status_code == 200
+
+    # Chunk size is limited by settings, so the first file is committed in its own chunk
+    lines = parse_ndjson_response(res)
+    assert [line.get("action") for line in lines] == ["insert", None]
+    assert File.objects.count() == 1
+
+
+def test_files_insert_many_ndjson_errors(ida_client):
+    files = build_files_json(
+        [
+            {"id": None, "exists": False},
+            {"id": None, "exists": False},
+        ]
+    )
+    body = to_ndjson(files[:1]) + "not json\n" + to_ndjson(files[1:])
+    res = ida_client.post(
+        reverse("file-post-many") + "?chunk_size=1",
+        body,
+        content_type="application/x-ndjson",
+    )
+    assert res.status_code == 200
+
+    # The first chunk is committed and processing stops at the chunk with errors
+    lines = parse_ndjson_response(res)
+    assert len(lines) == 2
+    assert_nested_subdict({"object": files[0], "action": "insert"}, lines[0])
+    assert lines[1] == {"object": "not json", "errors": {"non_field_errors": "Invalid JSON."}}
+    assert File.objects.count() == 1
+
+
+def test_files_insert_many_ndjson_ignore_errors(ida_client):
+    files = build_files_json(
+        [
+            {"id": None, "exists": False},
+            {"id": None, "exists": False},
+        ]
+    )
+    body = to_ndjson(files[:1]) + "not json\n" + to_ndjson(files[1:])
+    res = ida_client.post(
+        reverse("file-post-many") + "?chunk_size=1&ignore_errors=true",
+        body,
+        content_type="application/x-ndjson",
+    )
+    assert res.status_code == 200
+    lines = parse_ndjson_response(res)
+    assert [line.get("action") for line in lines] == ["insert", None, "insert"]
+    assert File.objects.count() == 2
+
+
+def test_files_insert_many_ndjson_database_error(ida_client, monkeypatch):
+    files = build_files_json(
+        [
+            {"id": None, "exists": False},
+            {"id": None, "exists": False},
+        ]
+    )
+    original_save = FileBulkSerializer.save
+    saved_chunks = []
+
+    def save(self, *args, **kwargs):
+        saved_chunks.append(self)
+        if len(saved_chunks) == 2:
+            raise IntegrityError("failed")
+        return original_save(self, *args, **kwargs)
+
+    monkeypatch.setattr(FileBulkSerializer, "save", save)
+    res = ida_client.post(
+        reverse("file-post-many") + "?chunk_size=1",
+        to_ndjson(files),
+        content_type="application/x-ndjson",
+    )
+    assert res.status_code == 200
+
+    # The first chunk is committed and the error is reported as the last line
+    lines = parse_ndjson_response(res)
+    assert len(lines) == 2
+    assert_nested_subdict({"object": files[0], "action": "insert"}, lines[0])
+    assert lines[1] == {"errors": {"detail": "Saving files failed."}}
+    assert File.objects.count() == 1
+
+
+@pytest.mark.parametrize("enable_copy", [False, True])
+def test_files_upsert_many_bulk_copy(ida_client, action_url, settings, enable_copy):
+    """Test that COPY and bulk_create write paths produce the same result."""
+    settings.ENABLE_FILE_BULK_COPY = enable_copy
+    files = build_files_json(
+        [
+            {"size": 100, "exists": True},
+            {"size": 400, "exists": False, "id": None, "characteristics": {"encoding": "UTF-8"}},
+        ]
+    )
+    existing = File.objects.get(id=files[0]["id"])
+    files[0]["size"] = 200
+    res = ida_client.post(action_url("upsert"), files, content_type="application/json")
+    assert res.status_code == 200, res.data
+
+    success = res.json()["success"]
+    assert [item["action"] for item in success] == ["update", "insert"]
+    updated = File.objects.get(id=existing.id)
+    assert updated.size == 200
+    assert updated.record_created == existing.record_created
+    assert updated.record_modified > existing.record_modified
+
+    created = File.objects.get(id=success[1]["object"]["id"])
+    assert created.size == 400
+    assert created.characteristics.encoding == "UTF-8"
+    assert success[1]["object"]["record_created"] == DateTimeField().to_representation(
+        created.record_created
+    )